@@ -7,3 +7,7 @@ class ModelName(Enum):
     SONAR_REASONING = "sonar-reasoning"
     SONAR_PRO = "sonar-pro"
     SONAR = "sonar"
+
+
+# model2vec model used for chunk and query embeddings (256 dimensions)
+EMBEDDING_MODEL = "minishlab/potion-base-8M"
@@ -1,9 +1,45 @@
 import os
+import sys
 import json
+from pathlib import Path
 from typing import Optional, Tuple, List
 import asyncpg
+import numpy as np
 from loguru import logger
 from dotenv import load_dotenv
+from pgvector.asyncpg import register_vector
+
+# Add the project root to Python path for the shared search package
+sys.path.append(str(Path(__file__).parent.parent))
+
+from search.filters import SearchFilters
+from search.sql import (
+    HYBRID_CANDIDATES, RRF_K, PRECISIONS, RERANK_FACTORS,
+    BATCH_VECTOR_SEARCH_SQL, FILTERED_CHUNK_COUNT_SQL,
+    chunk_search_sql, expected_rows, render_numbered,
+)
+
+# Schema the pgvector extension is installed in (Supabase uses "extensions")
+PGVECTOR_SCHEMA = os.getenv("PGVECTOR_SCHEMA", "public")
+
+# Exact rerank of candidate ids (e.g. from the FAISS index), restricted by
+# the same filters as the Postgres searches: {chunk_ids}, {embedding}, {limit}
+RERANK_SQL = """
+    SELECT 
+        mc.meeting_id,
+        mc.chunk_index,
+        mc.chunk_text,
+        mc.metadata,
+        m.title,
+        m.date,
+        1 - (mc.embedding <=> CAST({embedding} AS vector)) AS similarity_score
+    FROM meeting_chunks mc
+    JOIN meetings m ON mc.meeting_id = m.meeting_id
+    WHERE mc.id = ANY(CAST({chunk_ids} AS int[]))
+      AND {filters}
+    ORDER BY mc.embedding <=> CAST({embedding} AS vector)
+    LIMIT {limit}
+"""
 
 class DatabaseService:
     def __init__(self):
@@ -21,13 +57,19 @@ class DatabaseService:
                     self.connection_string,
                     min_size=1,
                     max_size=10,
-                    command_timeout=60
+                    command_timeout=60,
+                    init=self._init_connection
                 )
                 logger.info("Database connection pool initialized")
             except Exception as e:
                 logger.error(f"Failed to create connection pool: {e}")
                 raise
     
+    @staticmethod
+    async def _init_connection(connection):
+        """Register the binary pgvector codec so vectors travel as float32 bytes"""
+        await register_vector(connection, schema=PGVECTOR_SCHEMA)
+
     async def get_connection(self):
         """Get database connection from pool"""
         if self.pool is None:
@@ -149,5 +191,228 @@ class DatabaseService:
                 await self.release_connection(connection)
 
 
+    @staticmethod
+    async def _fetch_search(connection, sql: str, args: list, limit: int, ann_limit: int,
+                            ef_search: Optional[int], filters: SearchFilters,
+                            queries: int = 1) -> list:
+        """
+        Run a search statement with per-transaction HNSW settings
+        
+        With filters, the HNSW scan is iterative so it keeps going until enough
+        rows match. If it still returns fewer than `limit` rows per query (a
+        very selective filter hit hnsw.max_scan_tuples) and the filters match
+        more rows than came back, the statement is re-run with index scans
+        disabled, which is exact.
+        """
+        filtered = not filters.is_empty()
+        # Vectors are bound parameters encoded by the binary codec, and
+        # asyncpg caches the prepared statement per connection
+        if ef_search is None and not filtered:
+            return await connection.fetch(sql, *args)
+
+        # set_config(..., true) only lasts until the end of this transaction
+        async with connection.transaction():
+            if filtered:
+                await connection.execute("SELECT set_config('hnsw.iterative_scan', 'strict_order', true)")
+            if ef_search is not None:
+                await connection.execute(
+                    "SELECT set_config('hnsw.ef_search', $1, true)",
+                    str(max(ef_search, ann_limit))
+                )
+            rows = await connection.fetch(sql, *args)
+
+        if not filtered or len(rows) >= limit * queries:
+            return rows
+
+        count_sql, count_args = render_numbered(FILTERED_CHUNK_COUNT_SQL, {"limit": limit}, filters)
+        expected = expected_rows(await connection.fetchval(count_sql, *count_args), limit, queries)
+        if len(rows) < expected:
+            logger.debug(f"Filtered ANN scan returned {len(rows)}/{expected} rows, re-running exactly")
+            async with connection.transaction():
+                await connection.execute("SELECT set_config('enable_indexscan', 'off', true)")
+                rows = await connection.fetch(sql, *args)
+
+        return rows
+
+    async def search_chunks(self, embedding: np.ndarray, limit: int = 10,
+                            mode: str = "vector", query: Optional[str] = None,
+                            ef_search: Optional[int] = None,
+                            precision: str = "full",
+                            filters: Optional[SearchFilters] = None) -> List[dict]:
+        """
+        Search meeting chunks by vector similarity, or hybrid keyword + vector
+        
+        Args:
+            embedding: Query embedding (float32, 256 dimensions)
+            limit: Number of chunks to return
+            mode: "vector" or "hybrid"
+            query: Raw query text, required for hybrid mode
+            ef_search: HNSW candidate list size for this query, None for server default
+            precision: "full", or "half"/"binary" to search the compact index and
+                rerank its candidates with the float32 embeddings (vector mode only)
+            filters: Date range, department, view_id and meeting id filters, None for none
+            
+        Returns:
+            List of chunk dictionaries ordered by relevance
+        """
+        filters = filters or SearchFilters()
+        connection = None
+        try:
+            connection = await self.get_connection()
+
+            values = {"embedding": embedding, "limit": limit}
+            if mode == "hybrid":
+                values.update({"query": query, "candidates": max(HYBRID_CANDIDATES, limit), "rrf_k": RRF_K})
+                ann_limit = values["candidates"]
+            elif precision != "full":
+                values["candidates"] = limit * RERANK_FACTORS[precision]
+                ann_limit = values["candidates"]
+            else:
+                ann_limit = limit
+
+            sql, args = render_numbered(chunk_search_sql(mode, precision), values, filters)
+            rows = await self._fetch_search(
+                connection, sql, args, limit=limit, ann_limit=ann_limit,
+                ef_search=ef_search, filters=filters
+            )
+
+            results = []
+            for row in rows:
+                metadata = row['metadata']
+                result = {
+                    'meeting_id': row['meeting_id'],
+                    'chunk_index': row['chunk_index'],
+                    'chunk_text': row['chunk_text'],
+                    'metadata': json.loads(metadata) if isinstance(metadata, str) else metadata,
+                    'meeting_title': row['title'],
+                    'meeting_date': row['date'],
+                    'similarity_score': float(row['similarity_score'])
+                }
+                if mode == "hybrid":
+                    result['rrf_score'] = float(row['rrf_score'])
+                    result['semantic_rank'] = row['semantic_rank']
+                    result['keyword_rank'] = row['keyword_rank']
+                results.append(result)
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Chunk search failed: {e}")
+            raise
+        finally:
+            if connection:
+                await self.release_connection(connection)
+
+    async def search_chunks_batch(self, embeddings: List[np.ndarray], limit: int = 10,
+                                  ef_search: Optional[int] = None,
+                                  filters: Optional[SearchFilters] = None) -> List[List[dict]]:
+        """
+        Vector search for many query embeddings in a single round trip
+        
+        Args:
+            embeddings: Query embeddings (float32, 256 dimensions each)
+            limit: Number of chunks to return per query
+            ef_search: HNSW candidate list size for every query, None for server default
+            filters: Date range, department, view_id and meeting id filters, None for none
+            
+        Returns:
+            One list of chunk dictionaries per embedding, in input order
+        """
+        filters = filters or SearchFilters()
+        connection = None
+        try:
+            connection = await self.get_connection()
+
+            sql, args = render_numbered(
+                BATCH_VECTOR_SEARCH_SQL, {"embeddings": embeddings, "limit": limit}, filters
+            )
+            rows = await self._fetch_search(
+                connection, sql, args, limit=limit, ann_limit=limit,
+                ef_search=ef_search, filters=filters, queries=len(embeddings)
+            )
+
+            results = [[] for _ in embeddings]
+            for row in rows:
+                metadata = row['metadata']
+                # WITH ORDINALITY is 1-based
+                results[row['query_index'] - 1].append({
+                    'meeting_id': row['meeting_id'],
+                    'chunk_index': row['chunk_index'],
+                    'chunk_text': row['chunk_text'],
+                    'metadata': json.loads(metadata) if isinstance(metadata, str) else metadata,
+                    'meeting_title': row['title'],
+                    'meeting_date': row['date'],
+                    'similarity_score': float(row['similarity_score'])
+                })
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Batch chunk search failed: {e}")
+            raise
+        finally:
+            if connection:
+                await self.release_connection(connection)
+
+    async def get_index_version(self) -> Optional[int]:
+        """Current search index version, bumped by the ingestion pipeline"""
+        connection = None
+        try:
+            connection = await self.get_connection()
+            return await connection.fetchval("SELECT version FROM search_index_state WHERE id = 1")
+        except Exception as e:
+            logger.error(f"Failed to read search index version: {e}")
+            raise
+        finally:
+            if connection:
+                await self.release_connection(connection)
+
+    async def rerank_chunks(self, chunk_ids: List[int], embedding: np.ndarray,
+                            limit: int = 10,
+                            filters: Optional[SearchFilters] = None) -> List[dict]:
+        """
+        Fetch candidate chunks by id and rank them by exact cosine similarity
+        
+        Args:
+            chunk_ids: Candidate meeting_chunks ids (e.g. from the FAISS index)
+            embedding: Query embedding (float32, 256 dimensions)
+            limit: Number of chunks to return
+            filters: Date range, department, view_id and meeting id filters, None for none.
+                Candidates that do not match are dropped, so fewer than limit can come back
+            
+        Returns:
+            List of chunk dictionaries ordered by exact similarity
+        """
+        filters = filters or SearchFilters()
+        connection = None
+        try:
+            connection = await self.get_connection()
+
+            query, args = render_numbered(
+                RERANK_SQL, {"chunk_ids": chunk_ids, "embedding": embedding, "limit": limit}, filters
+            )
+            rows = await connection.fetch(query, *args)
+
+            return [
+                {
+                    'meeting_id': row['meeting_id'],
+                    'chunk_index': row['chunk_index'],
+                    'chunk_text': row['chunk_text'],
+                    'metadata': json.loads(row['metadata']) if isinstance(row['metadata'], str) else row['metadata'],
+                    'meeting_title': row['title'],
+                    'meeting_date': row['date'],
+                    'similarity_score': float(row['similarity_score'])
+                }
+                for row in rows
+            ]
+
+        except Exception as e:
+            logger.error(f"Chunk rerank failed: {e}")
+            raise
+        finally:
+            if connection:
+                await self.release_connection(connection)
+
+
 # Global instance
 db_service = DatabaseService()
\ No newline at end of file
@@ -1,11 +1,13 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict
+from datetime import date
+from typing import List, Dict, Optional
 
 from loguru import logger
 
-from schemas.schema import SummaryResponse, AgendaSummary
+from schemas.schema import SummaryResponse, AgendaSummary, SearchResponse, BatchSearchRequest, BatchSearchResponse
 from db_service import db_service
+from search_service import search_service, build_filters, DEFAULT_START_DATE
 
 app = FastAPI()
 
@@ -140,6 +142,93 @@ async def get_timestamps(clip_id: str, view_id: str) -> List[Dict]:
         )
 
 
+@app.on_event("startup")
+async def initialize_search():
+    """Load the embedding model and open the asyncpg pool before the first search"""
+    search_service.load_model()
+    await search_service.reload_faiss_index(force=True)
+    await db_service.init_pool()
+
+
+@app.on_event("shutdown")
+async def close_database():
+    await db_service.close_pool()
+
+
+@app.get("/search", response_model=SearchResponse)
+async def search(
+        q: str = Query(..., min_length=1, description="Search query"),
+        limit: int = Query(10, ge=1, le=100, description="Number of chunks to return"),
+        mode: str = Query("vector", description="vector or hybrid (keyword + vector)"),
+        ef_search: Optional[int] = Query(None, ge=1, le=1000, description="HNSW candidate list size"),
+        backend: str = Query("postgres", description="postgres (pgvector) or faiss (in-process IVF-PQ)"),
+        nprobe: Optional[int] = Query(None, ge=1, le=4096, description="IVF lists scanned (faiss backend)"),
+        precision: str = Query("full", description="full, half or binary (compact index + float32 rerank)"),
+        date_from: Optional[date] = Query(DEFAULT_START_DATE, description="Only meetings on or after this date"),
+        date_to: Optional[date] = Query(None, description="Only meetings on or before this date"),
+        department: Optional[List[str]] = Query(None, description="Only meetings of these departments"),
+        view_id: Optional[List[str]] = Query(None, description="Only meetings with these view ids"),
+        meeting_id: Optional[List[str]] = Query(None, description="Only these meetings")
+):
+    """
+    Search meeting transcript chunks.
+    
+    Args:
+        q: Search query (e.g., "Supervisor Chan", "affordable housing")
+        limit: Number of chunks to return
+        mode: "vector" for semantic search, "hybrid" to also match keywords
+        ef_search: Higher values improve recall at the cost of latency
+        backend: "postgres" or "faiss"; faiss candidates are reranked exactly in Postgres
+        nprobe: Higher values improve faiss recall at the cost of latency
+        precision: "half" or "binary" search a smaller quantized index, then rerank
+        date_from, date_to, department, view_id, meeting_id: Filters applied during
+            the index scan; department, view_id and meeting_id may be repeated
+    
+    Returns:
+        Matching chunks ordered by relevance
+    """
+    return await search_service.search(
+        q, limit=limit, mode=mode, ef_search=ef_search, backend=backend, nprobe=nprobe,
+        precision=precision,
+        filters=build_filters(date_from, date_to, department, view_id, meeting_id)
+    )
+
+
+@app.post("/search/batch", response_model=BatchSearchResponse)
+async def search_batch(request: BatchSearchRequest):
+    """
+    Vector search for many queries at once.
+    
+    All uncached queries are embedded in one model call and searched in a
+    single database round trip, which is much cheaper than one /search
+    request per query.
+    
+    Args:
+        request: Queries plus the per-query limit, ef_search and filters
+    
+    Returns:
+        One result list per query, in request order
+    """
+    filters = build_filters(
+        request.date_from, request.date_to, request.departments, request.view_ids, request.meeting_ids
+    )
+    return await search_service.search_batch(
+        request.queries, limit=request.limit, ef_search=request.ef_search, filters=filters
+    )
+
+
+@app.get("/search/stats")
+async def search_stats() -> Dict:
+    """
+    Cache hit-rate metrics for the search endpoint.
+    
+    Returns:
+        Sizes, hits, misses, evictions and hit rates of the query embedding
+        and search result caches, plus the index versions in use
+    """
+    return search_service.cache_stats()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List
+from datetime import date, datetime
+from typing import List, Optional, Dict, Any
 
 class NewsRagRequest(BaseModel):
     user_query: str
@@ -17,3 +18,33 @@ class SummaryResponse(BaseModel):
     meeting_summary: str = Field(..., description="Full meeting summary text")
     agenda_summary: List[AgendaSummary] = Field(..., description="List of agenda summaries")
     tags: List[str] = Field(None, description="Tags associated with the agenda item")
+
+class SearchResult(BaseModel):
+    meeting_id: str = Field(..., description="Meeting identifier (view_id + '_' + clip_id)")
+    chunk_index: int = Field(..., description="Position of the chunk within the meeting transcript")
+    chunk_text: str = Field(..., description="Transcript text of the chunk")
+    meeting_title: Optional[str] = Field(None, description="Title of the meeting")
+    meeting_date: datetime = Field(..., description="Date of the meeting")
+    similarity_score: float = Field(..., description="Cosine similarity between query and chunk")
+    rrf_score: Optional[float] = Field(None, description="Reciprocal rank fusion score (hybrid mode)")
+    semantic_rank: Optional[int] = Field(None, description="Rank in the vector candidate list (hybrid mode)")
+    keyword_rank: Optional[int] = Field(None, description="Rank in the keyword candidate list (hybrid mode)")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Chunk metadata")
+
+class SearchResponse(BaseModel):
+    query: str = Field(..., description="The search query")
+    mode: str = Field(..., description="Search mode used: vector or hybrid")
+    results: List[SearchResult] = Field(..., description="Matching chunks ordered by relevance")
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=100, description="Search queries")
+    limit: int = Field(10, ge=1, le=100, description="Number of chunks to return per query")
+    ef_search: Optional[int] = Field(None, ge=1, le=1000, description="HNSW candidate list size")
+    date_from: Optional[date] = Field(date(2025, 1, 1), description="Only meetings on or after this date")
+    date_to: Optional[date] = Field(None, description="Only meetings on or before this date")
+    departments: Optional[List[str]] = Field(None, description="Only meetings of these departments")
+    view_ids: Optional[List[str]] = Field(None, description="Only meetings with these view ids")
+    meeting_ids: Optional[List[str]] = Field(None, description="Only these meetings")
+
+class BatchSearchResponse(BaseModel):
+    results: List[SearchResponse] = Field(..., description="One response per query, in request order")
@@ -0,0 +1,300 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import date, datetime, time as dtime
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from fastapi import HTTPException
+from loguru import logger
+from model2vec import StaticModel
+
+from constants import EMBEDDING_MODEL
+from schemas.schema import BatchSearchResponse, SearchResponse, SearchResult
+from db_service import db_service, PRECISIONS
+
+# Add the project root to Python path for the shared search package
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from search.cache import LRUCache, TTLCache, normalize_query
+from search.filters import SearchFilters
+from search.faiss_index import FaissSearcher, DEFAULT_NPROBE
+
+SEARCH_MODES = ("vector", "hybrid")
+SEARCH_BACKENDS = ("postgres", "faiss")
+
+# Only meetings from this date onwards are searched unless filters say otherwise
+DEFAULT_START_DATE = date(2025, 1, 1)
+DEFAULT_FILTERS = SearchFilters(date_from=datetime.combine(DEFAULT_START_DATE, dtime.min))
+
+FAISS_INDEX_DIR = Path(os.getenv("FAISS_INDEX_DIR", project_root / "indexes" / "faiss"))
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", DEFAULT_NPROBE))
+
+# FAISS candidates per requested result, reranked exactly in Postgres
+FAISS_RERANK_FACTOR = 4
+
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096"))
+SEARCH_RESULT_CACHE_SIZE = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "1024"))
+SEARCH_RESULT_TTL = float(os.getenv("SEARCH_RESULT_TTL", "300"))
+
+# How often (seconds) cached results are checked against search_index_state
+INDEX_VERSION_CHECK_INTERVAL = float(os.getenv("INDEX_VERSION_CHECK_INTERVAL", "5"))
+
+
+def build_filters(date_from: Optional[date] = DEFAULT_START_DATE, date_to: Optional[date] = None,
+                  departments: Optional[List[str]] = None, view_ids: Optional[List[str]] = None,
+                  meeting_ids: Optional[List[str]] = None) -> SearchFilters:
+    """SearchFilters from API parameters; date bounds are inclusive whole days"""
+    return SearchFilters(
+        date_from=datetime.combine(date_from, dtime.min) if date_from else None,
+        date_to=datetime.combine(date_to, dtime.max) if date_to else None,
+        departments=departments or None,
+        view_ids=view_ids or None,
+        meeting_ids=meeting_ids or None
+    )
+
+
+class SearchService:
+
+    def __init__(self):
+        self.model = None
+        self.faiss_searcher = FaissSearcher(FAISS_INDEX_DIR, nprobe=FAISS_NPROBE)
+        self.embedding_cache = LRUCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+        self.result_cache = TTLCache(maxsize=SEARCH_RESULT_CACHE_SIZE, ttl=SEARCH_RESULT_TTL)
+        self.version_checked_at = 0.0
+
+    def load_model(self):
+        """Load the model2vec embedding model once per process"""
+        if self.model is None:
+            logger.info(f"Loading embedding model {EMBEDDING_MODEL}...")
+            self.model = StaticModel.from_pretrained(EMBEDDING_MODEL)
+        return self.model
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed a query as a float32 vector, ready for the binary pgvector codec"""
+        key = normalize_query(query)
+        embedding = self.embedding_cache.get(key)
+        if embedding is None:
+            embedding = np.asarray(self.load_model().encode([query])[0], dtype=np.float32)
+            embedding.setflags(write=False)
+            self.embedding_cache.put(key, embedding)
+        return embedding
+
+    def embed_queries(self, queries: List[str]) -> List[np.ndarray]:
+        """Embed many queries, encoding every cache miss in a single model call"""
+        keys = [normalize_query(query) for query in queries]
+        embeddings = {}
+        for key in keys:
+            embedding = self.embedding_cache.get(key)
+            if embedding is not None:
+                embeddings[key] = embedding
+
+        # First query text seen for each missing key, encoded as written
+        missing = {}
+        for key, query in zip(keys, queries):
+            if key not in embeddings:
+                missing.setdefault(key, query)
+        if missing:
+            for key, embedding in zip(missing, self.load_model().encode(list(missing.values()))):
+                embedding = np.asarray(embedding, dtype=np.float32)
+                embedding.setflags(write=False)
+                embeddings[key] = embedding
+                self.embedding_cache.put(key, embedding)
+
+        return [embeddings[key] for key in keys]
+
+    async def refresh_index_version(self):
+        """Drop cached results if the ingestion pipeline bumped the index version"""
+        now = time.monotonic()
+        if now - self.version_checked_at < INDEX_VERSION_CHECK_INTERVAL:
+            return
+        self.version_checked_at = now
+        version = await db_service.get_index_version()
+        if self.result_cache.set_version(version):
+            logger.debug(f"Search index version is now {version}, result cache cleared")
+
+    def cache_stats(self) -> dict:
+        """Hit-rate metrics for the query embedding and search result caches"""
+        return {
+            'query_embeddings': self.embedding_cache.stats(),
+            'search_results': self.result_cache.stats(),
+            'faiss_index_version': self.faiss_searcher.version,
+        }
+
+    async def reload_faiss_index(self, force: bool = False) -> bool:
+        """Pick up a newer FAISS index version without blocking the event loop"""
+        return await asyncio.to_thread(self.faiss_searcher.maybe_reload, force)
+
+    async def search_faiss(self, embedding: np.ndarray, limit: int,
+                           nprobe: Optional[int] = None,
+                           filters: Optional[SearchFilters] = None) -> list:
+        """ANN candidates from the in-process FAISS index, filtered and reranked exactly by Postgres
+
+        Filters are applied to the candidates only, so a selective filter can
+        leave fewer than limit results.
+        """
+        if self.faiss_searcher.reload_due():
+            await self.reload_faiss_index()
+        if self.faiss_searcher.version is None:
+            raise HTTPException(
+                status_code=503,
+                detail=f"No FAISS index available in {FAISS_INDEX_DIR}"
+            )
+
+        _, ids = self.faiss_searcher.search(embedding, k=limit * FAISS_RERANK_FACTOR, nprobe=nprobe)
+        chunk_ids = [int(i) for i in ids[0] if i >= 0]
+        return await db_service.rerank_chunks(chunk_ids, embedding, limit=limit, filters=filters)
+
+    async def search(self, query: str, limit: int = 10, mode: str = "vector",
+                     ef_search: Optional[int] = None, backend: str = "postgres",
+                     nprobe: Optional[int] = None, precision: str = "full",
+                     filters: Optional[SearchFilters] = None) -> SearchResponse:
+        """
+        Search meeting chunks for a query
+
+        Args:
+            query: Search text
+            limit: Number of chunks to return
+            mode: "vector" or "hybrid" (keyword + vector with reciprocal rank fusion)
+            ef_search: HNSW candidate list size, higher values trade latency for recall
+            backend: "postgres" (pgvector HNSW) or "faiss" (in-process IVF-PQ index)
+            nprobe: IVF lists scanned by the faiss backend, higher values trade latency for recall
+            precision: "full" (float32 HNSW), or "half"/"binary" to search a compact
+                index and rerank with the float32 embeddings (postgres vector mode)
+            filters: Date range, department, view_id and meeting id filters
+                (default: meetings since 2025-01-01). The faiss backend applies them
+                to its candidates, so a selective filter can return fewer than limit
+
+        Returns:
+            SearchResponse with chunks ordered by relevance
+
+        Raises:
+            HTTPException: If the mode, backend or precision is invalid or a database error occurs
+        """
+        if mode not in SEARCH_MODES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid search mode '{mode}', expected one of {list(SEARCH_MODES)}"
+            )
+        if backend not in SEARCH_BACKENDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid search backend '{backend}', expected one of {list(SEARCH_BACKENDS)}"
+            )
+        if backend == "faiss" and mode != "vector":
+            raise HTTPException(
+                status_code=400,
+                detail="The faiss backend only supports mode='vector'"
+            )
+        if precision not in PRECISIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid precision '{precision}', expected one of {list(PRECISIONS)}"
+            )
+        if precision != "full" and (backend != "postgres" or mode != "vector"):
+            raise HTTPException(
+                status_code=400,
+                detail="Quantized precision only supports backend='postgres' with mode='vector'"
+            )
+        if filters is None:
+            filters = DEFAULT_FILTERS
+
+        try:
+            await self.refresh_index_version()
+            # A FAISS hot-swap changes results too, so its version is part of the key
+            faiss_version = self.faiss_searcher.version if backend == "faiss" else None
+            key = (normalize_query(query), mode, limit, ef_search, backend, nprobe, faiss_version, precision, filters)
+            results = self.result_cache.get(key)
+
+            if results is None:
+                embedding = self.embed_query(query)
+                if backend == "faiss":
+                    chunks = await self.search_faiss(embedding, limit, nprobe=nprobe, filters=filters)
+                else:
+                    chunks = await db_service.search_chunks(
+                        embedding, limit=limit, mode=mode, query=query, ef_search=ef_search,
+                        precision=precision, filters=filters
+                    )
+                results = [SearchResult(**chunk) for chunk in chunks]
+                self.result_cache.put(key, results)
+
+            return SearchResponse(query=query, mode=mode, results=results)
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error in search for query '{query}': {e}")
+            raise HTTPException(
+                status_code=500,
+                detail="Internal server error while searching"
+            )
+
+    async def search_batch(self, queries: List[str], limit: int = 10,
+                           ef_search: Optional[int] = None,
+                           filters: Optional[SearchFilters] = None) -> BatchSearchResponse:
+        """
+        Vector search for many queries in one model call and one database round trip
+
+        Args:
+            queries: Search texts
+            limit: Number of chunks to return per query
+            ef_search: HNSW candidate list size, higher values trade latency for recall
+            filters: Date range, department, view_id and meeting id filters
+                (default: meetings since 2025-01-01)
+
+        Returns:
+            BatchSearchResponse with one SearchResponse per query, in input order
+
+        Raises:
+            HTTPException: If a database error occurs
+        """
+        if filters is None:
+            filters = DEFAULT_FILTERS
+
+        try:
+            await self.refresh_index_version()
+            # Same keys as single-query vector searches, so both share cache entries
+            keys = [
+                (normalize_query(query), "vector", limit, ef_search, "postgres", None, None, "full", filters)
+                for query in queries
+            ]
+            results = {}
+            for key in keys:
+                cached = self.result_cache.get(key)
+                if cached is not None:
+                    results[key] = cached
+
+            # Pending key -> first query text seen for it, embedded as written
+            pending = {}
+            for key, query in zip(keys, queries):
+                if key not in results:
+                    pending.setdefault(key, query)
+            if pending:
+                embeddings = self.embed_queries(list(pending.values()))
+                batches = await db_service.search_chunks_batch(
+                    embeddings, limit=limit, ef_search=ef_search, filters=filters
+                )
+                for key, chunks in zip(pending, batches):
+                    results[key] = [SearchResult(**chunk) for chunk in chunks]
+                    self.result_cache.put(key, results[key])
+
+            return BatchSearchResponse(results=[
+                SearchResponse(query=query, mode="vector", results=results[key])
+                for query, key in zip(queries, keys)
+            ])
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error in batch search for {len(queries)} queries: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail="Internal server error while searching"
+            )
+
+
+# Global instance
+search_service = SearchService()
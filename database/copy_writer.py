@@ -0,0 +1,78 @@
+"""
+Bulk meeting_chunks writer using binary COPY
+
+Rows are encoded in PostgreSQL's binary COPY format, so embeddings go from
+the float32 matrix the model produced straight into pgvector's binary
+representation (one byte-swap per batch, no per-float Python objects), and
+the server skips text parsing of 256 floats per row.
+
+meeting_date / department / view_id are filled in by the
+meeting_chunks_copy_meeting_fields trigger, and the generated columns
+(chunk_tsv, text_hash, quantized embeddings) by Postgres, as for any insert.
+"""
+
+import io
+import json
+import struct
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+COPY_COLUMNS = ["meeting_id", "chunk_index", "chunk_text", "embedding", "metadata", "created_at"]
+
+_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_TRAILER = struct.pack("!h", -1)
+_POSTGRES_EPOCH = datetime(2000, 1, 1)
+_JSONB_VERSION = b"\x01"
+
+
+def _field(buffer: io.BytesIO, value: bytes):
+    buffer.write(struct.pack("!i", len(value)))
+    buffer.write(value)
+
+
+def encode_chunk_rows(rows: Iterable[Tuple[str, List[Dict], np.ndarray]],
+                      created_at: datetime) -> Tuple[io.BytesIO, int]:
+    """Binary COPY payload for (meeting_id, chunks, embeddings) groups, and its row count
+
+    embeddings is an (n_chunks x dim) array aligned with chunks.
+    """
+    buffer = io.BytesIO()
+    buffer.write(_HEADER)
+    timestamp = struct.pack("!q", (created_at - _POSTGRES_EPOCH) // timedelta(microseconds=1))
+    count = 0
+
+    for meeting_id, chunks, embeddings in rows:
+        meeting_id = meeting_id.encode("utf-8")
+        # pgvector binary format: int16 dim, int16 unused, big-endian float32s
+        matrix = np.ascontiguousarray(embeddings, dtype=">f4")
+        vector_header = struct.pack("!hh", matrix.shape[1], 0)
+        for chunk, vector in zip(chunks, matrix):
+            buffer.write(struct.pack("!h", len(COPY_COLUMNS)))
+            _field(buffer, meeting_id)
+            _field(buffer, struct.pack("!i", chunk['chunk_index']))
+            _field(buffer, chunk['chunk_text'].encode("utf-8"))
+            _field(buffer, vector_header + vector.tobytes())
+            _field(buffer, _JSONB_VERSION + json.dumps(chunk.get('metadata', {})).encode("utf-8"))
+            _field(buffer, timestamp)
+            count += 1
+
+    buffer.write(_TRAILER)
+    buffer.seek(0)
+    return buffer, count
+
+
+def copy_chunks(cursor, rows: Iterable[Tuple[str, List[Dict], np.ndarray]]) -> int:
+    """COPY chunk rows into meeting_chunks on a psycopg2 cursor, returning the row count"""
+    buffer, count = encode_chunk_rows(rows, datetime.utcnow())
+    cursor.copy_expert(
+        f"COPY meeting_chunks ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT binary)",
+        buffer
+    )
+    return count
+
+
+def delete_chunks(cursor, meeting_ids: Sequence[str]):
+    """Delete every chunk of the given meetings in one statement"""
+    cursor.execute("DELETE FROM meeting_chunks WHERE meeting_id = ANY(%s)", (list(meeting_ids),))
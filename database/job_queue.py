@@ -0,0 +1,234 @@
+"""
+Postgres-backed work queue for chunk-and-embed jobs (embedding_jobs table)
+
+Each meeting to process is a row moving pending -> claimed -> done. Workers
+claim batches with FOR UPDATE SKIP LOCKED, so any number of them (on any
+machine) can share the queue without claiming the same meeting twice. While
+working they bump heartbeat_at; a claim whose heartbeat is older than
+stale_after seconds is assumed dead and goes back to pending. A job that
+fails (or is reclaimed) max_attempts times ends up failed. A job whose meeting
+is requeued while claimed is marked dirty (dirty_at) and goes back to pending
+with fresh attempts as soon as its worker completes or releases it.
+
+Writers lock their claims (lock_claims) in the transaction that replaces a
+meeting's chunks, so a worker whose claim expired cannot overwrite the work
+of the worker that took the job over.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_STALE_AFTER = 300.0  # seconds without a heartbeat before a claim is reclaimed
+DEFAULT_HEARTBEAT_INTERVAL = 30.0
+
+ENQUEUE_SQL = """
+INSERT INTO embedding_jobs (meeting_id)
+SELECT meeting_id FROM meetings
+WHERE date >= :since AND (CAST(:meeting_ids AS text[]) IS NULL OR meeting_id = ANY(CAST(:meeting_ids AS text[])))
+ON CONFLICT (meeting_id) DO {on_conflict}
+"""
+
+RESET_ON_CONFLICT = """UPDATE SET
+    status = 'pending', attempts = 0, claimed_by = NULL, claimed_at = NULL,
+    heartbeat_at = NULL, finished_at = NULL, last_error = NULL, enqueued_at = now(), dirty_at = NULL,
+    updated_at = now()
+WHERE embedding_jobs.status <> 'claimed'"""
+
+# Requeueing a claimed job would pull it from under its worker; mark it instead
+MARK_CLAIMED_DIRTY_SQL = """
+UPDATE embedding_jobs j
+SET dirty_at = COALESCE(j.dirty_at, now()), updated_at = now()
+FROM meetings m
+WHERE m.meeting_id = j.meeting_id AND j.status = 'claimed' AND m.date >= :since
+  AND (CAST(:meeting_ids AS text[]) IS NULL OR j.meeting_id = ANY(CAST(:meeting_ids AS text[])))
+"""
+
+# Released dirty jobs start over, lag measured from the change that dirtied them
+REQUEUE_DIRTY_SQL = """
+UPDATE embedding_jobs
+SET status = 'pending', attempts = 0, claimed_by = NULL, claimed_at = NULL, heartbeat_at = NULL,
+    finished_at = NULL, enqueued_at = dirty_at, dirty_at = NULL, updated_at = now()
+WHERE meeting_id = ANY(:meeting_ids) AND dirty_at IS NOT NULL AND status <> 'claimed'
+"""
+
+CLAIM_SQL = """
+WITH next AS (
+    SELECT meeting_id
+    FROM embedding_jobs
+    WHERE status = 'pending'
+    ORDER BY created_at, meeting_id
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE embedding_jobs j
+SET status = 'claimed', claimed_by = :worker_id, claimed_at = now(), heartbeat_at = now(),
+    attempts = j.attempts + 1, updated_at = now()
+FROM next
+WHERE j.meeting_id = next.meeting_id
+RETURNING j.meeting_id
+"""
+
+# A retry goes back to pending until it has used up its attempts
+RELEASE_STATUS = "CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'pending' END"
+
+# Row locks held until the chunk transaction commits; reclaims and claims
+# skip locked rows, so the claim cannot move to another worker meanwhile
+LOCK_CLAIMS_SQL = """
+SELECT meeting_id FROM embedding_jobs
+WHERE meeting_id = ANY(:meeting_ids) AND status = 'claimed' AND claimed_by = :worker_id
+ORDER BY meeting_id
+FOR UPDATE
+"""
+
+# Claims locked by a chunk transaction (lock_claims) are skipped rather than
+# waited on: one long write must not hold back the rest of the batch, and
+# RECLAIM_SQL skips locked rows too, so a locked claim cannot expire
+HEARTBEAT_SQL = """
+UPDATE embedding_jobs SET heartbeat_at = now()
+WHERE meeting_id IN (
+    SELECT meeting_id FROM embedding_jobs
+    WHERE meeting_id = ANY(:meeting_ids) AND status = 'claimed' AND claimed_by = :worker_id
+    FOR UPDATE SKIP LOCKED
+)
+"""
+
+RECLAIM_SQL = f"""
+UPDATE embedding_jobs
+SET status = {RELEASE_STATUS}, claimed_by = NULL,
+    last_error = 'claim expired (no heartbeat from ' || claimed_by || ')', updated_at = now()
+WHERE meeting_id IN (
+    SELECT meeting_id FROM embedding_jobs
+    WHERE status = 'claimed' AND heartbeat_at < now() - make_interval(secs => :stale_after)
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING meeting_id, status
+"""
+
+
+class ClaimLost(Exception):
+    """A worker tried to write meetings whose jobs it no longer holds"""
+
+
+class EmbeddingJobQueue:
+    def __init__(self, engine: Engine, worker_id: str,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, stale_after: float = DEFAULT_STALE_AFTER):
+        """Queue client for one worker; all updates to a job check it still holds the claim"""
+        self.engine = engine
+        self.worker_id = worker_id
+        self.max_attempts = max_attempts
+        self.stale_after = stale_after
+
+    def enqueue(self, since: datetime, meeting_ids: Optional[Sequence[str]] = None,
+                reset: bool = False) -> int:
+        """Add a job per meeting on or after since; reset=True also requeues existing done/failed jobs"""
+        sql = ENQUEUE_SQL.format(on_conflict=RESET_ON_CONFLICT if reset else "NOTHING")
+        params = {"since": since, "meeting_ids": list(meeting_ids) if meeting_ids else None}
+        with self.engine.begin() as conn:
+            if reset:
+                conn.execute(text(MARK_CLAIMED_DIRTY_SQL), params)
+            result = conn.execute(text(sql), params)
+        return result.rowcount
+
+    def claim(self, batch_size: int) -> List[str]:
+        """Claim up to batch_size pending jobs, skipping rows other workers hold locked"""
+        with self.engine.begin() as conn:
+            rows = conn.execute(text(CLAIM_SQL), {"batch_size": batch_size, "worker_id": self.worker_id})
+            return [row.meeting_id for row in rows]
+
+    def heartbeat(self, meeting_ids: Sequence[str]) -> int:
+        """Refresh the heartbeat of claims this worker still holds and has not locked for writing"""
+        if not meeting_ids:
+            return 0
+        with self.engine.begin() as conn:
+            result = conn.execute(text(HEARTBEAT_SQL), {
+                "meeting_ids": list(meeting_ids), "worker_id": self.worker_id,
+            })
+        return result.rowcount
+
+    def lock_claims(self, session: Session, meeting_ids: Sequence[str]):
+        """Lock this worker's claims in the session's transaction; raises ClaimLost if any is gone"""
+        held = {row.meeting_id for row in session.execute(text(LOCK_CLAIMS_SQL), {
+            "meeting_ids": list(meeting_ids), "worker_id": self.worker_id,
+        })}
+        lost = sorted(set(meeting_ids) - held)
+        if lost:
+            raise ClaimLost(f"{self.worker_id} no longer holds the claim on {', '.join(lost)}")
+
+    def complete(self, meeting_id: str) -> bool:
+        with self.engine.begin() as conn:
+            result = conn.execute(text("""
+                UPDATE embedding_jobs
+                SET status = 'done', finished_at = now(), last_error = NULL, updated_at = now()
+                WHERE meeting_id = :meeting_id AND status = 'claimed' AND claimed_by = :worker_id
+            """), {"meeting_id": meeting_id, "worker_id": self.worker_id})
+            conn.execute(text(REQUEUE_DIRTY_SQL), {"meeting_ids": [meeting_id]})
+        return result.rowcount == 1
+
+    def fail(self, meeting_id: str, error: str, retry: bool = True) -> bool:
+        """Release a failed job for retry, or mark it failed once out of attempts (or if not retry)"""
+        status = RELEASE_STATUS if retry else "'failed'"
+        with self.engine.begin() as conn:
+            result = conn.execute(text(f"""
+                UPDATE embedding_jobs
+                SET status = {status}, claimed_by = NULL, last_error = :error, updated_at = now()
+                WHERE meeting_id = :meeting_id AND status = 'claimed' AND claimed_by = :worker_id
+            """), {"meeting_id": meeting_id, "worker_id": self.worker_id,
+                   "error": error, "max_attempts": self.max_attempts})
+            conn.execute(text(REQUEUE_DIRTY_SQL), {"meeting_ids": [meeting_id]})
+        return result.rowcount == 1
+
+    def reclaim_stale(self) -> int:
+        """Release claims whose worker stopped sending heartbeats"""
+        with self.engine.begin() as conn:
+            rows = conn.execute(text(RECLAIM_SQL), {
+                "stale_after": self.stale_after, "max_attempts": self.max_attempts,
+            }).fetchall()
+            if rows:
+                conn.execute(text(REQUEUE_DIRTY_SQL), {"meeting_ids": [row.meeting_id for row in rows]})
+        for row in rows:
+            logger.warning(f"Reclaimed stale job {row.meeting_id} -> {row.status}")
+        return len(rows)
+
+    def progress(self) -> List[Dict]:
+        """Rows of the embedding_job_progress view"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("SELECT * FROM embedding_job_progress ORDER BY status"))
+            return [dict(row._mapping) for row in rows]
+
+    def lag(self) -> Dict:
+        """The ingestion_lag view: queued jobs, age of the oldest, and enqueue-to-done percentiles"""
+        with self.engine.connect() as conn:
+            return dict(conn.execute(text("SELECT * FROM ingestion_lag")).one()._mapping)
+
+
+class Heartbeat:
+    def __init__(self, queue: EmbeddingJobQueue, interval: float = DEFAULT_HEARTBEAT_INTERVAL):
+        """Background thread that keeps the heartbeat of the worker's current claims fresh"""
+        self.queue = queue
+        self.interval = interval
+        self.meeting_ids: List[str] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.queue.heartbeat(list(self.meeting_ids))
+            except Exception as e:
+                # A missed beat is harmless unless it lasts for stale_after seconds
+                logger.warning(f"Heartbeat failed: {e}")
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
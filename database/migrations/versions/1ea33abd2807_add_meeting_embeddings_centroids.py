@@ -0,0 +1,49 @@
+"""Add meeting_embeddings table of per-meeting centroid vectors
+
+Revision ID: 1ea33abd2807
+Revises: fc58c846e11c
+Create Date: 2025-08-14 16:22:48.901337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1ea33abd2807'
+down_revision: Union[str, None] = 'fc58c846e11c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('meeting_embeddings',
+        sa.Column('meeting_id', sa.String(), nullable=False),
+        sa.Column('centroid', Vector(256), nullable=False),
+        sa.Column('chunk_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.meeting_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('meeting_id')
+    )
+
+    # Centroid = mean of the L2-normalized chunk embeddings, so its inner product
+    # with a normalized query equals the meeting's average chunk similarity
+    op.execute("""
+        INSERT INTO meeting_embeddings (meeting_id, centroid, chunk_count, updated_at)
+        SELECT meeting_id, AVG(l2_normalize(embedding)), COUNT(*), now()
+        FROM meeting_chunks
+        WHERE embedding IS NOT NULL
+        GROUP BY meeting_id
+    """)
+
+    op.execute("""
+        CREATE INDEX meeting_embeddings_centroid_hnsw_idx
+        ON meeting_embeddings USING hnsw (centroid vector_ip_ops)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('meeting_embeddings')
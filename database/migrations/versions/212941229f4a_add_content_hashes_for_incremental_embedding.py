@@ -0,0 +1,38 @@
+"""Add transcript/chunk content hashes for incremental re-embedding
+
+Revision ID: 212941229f4a
+Revises: c65cf953df32
+Create Date: 2025-08-20 16:41:08.302514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '212941229f4a'
+down_revision: Union[str, None] = 'c65cf953df32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Set by chunk_and_embed_sync.py when it stores a meeting's chunks
+    op.add_column('meetings', sa.Column('transcript_hash', sa.String(), nullable=True))
+    op.add_column('meetings', sa.Column('chunking_fingerprint', sa.String(), nullable=True))
+
+    # md5 of the chunk text, maintained by Postgres; matches
+    # hashlib.md5(chunk_text.encode('utf-8')).hexdigest() on UTF-8 databases
+    op.add_column('meeting_chunks',
+        sa.Column('text_hash', sa.String(),
+                  sa.Computed("md5(chunk_text)", persisted=True),
+                  nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('meeting_chunks', 'text_hash')
+    op.drop_column('meetings', 'chunking_fingerprint')
+    op.drop_column('meetings', 'transcript_hash')
@@ -0,0 +1,67 @@
+"""Add embedding_jobs work queue and embedding_job_progress view
+
+Revision ID: 44a8ea4f2dbf
+Revises: 212941229f4a
+Create Date: 2025-08-22 11:05:19.774203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44a8ea4f2dbf'
+down_revision: Union[str, None] = '212941229f4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per meeting to chunk and embed; workers claim pending rows with
+    # FOR UPDATE SKIP LOCKED and keep heartbeat_at fresh while they work
+    op.create_table('embedding_jobs',
+        sa.Column('meeting_id', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('claimed_by', sa.String(), nullable=True),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.meeting_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('meeting_id'),
+        sa.CheckConstraint("status IN ('pending', 'claimed', 'done', 'failed')",
+                           name='embedding_jobs_status_check')
+    )
+
+    # Claims scan pending jobs oldest first; reclaims scan claimed jobs by heartbeat
+    op.execute("""
+        CREATE INDEX embedding_jobs_pending_idx
+        ON embedding_jobs (created_at, meeting_id) WHERE status = 'pending'
+    """)
+    op.execute("""
+        CREATE INDEX embedding_jobs_claimed_heartbeat_idx
+        ON embedding_jobs (heartbeat_at) WHERE status = 'claimed'
+    """)
+
+    op.execute("""
+        CREATE VIEW embedding_job_progress AS
+        SELECT
+            status,
+            COUNT(*) AS jobs,
+            COUNT(DISTINCT claimed_by) FILTER (WHERE status = 'claimed') AS workers,
+            MAX(attempts) AS max_attempts,
+            MIN(heartbeat_at) FILTER (WHERE status = 'claimed') AS oldest_heartbeat,
+            MAX(finished_at) AS last_finished
+        FROM embedding_jobs
+        GROUP BY status
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS embedding_job_progress")
+    op.drop_table('embedding_jobs')
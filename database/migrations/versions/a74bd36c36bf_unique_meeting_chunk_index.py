@@ -0,0 +1,42 @@
+"""Make (meeting_id, chunk_index) unique on meeting_chunks
+
+Revision ID: a74bd36c36bf
+Revises: a95729ff2131
+Create Date: 2025-08-27 10:18:44.902716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a74bd36c36bf'
+down_revision: Union[str, None] = 'a95729ff2131'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Concurrent writers of one meeting could each keep a full set of chunks;
+    # keep the oldest row of every (meeting_id, chunk_index) pair
+    op.execute("""
+        DELETE FROM meeting_chunks mc
+        USING meeting_chunks keep
+        WHERE keep.meeting_id = mc.meeting_id
+          AND keep.chunk_index = mc.chunk_index
+          AND keep.id < mc.id
+    """)
+
+    # Any write that would duplicate a chunk now fails instead
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS meeting_chunks_meeting_id_chunk_index_key
+            ON meeting_chunks (meeting_id, chunk_index)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS meeting_chunks_meeting_id_chunk_index_key")
@@ -0,0 +1,33 @@
+"""Add HNSW index on meeting_chunks.embedding
+
+Revision ID: a8efb8084cf9
+Revises: 71868d3126af
+Create Date: 2025-08-10 10:12:41.220184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8efb8084cf9'
+down_revision: Union[str, None] = '71868d3126af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so the
+    # build runs in autocommit mode and does not lock meeting_chunks for writes
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS meeting_chunks_embedding_hnsw_idx
+            ON meeting_chunks USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS meeting_chunks_embedding_hnsw_idx")
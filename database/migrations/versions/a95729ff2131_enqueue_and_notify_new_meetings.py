@@ -0,0 +1,113 @@
+"""Enqueue and NOTIFY embedding jobs for new meetings and transcripts; add ingestion_lag view
+
+Revision ID: a95729ff2131
+Revises: 44a8ea4f2dbf
+Create Date: 2025-08-23 14:37:02.418951
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a95729ff2131'
+down_revision: Union[str, None] = '44a8ea4f2dbf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('embedding_jobs', sa.Column('enqueued_at', sa.DateTime(), nullable=True,
+                                              server_default=sa.func.now()))
+    op.execute("UPDATE embedding_jobs SET enqueued_at = created_at")
+    # Set when a claimed job's meeting changes; the worker's complete/fail
+    # then puts the job back to pending instead of dropping the change
+    op.add_column('embedding_jobs', sa.Column('dirty_at', sa.DateTime(), nullable=True))
+
+    # A new meeting with a transcript_url, or a meeting whose transcript_url
+    # appears or changes, gets a pending job. A job currently claimed is left
+    # to its worker and marked dirty (the ON CONFLICT row stays locked, so
+    # the claim cannot change in between).
+    op.execute("""
+        CREATE OR REPLACE FUNCTION meetings_enqueue_embedding_job() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO embedding_jobs (meeting_id) VALUES (NEW.meeting_id)
+            ON CONFLICT (meeting_id) DO UPDATE SET
+                status = 'pending', attempts = 0, claimed_by = NULL, claimed_at = NULL,
+                heartbeat_at = NULL, finished_at = NULL, last_error = NULL,
+                enqueued_at = now(), dirty_at = NULL, updated_at = now()
+            WHERE embedding_jobs.status <> 'claimed';
+            IF NOT FOUND THEN
+                UPDATE embedding_jobs
+                SET dirty_at = COALESCE(dirty_at, now()), updated_at = now()
+                WHERE meeting_id = NEW.meeting_id AND status = 'claimed';
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # Same scope as the pipeline (SyncChunkingPipeline.get_2025_meetings and
+    # `embedding-jobs enqueue --since`): historic metadata uploads and the
+    # synthetic benchmark corpus (no transcript_url) never enqueue jobs
+    op.execute("""
+        CREATE TRIGGER meetings_enqueue_embedding_job
+        AFTER INSERT ON meetings
+        FOR EACH ROW
+        WHEN (NEW.date >= '2025-01-01' AND NEW.metadata->>'transcript_url' IS NOT NULL)
+        EXECUTE FUNCTION meetings_enqueue_embedding_job()
+    """)
+    op.execute("""
+        CREATE TRIGGER meetings_transcript_enqueue_embedding_job
+        AFTER UPDATE OF metadata ON meetings
+        FOR EACH ROW
+        WHEN (NEW.date >= '2025-01-01'
+              AND OLD.metadata->>'transcript_url' IS DISTINCT FROM NEW.metadata->>'transcript_url'
+              AND NEW.metadata->>'transcript_url' IS NOT NULL)
+        EXECUTE FUNCTION meetings_enqueue_embedding_job()
+    """)
+
+    # Every job that becomes pending (new, requeued, retried or reclaimed)
+    # wakes listening ingestion daemons; identical notifications within one
+    # transaction are delivered once
+    op.execute("""
+        CREATE OR REPLACE FUNCTION embedding_jobs_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('embedding_jobs', NEW.meeting_id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER embedding_jobs_notify
+        AFTER INSERT OR UPDATE OF status ON embedding_jobs
+        FOR EACH ROW
+        WHEN (NEW.status = 'pending')
+        EXECUTE FUNCTION embedding_jobs_notify()
+    """)
+
+    op.execute("""
+        CREATE VIEW ingestion_lag AS
+        SELECT
+            COUNT(*) FILTER (WHERE status IN ('pending', 'claimed')) AS queued,
+            EXTRACT(EPOCH FROM now() - MIN(enqueued_at) FILTER (WHERE status IN ('pending', 'claimed')))
+                AS oldest_queued_seconds,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM finished_at - enqueued_at))
+                FILTER (WHERE status = 'done' AND finished_at > now() - interval '1 day') AS p50_seconds,
+            percentile_cont(0.95) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM finished_at - enqueued_at))
+                FILTER (WHERE status = 'done' AND finished_at > now() - interval '1 day') AS p95_seconds,
+            MAX(finished_at) AS last_finished
+        FROM embedding_jobs
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS ingestion_lag")
+    op.execute("DROP TRIGGER IF EXISTS embedding_jobs_notify ON embedding_jobs")
+    op.execute("DROP FUNCTION IF EXISTS embedding_jobs_notify()")
+    op.execute("DROP TRIGGER IF EXISTS meetings_transcript_enqueue_embedding_job ON meetings")
+    op.execute("DROP TRIGGER IF EXISTS meetings_enqueue_embedding_job ON meetings")
+    op.execute("DROP FUNCTION IF EXISTS meetings_enqueue_embedding_job()")
+    op.drop_column('embedding_jobs', 'dirty_at')
+    op.drop_column('embedding_jobs', 'enqueued_at')
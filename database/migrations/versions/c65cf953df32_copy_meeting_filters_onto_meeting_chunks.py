@@ -0,0 +1,107 @@
+"""Copy meeting date, department and view_id onto meeting_chunks for filtered search
+
+Revision ID: c65cf953df32
+Revises: d7f1a46840f8
+Create Date: 2025-08-18 09:12:36.551820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c65cf953df32'
+down_revision: Union[str, None] = 'd7f1a46840f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filtered search sets hnsw.iterative_scan, which needs pgvector >= 0.8.0;
+    # upgrade the extension separately (see README-database.md), not here
+
+    op.add_column('meeting_chunks', sa.Column('meeting_date', sa.DateTime(), nullable=True))
+    op.add_column('meeting_chunks', sa.Column('department', sa.String(), nullable=True))
+    op.add_column('meeting_chunks', sa.Column('view_id', sa.String(), nullable=True))
+
+    op.execute("""
+        UPDATE meeting_chunks mc
+        SET meeting_date = m.date, department = m.department, view_id = m.view_id
+        FROM meetings m
+        WHERE m.meeting_id = mc.meeting_id
+    """)
+
+    # Keep the copies in sync for every writer: new chunks take them from
+    # their meeting, and meeting edits propagate to existing chunks
+    op.execute("""
+        CREATE OR REPLACE FUNCTION meeting_chunks_copy_meeting_fields() RETURNS trigger AS $$
+        BEGIN
+            SELECT m.date, m.department, m.view_id
+            INTO NEW.meeting_date, NEW.department, NEW.view_id
+            FROM meetings m
+            WHERE m.meeting_id = NEW.meeting_id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER meeting_chunks_copy_meeting_fields
+        BEFORE INSERT OR UPDATE OF meeting_id ON meeting_chunks
+        FOR EACH ROW EXECUTE FUNCTION meeting_chunks_copy_meeting_fields()
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION meetings_propagate_chunk_fields() RETURNS trigger AS $$
+        BEGIN
+            UPDATE meeting_chunks
+            SET meeting_date = NEW.date, department = NEW.department, view_id = NEW.view_id
+            WHERE meeting_id = NEW.meeting_id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER meetings_propagate_chunk_fields
+        AFTER UPDATE OF date, department, view_id ON meetings
+        FOR EACH ROW
+        WHEN (OLD.date IS DISTINCT FROM NEW.date
+              OR OLD.department IS DISTINCT FROM NEW.department
+              OR OLD.view_id IS DISTINCT FROM NEW.view_id)
+        EXECUTE FUNCTION meetings_propagate_chunk_fields()
+    """)
+
+    # B-tree indexes let the planner answer selective filters exactly
+    # instead of walking the HNSW graph
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS meeting_chunks_meeting_date_idx
+            ON meeting_chunks (meeting_date)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS meeting_chunks_department_date_idx
+            ON meeting_chunks (department, meeting_date)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS meeting_chunks_view_id_date_idx
+            ON meeting_chunks (view_id, meeting_date)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS meeting_chunks_meeting_id_idx
+            ON meeting_chunks (meeting_id)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS meeting_chunks_meeting_id_idx")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS meeting_chunks_view_id_date_idx")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS meeting_chunks_department_date_idx")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS meeting_chunks_meeting_date_idx")
+    op.execute("DROP TRIGGER IF EXISTS meetings_propagate_chunk_fields ON meetings")
+    op.execute("DROP FUNCTION IF EXISTS meetings_propagate_chunk_fields()")
+    op.execute("DROP TRIGGER IF EXISTS meeting_chunks_copy_meeting_fields ON meeting_chunks")
+    op.execute("DROP FUNCTION IF EXISTS meeting_chunks_copy_meeting_fields()")
+    op.drop_column('meeting_chunks', 'view_id')
+    op.drop_column('meeting_chunks', 'department')
+    op.drop_column('meeting_chunks', 'meeting_date')
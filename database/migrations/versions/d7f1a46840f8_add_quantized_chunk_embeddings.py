@@ -0,0 +1,58 @@
+"""Add halfvec and binary quantized copies of meeting_chunks.embedding
+
+Revision ID: d7f1a46840f8
+Revises: 1ea33abd2807
+Create Date: 2025-08-15 10:41:17.284503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import HALFVEC, BIT
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f1a46840f8'
+down_revision: Union[str, None] = '1ea33abd2807'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # halfvec and binary_quantize need pgvector >= 0.7.0 (see README-database.md)
+
+    # Generated columns: Postgres keeps them in sync with embedding, so the
+    # ingestion pipeline does not have to write them
+    op.add_column('meeting_chunks',
+        sa.Column('embedding_half', HALFVEC(256),
+                  sa.Computed("embedding::halfvec(256)", persisted=True),
+                  nullable=True)
+    )
+    op.add_column('meeting_chunks',
+        sa.Column('embedding_bit', BIT(256),
+                  sa.Computed("binary_quantize(embedding)::bit(256)", persisted=True),
+                  nullable=True)
+    )
+
+    # 2 bytes and 1 bit per dimension instead of 4 bytes: the indexes are
+    # about 1/2 and 1/32 the size of the float32 HNSW index
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS meeting_chunks_embedding_half_hnsw_idx
+            ON meeting_chunks USING hnsw (embedding_half halfvec_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS meeting_chunks_embedding_bit_hnsw_idx
+            ON meeting_chunks USING hnsw (embedding_bit bit_hamming_ops)
+            WITH (m = 16, ef_construction = 64)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS meeting_chunks_embedding_bit_hnsw_idx")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS meeting_chunks_embedding_half_hnsw_idx")
+    op.drop_column('meeting_chunks', 'embedding_bit')
+    op.drop_column('meeting_chunks', 'embedding_half')
@@ -0,0 +1,40 @@
+"""Add generated tsvector column on meeting_chunks.chunk_text for keyword search
+
+Revision ID: f2f265a35649
+Revises: a8efb8084cf9
+Create Date: 2025-08-11 14:03:52.617930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2f265a35649'
+down_revision: Union[str, None] = 'a8efb8084cf9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('meeting_chunks',
+        sa.Column('chunk_tsv', postgresql.TSVECTOR(),
+                  sa.Computed("to_tsvector('english', chunk_text)", persisted=True),
+                  nullable=True)
+    )
+
+    # Build the GIN index without blocking writes to meeting_chunks
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS meeting_chunks_chunk_tsv_idx
+            ON meeting_chunks USING gin (chunk_tsv)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS meeting_chunks_chunk_tsv_idx")
+    op.drop_column('meeting_chunks', 'chunk_tsv')
@@ -0,0 +1,34 @@
+"""Add search_index_state version counter for search result caches
+
+Revision ID: fc58c846e11c
+Revises: f2f265a35649
+Create Date: 2025-08-13 09:41:07.385012
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fc58c846e11c'
+down_revision: Union[str, None] = 'f2f265a35649'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Single-row table; the ingestion pipeline bumps version whenever chunks change
+    op.create_table('search_index_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint('id = 1', name='search_index_state_single_row')
+    )
+    op.execute("INSERT INTO search_index_state (id, version) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    op.drop_table('search_index_state')
@@ -1,9 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Interval, ARRAY, ForeignKey
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Interval, ARRAY, ForeignKey, Index, Computed, CheckConstraint, func, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import Vector, HALFVEC, BIT
 
 Base = declarative_base()
 
@@ -21,6 +21,10 @@ class Meeting(Base):
     title = Column(Text)
     meta_data = Column("metadata", JSONB)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Hash of the transcript and of the chunker/model settings its chunks were
+    # built with; the pipeline skips meetings where both are unchanged
+    transcript_hash = Column(String)
+    chunking_fingerprint = Column(String)
     
     # Relationship to chunks
     chunks = relationship("MeetingChunk", back_populates="meeting", cascade="all, delete-orphan")
@@ -39,6 +43,116 @@ class MeetingChunk(Base):
     topics = Column(ARRAY(Text))
     meta_data = Column("metadata", JSONB)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Copied from the meeting by a trigger so search filters apply during the ANN scan
+    meeting_date = Column(DateTime)
+    department = Column(String)
+    view_id = Column(String)
+    # md5 of chunk_text, maintained by Postgres; lets re-chunking reuse embeddings
+    text_hash = Column(String, Computed("md5(chunk_text)", persisted=True))
+    # Full-text search vector, maintained by Postgres
+    chunk_tsv = Column(TSVECTOR, Computed("to_tsvector('english', chunk_text)", persisted=True))
+    # Quantized copies of embedding for compact ANN indexes, maintained by Postgres
+    embedding_half = Column(HALFVEC(256), Computed("embedding::halfvec(256)", persisted=True))
+    embedding_bit = Column(BIT(256), Computed("binary_quantize(embedding)::bit(256)", persisted=True))
     
     # Relationship to meeting
-    meeting = relationship("Meeting", back_populates="chunks")
\ No newline at end of file
+    meeting = relationship("Meeting", back_populates="chunks")
+
+    __table_args__ = (
+        # HNSW index for cosine similarity search (see migration a8efb8084cf9)
+        Index(
+            "meeting_chunks_embedding_hnsw_idx",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+        # Compact HNSW indexes searched before a full-precision rerank (see migration d7f1a46840f8)
+        Index(
+            "meeting_chunks_embedding_half_hnsw_idx",
+            "embedding_half",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding_half": "halfvec_cosine_ops"},
+        ),
+        Index(
+            "meeting_chunks_embedding_bit_hnsw_idx",
+            "embedding_bit",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding_bit": "bit_hamming_ops"},
+        ),
+        # GIN index for keyword search (see migration f2f265a35649)
+        Index("meeting_chunks_chunk_tsv_idx", "chunk_tsv", postgresql_using="gin"),
+        # Search filter indexes (see migration c65cf953df32)
+        Index("meeting_chunks_meeting_date_idx", "meeting_date"),
+        Index("meeting_chunks_department_date_idx", "department", "meeting_date"),
+        Index("meeting_chunks_view_id_date_idx", "view_id", "meeting_date"),
+        Index("meeting_chunks_meeting_id_idx", "meeting_id"),
+        # One row per chunk of a meeting (see migration a74bd36c36bf)
+        Index("meeting_chunks_meeting_id_chunk_index_key", "meeting_id", "chunk_index", unique=True),
+    )
+
+
+class MeetingEmbedding(Base):
+    __tablename__ = "meeting_embeddings"
+    
+    meeting_id = Column(String, ForeignKey("meetings.meeting_id", ondelete="CASCADE"), primary_key=True)
+    # Mean of the L2-normalized chunk embeddings: its inner product with a
+    # normalized query is the meeting's average chunk similarity
+    centroid = Column(Vector(256), nullable=False)
+    chunk_count = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # HNSW index for stage one of meeting search (see migration 1ea33abd2807)
+        Index(
+            "meeting_embeddings_centroid_hnsw_idx",
+            "centroid",
+            postgresql_using="hnsw",
+            postgresql_ops={"centroid": "vector_ip_ops"},
+        ),
+    )
+
+
+class SearchIndexState(Base):
+    __tablename__ = "search_index_state"
+    
+    # Single row (id = 1); version is bumped whenever meeting_chunks change so
+    # search result caches know to drop stale entries
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime, server_default=func.now())
+    
+    __table_args__ = (
+        CheckConstraint("id = 1", name="search_index_state_single_row"),
+    )
+
+
+class EmbeddingJob(Base):
+    __tablename__ = "embedding_jobs"
+    
+    # Work queue for chunk-and-embed workers (see scripts/embedding_jobs.py);
+    # status is pending -> claimed -> done, or back to pending / failed on errors
+    meeting_id = Column(String, ForeignKey("meetings.meeting_id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String, nullable=False, server_default="pending")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    claimed_by = Column(String)
+    claimed_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now())
+    # When the job was last (re)queued; ingestion lag is measured from here
+    enqueued_at = Column(DateTime, server_default=func.now())
+    # Meeting changed while the job was claimed; it goes back to pending when released
+    dirty_at = Column(DateTime)
+    
+    __table_args__ = (
+        CheckConstraint("status IN ('pending', 'claimed', 'done', 'failed')", name="embedding_jobs_status_check"),
+        Index("embedding_jobs_pending_idx", "created_at", "meeting_id",
+              postgresql_where=text("status = 'pending'")),
+        Index("embedding_jobs_claimed_heartbeat_idx", "heartbeat_at",
+              postgresql_where=text("status = 'claimed'")),
+    )
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Chunking Parameter Sweep and Throughput Benchmark
+
+Sweeps chunker type and parameters over a sample of local transcripts and,
+for each configuration, measures:
+- throughput: chunks/s and tokens/s (model loading excluded)
+- peak RSS of a fresh process that ran only that configuration
+- chunk size distribution (tokens and characters)
+- retrieval recall@k: snippets taken from the transcripts are used as
+  queries, and a query is a hit if a top-k chunk contains the snippet
+
+Sentence and chunk embeddings go through an on-disk embedding cache shared
+by the sweep's configurations, so parameters that produce the same sentence
+windows don't pay to encode the same texts again. The cache is a temporary
+directory unless --embedding-cache names one to keep across sweeps; it is
+never the pipeline's cache, whose entries the sweep would evict. Use
+--no-embedding-cache for cold-cache timings.
+"""
+
+import json
+import random
+import re
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from chonkie import RecursiveChunker, SemanticChunker, SentenceChunker, TokenChunker
+from chonkie.embeddings import Model2VecEmbeddings
+from loguru import logger
+from model2vec import StaticModel
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from app.constants import EMBEDDING_MODEL
+from search.embedding_cache import DiskEmbeddingCache
+
+transcripts_dir = project_root / "transcripts"
+
+CHUNKER_TYPES = ("semantic", "sentence", "recursive", "token")
+
+# Words per retrieval probe (roughly one spoken sentence)
+PROBE_WORDS = 15
+
+
+class CachedModel2VecEmbeddings(Model2VecEmbeddings):
+    def __init__(self, model: StaticModel, cache: DiskEmbeddingCache):
+        """Model2VecEmbeddings that reads and fills the on-disk embedding cache"""
+        super().__init__(model)
+        self.cache = cache
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        return self.cache.encode(self.model.encode, texts)
+
+
+def make_embeddings(model: StaticModel, cache_dir: Optional[Path]) -> Model2VecEmbeddings:
+    """chonkie embeddings over a loaded StaticModel, optionally through the disk cache"""
+    if cache_dir is None:
+        return Model2VecEmbeddings(model)
+    return CachedModel2VecEmbeddings(model, DiskEmbeddingCache(cache_dir, EMBEDDING_MODEL, dim=model.dim))
+
+
+def build_chunker(config: Dict, embeddings: Model2VecEmbeddings):
+    tokenizer = embeddings.get_tokenizer_or_token_counter()
+    if config['chunker'] == "semantic":
+        return SemanticChunker(
+            embedding_model=embeddings,
+            chunk_size=config['chunk_size'],
+            threshold=config['threshold'],
+            min_chunk_size=config['min_chunk_size'],
+            min_sentences=1
+        )
+    if config['chunker'] == "sentence":
+        return SentenceChunker(tokenizer_or_token_counter=tokenizer, chunk_size=config['chunk_size'])
+    if config['chunker'] == "recursive":
+        return RecursiveChunker(tokenizer_or_token_counter=tokenizer, chunk_size=config['chunk_size'])
+    return TokenChunker(tokenizer=tokenizer, chunk_size=config['chunk_size'])
+
+
+def sweep_configurations(chunkers: List[str], chunk_sizes: List[int], thresholds: List[str],
+                         min_chunk_sizes: List[int]) -> List[Dict]:
+    """Every combination of the swept parameters; threshold/min_chunk_size only vary for semantic"""
+    configurations = []
+    for chunker, chunk_size in product(chunkers, chunk_sizes):
+        if chunker != "semantic":
+            configurations.append({'chunker': chunker, 'chunk_size': chunk_size})
+            continue
+        for threshold, min_chunk_size in product(thresholds, min_chunk_sizes):
+            configurations.append({
+                'chunker': chunker,
+                'chunk_size': chunk_size,
+                'threshold': threshold if threshold == "auto" else float(threshold),
+                'min_chunk_size': min_chunk_size,
+            })
+    return configurations
+
+
+def make_probes(paths: List[Path], per_transcript: int, seed: int) -> List[Dict]:
+    """Snippets of PROBE_WORDS words at random positions, with the character offset of their middle"""
+    rng = random.Random(seed)
+    probes = []
+    for path in paths:
+        text = path.read_text(encoding='utf-8')
+        words = [(m.start(), m.end()) for m in re.finditer(r"\S+", text)]
+        if len(words) <= PROBE_WORDS:
+            continue
+        for _ in range(per_transcript):
+            first = rng.randrange(len(words) - PROBE_WORDS)
+            start, end = words[first][0], words[first + PROBE_WORDS - 1][1]
+            probes.append({'path': str(path), 'text': text[start:end], 'offset': (start + end) // 2})
+    return probes
+
+
+def run_configuration(config: Dict, paths: List[str], probes: List[Dict], k: int,
+                      cache_dir: Optional[str]) -> Dict:
+    """Benchmark one configuration; runs in its own process so ru_maxrss is its own peak"""
+    model = StaticModel.from_pretrained(EMBEDDING_MODEL)
+    embeddings = make_embeddings(model, Path(cache_dir) if cache_dir else None)
+    chunker = build_chunker(config, embeddings)
+
+    # Chunking throughput
+    chunks_by_path = {}
+    start = time.perf_counter()
+    for path in paths:
+        chunks_by_path[path] = chunker.chunk(Path(path).read_text(encoding='utf-8'))
+    elapsed = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    chunks = [(path, chunk) for path, path_chunks in chunks_by_path.items() for chunk in path_chunks]
+    tokens = np.array([chunk.token_count for _, chunk in chunks], dtype=np.float64)
+    chars = np.array([len(chunk.text) for _, chunk in chunks], dtype=np.float64)
+    if not chunks:
+        logger.warning(f"{config} produced no chunks")
+        return {**config, 'chunks': 0, 'seconds': elapsed, 'chunks_per_s': 0.0, 'tokens_per_s': 0.0,
+                'peak_rss_mb': peak_rss_mb, 'chunk_tokens': None, 'chunk_chars': None, 'recall': 0.0}
+
+    # Retrieval recall@k over all sampled transcripts' chunks
+    chunk_vectors = embeddings.embed_batch([chunk.text for _, chunk in chunks])
+    chunk_vectors = chunk_vectors / np.maximum(np.linalg.norm(chunk_vectors, axis=1, keepdims=True), 1e-12)
+    probe_vectors = embeddings.embed_batch([probe['text'] for probe in probes])
+    probe_vectors = probe_vectors / np.maximum(np.linalg.norm(probe_vectors, axis=1, keepdims=True), 1e-12)
+    top = np.argsort(-(probe_vectors @ chunk_vectors.T), axis=1)[:, :k]
+    hits = 0
+    for probe, rows in zip(probes, top):
+        hits += any(
+            chunks[row][0] == probe['path']
+            and chunks[row][1].start_index <= probe['offset'] < chunks[row][1].end_index
+            for row in rows
+        )
+
+    def distribution(values: np.ndarray) -> Dict:
+        return {
+            'mean': float(values.mean()),
+            'min': float(values.min()),
+            'p10': float(np.percentile(values, 10)),
+            'p50': float(np.percentile(values, 50)),
+            'p90': float(np.percentile(values, 90)),
+            'max': float(values.max()),
+        }
+
+    return {
+        **config,
+        'chunks': len(chunks),
+        'seconds': elapsed,
+        'chunks_per_s': len(chunks) / elapsed if elapsed else 0.0,
+        'tokens_per_s': float(tokens.sum()) / elapsed if elapsed else 0.0,
+        'peak_rss_mb': peak_rss_mb,
+        'chunk_tokens': distribution(tokens),
+        'chunk_chars': distribution(chars),
+        'recall': hits / len(probes) if probes else 0.0,
+    }
+
+
+def main():
+    """Main benchmark function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Sweep chunker settings over sample transcripts')
+    parser.add_argument('--transcripts', type=int, default=10, help='Transcripts to sample (default: 10)')
+    parser.add_argument('--chunkers', nargs='+', choices=CHUNKER_TYPES, default=["semantic", "sentence"],
+                       help='Chunker types to sweep (default: semantic sentence)')
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[512, 1000, 2048],
+                       help='Chunk sizes in tokens (default: 512 1000 2048)')
+    parser.add_argument('--thresholds', nargs='+', default=["0.5", "0.7", "auto"],
+                       help='Semantic similarity thresholds (default: 0.5 0.7 auto)')
+    parser.add_argument('--min-chunk-sizes', type=int, nargs='+', default=[200],
+                       help='Semantic minimum chunk sizes (default: 200)')
+    parser.add_argument('--probes', type=int, default=20, help='Retrieval probes per transcript (default: 20)')
+    parser.add_argument('--k', type=int, default=5, help='Recall cutoff (default: 5)')
+    parser.add_argument('--seed', type=int, default=42, help='Sampling seed (default: 42)')
+    parser.add_argument('--embedding-cache', type=Path,
+                       help='Embedding cache directory to keep across sweeps (default: a temporary directory)')
+    parser.add_argument('--no-embedding-cache', action='store_true', help='Encode everything (cold timings)')
+    parser.add_argument('--output', '-o', type=Path, help='Write the JSON report to this file (default: stdout)')
+    args = parser.parse_args()
+
+    available = sorted(transcripts_dir.glob("*.txt"))
+    if not available:
+        logger.error(f"No transcripts found in {transcripts_dir}")
+        return 1
+    paths = random.Random(args.seed).sample(available, min(args.transcripts, len(available)))
+    probes = make_probes(paths, args.probes, args.seed)
+    configurations = sweep_configurations(args.chunkers, args.chunk_sizes, args.thresholds, args.min_chunk_sizes)
+    logger.info(f"Sweeping {len(configurations)} configurations over {len(paths)} transcripts, {len(probes)} probes")
+
+    results = []
+    # One fresh process per configuration so peak RSS is not inherited from earlier runs
+    with tempfile.TemporaryDirectory(prefix="benchmark_embedding_cache_") as temporary_cache, \
+            ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        cache_dir = None if args.no_embedding_cache else str(args.embedding_cache or temporary_cache)
+        for config in configurations:
+            result = pool.submit(run_configuration, config, [str(p) for p in paths], probes,
+                                 args.k, cache_dir).result()
+            results.append(result)
+            if not result['chunks']:
+                continue
+            logger.info(
+                f"{config}: {result['chunks']} chunks, {result['chunks_per_s']:.1f} chunks/s, "
+                f"{result['tokens_per_s']:.0f} tokens/s, {result['peak_rss_mb']:.0f} MB peak, "
+                f"p50 {result['chunk_tokens']['p50']:.0f} tokens, recall@{args.k}={result['recall']:.3f}"
+            )
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'settings': {
+            'transcripts': [p.name for p in paths], 'probes': len(probes), 'k': args.k,
+            'embedding_cache': cache_dir is not None,
+        },
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+        logger.info(f"Report saved to: {args.output}")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+HNSW Index Benchmark
+
+This script produces a small report for the meeting_chunks HNSW index:
+1. Index build time (optional, rebuilds the index concurrently)
+2. Query p50/p99 latency with the index disabled (sequential scan, "before")
+3. Query p50/p99 latency and recall@k with the index at several ef_search values ("after")
+4. The same for the compact halfvec / bit indexes with float32 rerank (--precision)
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import List, Dict, Optional
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import text
+
+# Import the searcher from the same directory
+from semantic_search import SemanticSearcher, PRECISIONS
+
+INDEX_NAME = "meeting_chunks_embedding_hnsw_idx"
+
+# ANN index used by each precision mode, for the size comparison
+PRECISION_INDEXES = {
+    "full": INDEX_NAME,
+    "half": "meeting_chunks_embedding_half_hnsw_idx",
+    "binary": "meeting_chunks_embedding_bit_hnsw_idx",
+}
+
+DEFAULT_QUERIES = [
+    "pipeline water damage",
+    "affordable housing funding",
+    "Supervisor Chan",
+    "public transportation budget",
+    "homelessness shelter beds",
+    "police staffing overtime",
+    "small business permits",
+    "street safety and traffic calming",
+    "Ordinance 250123",
+    "climate action plan",
+]
+
+
+def rebuild_index(searcher: SemanticSearcher) -> float:
+    """Rebuild the HNSW index concurrently and return the build time in seconds"""
+    # REINDEX CONCURRENTLY cannot run inside a transaction block
+    with searcher.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+            {"name": INDEX_NAME}
+        ).fetchone()
+
+        start = time.perf_counter()
+        if exists:
+            conn.execute(text(f"REINDEX INDEX CONCURRENTLY {INDEX_NAME}"))
+        else:
+            conn.execute(text(f"""
+                CREATE INDEX CONCURRENTLY {INDEX_NAME}
+                ON meeting_chunks USING hnsw (embedding vector_cosine_ops)
+                WITH (m = 16, ef_construction = 64)
+            """))
+        return time.perf_counter() - start
+
+
+def run_workload(searcher: SemanticSearcher, queries: List[str], limit: int, repeats: int,
+                 ef_search: Optional[int] = None, exact: bool = False,
+                 precision: str = "full") -> Dict:
+    """Run every query `repeats` times and collect latencies and the last result set"""
+    latencies = []
+    results = {}
+
+    for _ in range(repeats):
+        for query in queries:
+            start = time.perf_counter()
+            chunks = searcher.search_chunks(query, limit=limit, ef_search=ef_search, exact=exact,
+                                            precision=precision)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results[query] = [(c['meeting_id'], c['chunk_index']) for c in chunks]
+
+    return {
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'results': results
+    }
+
+
+def recall_at_k(results: Dict[str, List], exact_results: Dict[str, List]) -> float:
+    """Average fraction of the exact top-k found by the approximate search"""
+    recalls = []
+    for query, expected in exact_results.items():
+        if not expected:
+            continue
+        found = set(results.get(query, []))
+        recalls.append(len(found & set(expected)) / len(expected))
+    return float(np.mean(recalls)) if recalls else 0.0
+
+
+def format_report(report: Dict) -> str:
+    """Render the benchmark results as a markdown report"""
+    lines = [
+        "# HNSW Index Report",
+        "",
+        f"- Chunks: {report['chunk_count']}",
+        f"- Queries: {report['query_count']} x {report['repeats']} repeats, top-{report['limit']}",
+    ]
+    if report.get('build_seconds') is not None:
+        lines.append(f"- Index build time: {report['build_seconds']:.1f}s")
+    for precision, size in report.get('index_bytes', {}).items():
+        lines.append(f"- {precision} index size: {size / 1e6:.1f} MB")
+    lines += [
+        "",
+        "| Mode | ef_search | p50 (ms) | p99 (ms) | recall@k |",
+        "|------|-----------|----------|----------|----------|",
+    ]
+    for row in report['rows']:
+        ef = row['ef_search'] if row['ef_search'] is not None else "-"
+        lines.append(
+            f"| {row['mode']} | {ef} | {row['p50_ms']:.1f} | {row['p99_ms']:.1f} | {row['recall']:.3f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """Main benchmark function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the meeting_chunks HNSW index')
+    parser.add_argument('--limit', '-n', type=int, default=10, help='Top-k per query (default: 10)')
+    parser.add_argument('--repeats', type=int, default=5, help='Runs per query (default: 5)')
+    parser.add_argument('--ef-search', type=int, nargs='+', default=[20, 40, 100, 200],
+                       help='ef_search values to measure (default: 20 40 100 200)')
+    parser.add_argument('--precision', choices=PRECISIONS, nargs='+', default=['full'],
+                       help='Index precisions to measure (default: full)')
+    parser.add_argument('--rebuild', action='store_true',
+                       help='Rebuild the index concurrently and report build time')
+    parser.add_argument('--output', '-o', type=Path, help='Write the markdown report to this file')
+    parser.add_argument('--json', type=Path, help='Write the raw results as JSON to this file')
+    args = parser.parse_args()
+
+    # Every repeat must reach Postgres, so results are not cached
+    searcher = SemanticSearcher(cache_results=False)
+
+    with searcher.engine.connect() as conn:
+        chunk_count = conn.execute(text("SELECT COUNT(*) FROM meeting_chunks")).scalar()
+        index_bytes = {}
+        for precision in args.precision:
+            index_bytes[precision] = conn.execute(
+                text("SELECT pg_relation_size(to_regclass(:name))"),
+                {"name": PRECISION_INDEXES[precision]}
+            ).scalar()
+
+    report = {
+        'chunk_count': chunk_count,
+        'query_count': len(DEFAULT_QUERIES),
+        'repeats': args.repeats,
+        'limit': args.limit,
+        'build_seconds': None,
+        'index_bytes': {p: size for p, size in index_bytes.items() if size is not None},
+        'rows': []
+    }
+
+    if args.rebuild:
+        logger.info(f"Rebuilding {INDEX_NAME}...")
+        report['build_seconds'] = rebuild_index(searcher)
+        logger.info(f"Index built in {report['build_seconds']:.1f}s")
+
+    # Warm up the model and connection pool before timing
+    searcher.search_chunks(DEFAULT_QUERIES[0], limit=args.limit)
+
+    logger.info("Measuring sequential scan (no index)...")
+    exact = run_workload(searcher, DEFAULT_QUERIES, args.limit, args.repeats, exact=True)
+    report['rows'].append({
+        'mode': 'seq scan', 'ef_search': None,
+        'p50_ms': exact['p50_ms'], 'p99_ms': exact['p99_ms'], 'recall': 1.0
+    })
+
+    for precision in args.precision:
+        for ef_search in args.ef_search:
+            logger.info(f"Measuring HNSW ({precision}) with ef_search={ef_search}...")
+            hnsw = run_workload(searcher, DEFAULT_QUERIES, args.limit, args.repeats,
+                                ef_search=ef_search, precision=precision)
+            report['rows'].append({
+                'mode': 'hnsw' if precision == 'full' else f'hnsw {precision} + rerank',
+                'ef_search': ef_search,
+                'p50_ms': hnsw['p50_ms'], 'p99_ms': hnsw['p99_ms'],
+                'recall': recall_at_k(hnsw['results'], exact['results'])
+            })
+
+    markdown = format_report(report)
+    print(markdown)
+
+    if args.output:
+        args.output.write_text(markdown)
+        logger.info(f"Report saved to: {args.output}")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        logger.info(f"Raw results saved to: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
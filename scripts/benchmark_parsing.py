@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+HTML Parsing Benchmark
+
+Times every extraction strategy in html_parsing (bs4 full tree, SoupStrainer,
+lxml XPath) on real Granicus pages from the on-disk HTTP cache, so results
+are reproducible: run `just scrape` / `just scrape-transcripts` once to fill
+the cache. For each page type and strategy it reports parse time per page
+(mean, p50, p95), throughput in MB/s, and how many pages give a different
+result than the original bs4 code.
+
+It also compares parsing all transcript pages one after another against
+parsing them in the process pool the scrapers use.
+"""
+
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+from loguru import logger
+
+# Import the parsing layer and HTTP cache from the same directory
+from html_parsing import STRATEGIES, PARSE_WORKERS, extract_transcript
+from http_client import HttpCache, DEFAULT_HTTP_CACHE_DIR
+
+PAGE_TYPES = {
+    'transcript': 'TranscriptViewer.php',
+    'video_page': '/player/clip/',
+    'listing': 'ViewPublisher.php',
+}
+
+
+def load_pages(cache: HttpCache, limit: int) -> Dict[str, List[str]]:
+    """Cached page texts by page type, at most limit of each"""
+    pages = {page_type: [] for page_type in PAGE_TYPES}
+    for page in cache.pages():
+        for page_type, marker in PAGE_TYPES.items():
+            if marker in page.url and len(pages[page_type]) < limit:
+                pages[page_type].append(page.text)
+    return pages
+
+
+def time_strategy(parse: Callable, pages: List[str], repeat: int) -> Dict:
+    """Best-of-repeat parse time per page, and the results for the agreement check"""
+    times = []
+    results = []
+    for html in pages:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = parse(html)
+            best = min(best, time.perf_counter() - start)
+        times.append(best)
+        results.append(result)
+    seconds = np.array(times)
+    megabytes = sum(len(html.encode('utf-8')) for html in pages) / 2**20
+    return {
+        'pages': len(pages),
+        'mean_ms': float(seconds.mean() * 1000),
+        'p50_ms': float(np.percentile(seconds, 50) * 1000),
+        'p95_ms': float(np.percentile(seconds, 95) * 1000),
+        'mb_per_s': megabytes / float(seconds.sum()) if seconds.sum() else 0.0,
+        'results': results,
+    }
+
+
+def time_pool(pages: List[str], workers: int) -> Dict:
+    """Wall time to extract all transcript pages inline vs in a process pool"""
+    start = time.perf_counter()
+    for html in pages:
+        extract_transcript(html)
+    inline = time.perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(extract_transcript, pages[:workers]))  # start the workers
+        start = time.perf_counter()
+        list(pool.map(extract_transcript, pages))
+        pooled = time.perf_counter() - start
+
+    return {
+        'workers': workers,
+        'inline_s': inline,
+        'pool_s': pooled,
+        'inline_pages_per_s': len(pages) / inline if inline else 0.0,
+        'pool_pages_per_s': len(pages) / pooled if pooled else 0.0,
+    }
+
+
+def main():
+    """Main benchmark function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark HTML extraction strategies on cached pages')
+    parser.add_argument('--http-cache', type=Path, default=DEFAULT_HTTP_CACHE_DIR,
+                       help=f'HTTP cache to read pages from (default: {DEFAULT_HTTP_CACHE_DIR})')
+    parser.add_argument('--pages', type=int, default=50, help='Pages of each type (default: 50)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repeats per page, best kept (default: 3)')
+    parser.add_argument('--workers', type=int, default=PARSE_WORKERS,
+                       help=f'Process pool size for the pool comparison (default: {PARSE_WORKERS})')
+    parser.add_argument('--output', '-o', type=Path, help='Write the JSON report to this file (default: stdout)')
+    args = parser.parse_args()
+
+    pages = load_pages(HttpCache(args.http_cache, replay=True), args.pages)
+    if not any(pages.values()):
+        logger.error(f"No cached Granicus pages in {args.http_cache}; run just scrape / just scrape-transcripts first")
+        return 1
+
+    results = {}
+    for page_type, strategies in STRATEGIES.items():
+        if not pages[page_type]:
+            logger.warning(f"No cached {page_type} pages, skipping")
+            continue
+        results[page_type] = {}
+        baseline = None
+        for name, parse in strategies.items():
+            timing = time_strategy(parse, pages[page_type], args.repeat)
+            outputs = timing.pop('results')
+            if baseline is None:
+                baseline = outputs
+            timing['mismatches'] = sum(a != b for a, b in zip(outputs, baseline))
+            results[page_type][name] = timing
+            logger.info(
+                f"{page_type} / {name}: {timing['mean_ms']:.1f} ms mean, {timing['p95_ms']:.1f} ms p95, "
+                f"{timing['mb_per_s']:.1f} MB/s, {timing['mismatches']} pages differ from bs4"
+            )
+
+    pool = None
+    if pages['transcript']:
+        pool = time_pool(pages['transcript'], args.workers)
+        logger.info(
+            f"Transcripts inline: {pool['inline_pages_per_s']:.1f} pages/s; "
+            f"process pool ({pool['workers']} workers): {pool['pool_pages_per_s']:.1f} pages/s"
+        )
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'settings': {'pages': {k: len(v) for k, v in pages.items()}, 'repeat': args.repeat},
+        'results': results,
+        'transcript_pool': pool,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+        logger.info(f"Report saved to: {args.output}")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Retrieval Benchmark Suite
+
+Runs a fixed query workload against every backend and mode SemanticSearcher
+supports, over a synthetic corpus loaded by generate_synthetic_corpus.py:
+- postgres: vector (full / half / binary precision), hybrid, batched vector,
+  meeting summaries, and filtered vector search
+- local: exact mmap search, batched and meeting summaries (exported first)
+
+For each configuration it reports recall@k against exact search, QPS and
+p50/p95/p99 latency as JSON. --baseline compares against a previous run
+and exits non-zero on a regression.
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+# Import the searcher and recall helper from the same directory
+from semantic_search import SemanticSearcher, DEFAULT_EF_SEARCH
+from benchmark_hnsw import recall_at_k
+from generate_synthetic_corpus import LOCAL_DATABASE_URL, DEFAULT_MANIFEST
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from search.cache import normalize_query
+from search.filters import SearchFilters
+from search.mmap_engine import export_embeddings
+from search.synthetic import SyntheticCorpus, DEPARTMENTS, read_manifest
+
+DEFAULT_INDEX_DIR = project_root / "indexes" / "synthetic" / "exact"
+
+NO_FILTERS = SearchFilters()
+FILTERS = {
+    'none': NO_FILTERS,
+    # ~1/8 of the corpus
+    'department': SearchFilters(departments=[DEPARTMENTS[0][1]]),
+    # ~1/24 of the corpus with the default 2023-2025 date range
+    'department+2025': SearchFilters(departments=[DEPARTMENTS[0][1]], date_from=datetime(2025, 1, 1)),
+}
+
+# name, backend, kind, mode, precision, filters
+CONFIGURATIONS = [
+    ("postgres vector", "postgres", "chunks", "vector", "full", "none"),
+    ("postgres vector half", "postgres", "chunks", "vector", "half", "none"),
+    ("postgres vector binary", "postgres", "chunks", "vector", "binary", "none"),
+    ("postgres hybrid", "postgres", "chunks", "hybrid", "full", "none"),
+    ("postgres vector batch", "postgres", "batch", "vector", "full", "none"),
+    ("postgres meetings", "postgres", "meetings", "vector", "full", "none"),
+    ("postgres vector filtered department", "postgres", "chunks", "vector", "full", "department"),
+    ("postgres vector filtered department+2025", "postgres", "chunks", "vector", "full", "department+2025"),
+    ("local vector", "local", "chunks", "vector", "full", "none"),
+    ("local vector batch", "local", "batch", "vector", "full", "none"),
+    ("local meetings", "local", "meetings", "vector", "full", "none"),
+    ("local vector filtered department", "local", "chunks", "vector", "full", "department"),
+]
+
+
+def load_queries(manifest: Path, n: int) -> List[Tuple[str, np.ndarray]]:
+    """The corpus' fixed query workload, de-duplicated by text"""
+    spec, _ = read_manifest(manifest)
+    queries = {}
+    for query, vector in SyntheticCorpus(spec).queries(n):
+        queries.setdefault(normalize_query(query), vector)
+    return list(queries.items())
+
+
+def seed_query_embeddings(searcher: SemanticSearcher, queries: List[Tuple[str, np.ndarray]]):
+    """Use the workload's vectors for its queries, so they match the corpus and skip the model"""
+    for query, vector in queries:
+        searcher.embedding_cache.put(normalize_query(query), vector.tolist())
+
+
+def result_ids(kind: str, results: List[Dict]) -> List:
+    if kind == "meetings":
+        return [r['meeting_id'] for r in results]
+    return [(r['meeting_id'], r['chunk_index']) for r in results]
+
+
+def run_search(searcher: SemanticSearcher, kind: str, queries: List[str], limit: int,
+               mode: str, precision: str, filters: SearchFilters,
+               ef_search: Optional[int], exact: bool = False) -> List[List[Dict]]:
+    """One call: a single query for chunks/meetings, the whole list for batch"""
+    if kind == "batch":
+        return searcher.search_chunks_batch(queries, limit=limit, ef_search=ef_search,
+                                            exact=exact, filters=filters)
+    if kind == "meetings":
+        return [searcher.search_meetings_summary(queries[0], limit=limit, exact=exact, filters=filters)]
+    return [searcher.search_chunks(queries[0], limit=limit, ef_search=ef_search, exact=exact,
+                                   mode=mode, precision=precision, filters=filters)]
+
+
+def run_workload(searcher: SemanticSearcher, kind: str, queries: List[str], limit: int,
+                 repeats: int, mode: str = "vector", precision: str = "full",
+                 filters: SearchFilters = NO_FILTERS, ef_search: Optional[int] = None,
+                 batch_size: int = 16, exact: bool = False) -> Dict:
+    """Run the workload `repeats` times; latency is per call (one query, or one batch)"""
+    if kind == "batch":
+        calls = [queries[i:i + batch_size] for i in range(0, len(queries), batch_size)]
+    else:
+        calls = [[query] for query in queries]
+
+    latencies = []
+    results = {}
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for call in calls:
+            call_start = time.perf_counter()
+            found = run_search(searcher, kind, call, limit, mode, precision, filters, ef_search, exact)
+            latencies.append((time.perf_counter() - call_start) * 1000)
+            for query, chunks in zip(call, found):
+                results[query] = result_ids(kind, chunks)
+    wall = time.perf_counter() - start
+
+    return {
+        'calls': len(latencies),
+        'qps': len(queries) * repeats / wall if wall else 0.0,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'results': results,
+    }
+
+
+def compare(report: Dict, baseline: Dict, max_recall_drop: float,
+            max_latency_increase: float) -> List[str]:
+    """Regressions of report against baseline, as human-readable lines"""
+    previous = {row['name']: row for row in baseline['results']}
+    regressions = []
+    for row in report['results']:
+        old = previous.get(row['name'])
+        if old is None:
+            continue
+        if old['recall'] - row['recall'] > max_recall_drop:
+            regressions.append(f"{row['name']}: recall {old['recall']:.3f} -> {row['recall']:.3f}")
+        if old['p95_ms'] > 0 and row['p95_ms'] / old['p95_ms'] - 1 > max_latency_increase:
+            regressions.append(f"{row['name']}: p95 {old['p95_ms']:.1f} ms -> {row['p95_ms']:.1f} ms")
+    return regressions
+
+
+def main():
+    """Main benchmark function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark every search backend and mode on a synthetic corpus')
+    parser.add_argument('--database-url', default=LOCAL_DATABASE_URL,
+                       help='Database holding the synthetic corpus (default: docker-compose Postgres)')
+    parser.add_argument('--manifest', type=Path, default=DEFAULT_MANIFEST,
+                       help='Corpus manifest from generate_synthetic_corpus.py')
+    parser.add_argument('--queries', type=int, default=50, help='Workload size (default: 50)')
+    parser.add_argument('--limit', '-n', type=int, default=10, help='Top-k per query (default: 10)')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs of the workload (default: 3)')
+    parser.add_argument('--ef-search', type=int, default=DEFAULT_EF_SEARCH,
+                       help=f'HNSW candidate list size (default: {DEFAULT_EF_SEARCH})')
+    parser.add_argument('--batch-size', type=int, default=16, help='Queries per batched call (default: 16)')
+    parser.add_argument('--index-dir', type=Path, default=DEFAULT_INDEX_DIR,
+                       help='Where to export embeddings for the local backend')
+    parser.add_argument('--skip-local', action='store_true', help='Only benchmark the postgres backend')
+    parser.add_argument('--output', '-o', type=Path, help='Write the JSON report to this file (default: stdout)')
+    parser.add_argument('--baseline', type=Path, help='Previous JSON report to compare against')
+    parser.add_argument('--max-recall-drop', type=float, default=0.02,
+                       help='Allowed recall drop vs the baseline (default: 0.02)')
+    parser.add_argument('--max-latency-increase', type=float, default=0.25,
+                       help='Allowed relative p95 increase vs the baseline (default: 0.25)')
+    args = parser.parse_args()
+
+    _, corpus = read_manifest(args.manifest)
+    workload = load_queries(args.manifest, args.queries)
+    queries = [query for query, _ in workload]
+    logger.info(f"Corpus: {corpus['n_chunks']} chunks, workload: {len(queries)} queries")
+
+    searchers = {'postgres': SemanticSearcher(database_url=args.database_url, cache_results=False)}
+    if not args.skip_local:
+        with searchers['postgres'].Session() as session:
+            export_embeddings(session, args.index_dir)
+        searchers['local'] = SemanticSearcher(backend="local", index_dir=args.index_dir, cache_results=False)
+    for searcher in searchers.values():
+        seed_query_embeddings(searcher, workload)
+
+    # Ground truth: exact Postgres search, per kind of result, mode and filters
+    truth = {}
+    postgres = searchers['postgres']
+    for _, backend, kind, mode, _, filter_name in CONFIGURATIONS:
+        truth_kind = "meetings" if kind == "meetings" else "chunks"
+        key = (truth_kind, mode, filter_name)
+        if backend in searchers and key not in truth:
+            logger.info(f"Computing exact results for {key}...")
+            truth[key] = run_workload(postgres, truth_kind, queries, args.limit, 1, mode=mode,
+                                      filters=FILTERS[filter_name], exact=True)['results']
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'corpus': corpus,
+        'settings': {
+            'queries': len(queries), 'limit': args.limit, 'repeats': args.repeats,
+            'ef_search': args.ef_search, 'batch_size': args.batch_size,
+        },
+        'results': [],
+    }
+
+    for name, backend, kind, mode, precision, filter_name in CONFIGURATIONS:
+        if backend not in searchers:
+            continue
+        searcher = searchers[backend]
+        # Warm up connections and the planner before timing
+        run_workload(searcher, kind, queries[:args.batch_size], args.limit, 1, mode=mode,
+                     precision=precision, filters=FILTERS[filter_name], ef_search=args.ef_search,
+                     batch_size=args.batch_size)
+
+        logger.info(f"Measuring {name}...")
+        measured = run_workload(searcher, kind, queries, args.limit, args.repeats, mode=mode,
+                                precision=precision, filters=FILTERS[filter_name],
+                                ef_search=args.ef_search, batch_size=args.batch_size)
+        expected = truth[("meetings" if kind == "meetings" else "chunks", mode, filter_name)]
+        row = {
+            'name': name, 'backend': backend, 'kind': kind, 'mode': mode,
+            'precision': precision, 'filters': filter_name,
+            'recall': recall_at_k(measured.pop('results'), expected),
+            **measured,
+        }
+        report['results'].append(row)
+        logger.info(
+            f"{name}: recall@{args.limit}={row['recall']:.3f}, {row['qps']:.1f} QPS, "
+            f"p50={row['p50_ms']:.1f} p95={row['p95_ms']:.1f} p99={row['p99_ms']:.1f} ms"
+        )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+        logger.info(f"Report saved to: {args.output}")
+    else:
+        print(output)
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()),
+                              args.max_recall_drop, args.max_latency_increase)
+        for regression in regressions:
+            logger.error(f"Regression: {regression}")
+        if regressions:
+            return 1
+        logger.info(f"No regressions against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Build a FAISS IVF-PQ Index from meeting_chunks
+
+This script:
+1. Samples chunk embeddings from Supabase and trains an IVF-PQ (or IVF-Flat) index
+2. Streams every chunk embedding into the index in batches
+3. Saves it to indexes/faiss with a version stamp (the API hot-swaps to it)
+4. Optionally checks recall@k against exact search for several nprobe values
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from search.faiss_index import (
+    build_faiss_index, check_recall, prune_versions, INDEX_TYPES,
+    DEFAULT_PQ_M, DEFAULT_PQ_NBITS, DEFAULT_TRAIN_SIZE, INDEX_PREFIX
+)
+
+# Load environment variables
+load_dotenv(project_root / "local.env")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+    import faiss
+
+    parser = argparse.ArgumentParser(description='Build a persistent FAISS index over chunk embeddings')
+    parser.add_argument('--index-dir', type=Path, default=project_root / "indexes" / "faiss",
+                       help='Output directory (default: indexes/faiss)')
+    parser.add_argument('--index-type', choices=INDEX_TYPES, default='ivfpq',
+                       help='ivfpq = compressed codes, ivfflat = full vectors (default: ivfpq)')
+    parser.add_argument('--nlist', type=int, default=None,
+                       help='Number of IVF lists (default: ~4*sqrt(training size))')
+    parser.add_argument('--pq-m', type=int, default=DEFAULT_PQ_M,
+                       help=f'PQ sub-quantizers, must divide 256 (default: {DEFAULT_PQ_M})')
+    parser.add_argument('--pq-nbits', type=int, default=DEFAULT_PQ_NBITS,
+                       help=f'Bits per PQ code (default: {DEFAULT_PQ_NBITS})')
+    parser.add_argument('--train-size', type=int, default=DEFAULT_TRAIN_SIZE,
+                       help=f'Random vectors used for training (default: {DEFAULT_TRAIN_SIZE})')
+    parser.add_argument('--since', default='2025-01-01',
+                       help='Only index meetings on or after this date (default: 2025-01-01)')
+    parser.add_argument('--batch-size', type=int, default=5000,
+                       help='Rows fetched per round trip (default: 5000)')
+    parser.add_argument('--keep', type=int, default=2,
+                       help='Index versions to keep on disk (default: 2)')
+    parser.add_argument('--check-recall', action='store_true',
+                       help='Measure recall@k against exact search after building')
+    parser.add_argument('--recall-k', type=int, default=10, help='k for the recall check (default: 10)')
+    parser.add_argument('--recall-queries', type=int, default=100,
+                       help='Sampled query vectors for the recall check (default: 100)')
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 16, 64],
+                       help='nprobe values for the recall check (default: 1 4 16 64)')
+    args = parser.parse_args()
+
+    DATABASE_URL = os.getenv("SUPABASE_DB_URL")
+    sync_url = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    engine = create_engine(sync_url, echo=False, connect_args={"sslmode": "require"})
+    Session = sessionmaker(bind=engine)
+
+    since = datetime.strptime(args.since, '%Y-%m-%d') if args.since else None
+
+    with Session() as session:
+        manifest = build_faiss_index(
+            session, args.index_dir,
+            index_type=args.index_type,
+            nlist=args.nlist,
+            pq_m=args.pq_m,
+            pq_nbits=args.pq_nbits,
+            train_size=args.train_size,
+            since=since,
+            batch_size=args.batch_size
+        )
+
+        if args.check_recall:
+            index = faiss.read_index(str(args.index_dir / f"{INDEX_PREFIX}-{manifest['version']}.faiss"))
+            manifest['recall'] = check_recall(
+                session, index,
+                k=args.recall_k,
+                n_queries=args.recall_queries,
+                nprobe_values=tuple(args.nprobe),
+                since=since
+            )
+            # Record the recall results alongside the build parameters
+            manifest_path = args.index_dir / f"{INDEX_PREFIX}-{manifest['version']}.json"
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+    prune_versions(args.index_dir, keep=args.keep)
+
+    print(json.dumps(manifest, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
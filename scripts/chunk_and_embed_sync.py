@@ -9,26 +9,37 @@ This script:
 4. Stores chunks and embeddings in Supabase
 """
 
+import hashlib
+import json
 import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
 import time
 
+import numpy as np
+
 # Enable MPS fallback for torch on Mac
 os.environ["PYTORCH_ENABLE_MPS_FALLBACK"] = "1"
 
 from loguru import logger
-from sqlalchemy import create_engine, select, MetaData
+from sqlalchemy import create_engine, select, update, func, text, MetaData
 from sqlalchemy.orm import sessionmaker, Session
 from dotenv import load_dotenv
 from chonkie import SemanticChunker
+from chonkie.embeddings import Model2VecEmbeddings
 from model2vec import StaticModel
 
 # Import database models
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
-from database.models import Meeting, MeetingChunk
+from app.constants import EMBEDDING_MODEL
+from database.copy_writer import copy_chunks, delete_chunks
+from database.models import Meeting, MeetingChunk, SearchIndexState
+from search.embedding_cache import DiskEmbeddingCache, DEFAULT_CACHE_DIR
 
 # Load environment variables
 load_dotenv(Path(__file__).parent.parent / "local.env")
@@ -37,10 +48,168 @@ load_dotenv(Path(__file__).parent.parent / "local.env")
 project_root = Path(__file__).parent.parent
 transcripts_dir = project_root / "transcripts"
 
+EMBEDDING_DIM = 256
+
+# Semantic chunker settings, shared by the pipeline and the pool workers; the
+# chunker embeds sentences with the pipeline's own EMBEDDING_MODEL instance
+CHUNKER_CONFIG = {
+    'chunk_size': 1000,  # Target chunk size in tokens
+    'threshold': 0.5,  # Threshold for semantic similarity
+    'min_chunk_size': 200,  # Minimum chunk size
+    'min_sentences': 1  # Minimum sentences per chunk
+}
+
+
+# process_meeting outcomes
+STORED = "stored"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+# Parallel mode defaults: chunk texts per encode call (and write transaction),
+# and encoded batches waiting for the writer before the encoder blocks
+DEFAULT_ENCODE_BATCH_SIZE = 4096
+DEFAULT_WRITE_QUEUE_SIZE = 8
+
+# Streaming mode: characters read per block (at most; never more than the
+# window), characters chunked per window, and chunks embedded and written per COPY
+STREAM_BLOCK_SIZE = 64 * 1024
+DEFAULT_STREAM_WINDOW = 32 * 1024
+STREAM_WRITE_BATCH = 32
+
+# Per-process chunker for the pool workers, created by _init_chunk_worker
+_worker_chunker = None
+
+
+def content_hash(text: str) -> str:
+    """md5 of a transcript or chunk text; matches meeting_chunks.text_hash (md5(chunk_text))"""
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+def chunking_fingerprint(pool_embeddings: bool, stream_window: Optional[int] = None) -> str:
+    """Stored per meeting: a change to the chunker, model or embedding settings
+    re-chunks and re-embeds every meeting, even if its transcript is unchanged
+    
+    Streaming chunks a window at a time, so chunk boundaries depend on it and
+    on the window size; whole-file runs keep the fingerprint they always had.
+    """
+    settings = {
+        'embedding_model': EMBEDDING_MODEL,
+        'chunker': CHUNKER_CONFIG,
+        'pool_embeddings': pool_embeddings,
+    }
+    if stream_window:
+        settings['stream_window'] = stream_window
+    return hashlib.md5(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def build_chunker(model: StaticModel) -> SemanticChunker:
+    """Semantic chunker that embeds sentences with an already loaded model"""
+    return SemanticChunker(embedding_model=Model2VecEmbeddings(model), **CHUNKER_CONFIG)
+
+
+def pool_sentence_embeddings(chunk) -> np.ndarray:
+    """Chunk embedding from the chunker's sentence embeddings: token-weighted mean, L2-normalized
+    
+    Sentence embeddings are computed over a similarity window (the sentence and
+    its neighbours), so this approximates encoding the chunk text without a
+    second pass of the model.
+    """
+    weights = np.array([max(sentence.token_count, 1) for sentence in chunk.sentences], dtype=np.float32)
+    vectors = np.stack([sentence.embedding for sentence in chunk.sentences]).astype(np.float32)
+    pooled = weights @ vectors / weights.sum()
+    return pooled / (np.linalg.norm(pooled) or 1.0)
+
+
+def transcript_path(meeting_id: str) -> Path:
+    return transcripts_dir / f"{meeting_id}.txt"
+
+
+def read_blocks(path: Path, block_size: int = STREAM_BLOCK_SIZE) -> Iterator[str]:
+    """Read a text file block by block"""
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+def hash_file(path: Path) -> str:
+    """content_hash of a file's text, computed without holding the whole file"""
+    md5 = hashlib.md5()
+    for block in read_blocks(path):
+        md5.update(block.encode('utf-8'))
+    return md5.hexdigest()
+
+
+def stream_chunks(chunker: SemanticChunker, path: Path,
+                  window_chars: int = DEFAULT_STREAM_WINDOW) -> Iterator:
+    """Yield semantic chunks of a transcript file while reading it
+    
+    Text is chunked a window at a time. Every chunk of a window except the
+    last ends at a semantic boundary and is emitted; the last one may continue
+    past the window, so its text is carried over to the start of the next
+    window. Memory stays around a few windows whatever the transcript length.
+    """
+    buffer = ""
+    for block in read_blocks(path, min(STREAM_BLOCK_SIZE, window_chars)):
+        buffer += block
+        if len(buffer) < window_chars:
+            continue
+        
+        chunks = chunker.chunk(buffer)
+        if len(chunks) < 2:
+            # No boundary yet: read on, unless the buffer keeps growing without one
+            if len(buffer) < window_chars * 4:
+                continue
+            yield from chunks
+            buffer = ""
+            continue
+        
+        yield from chunks[:-1]
+        buffer = buffer[chunks[-1].start_index:]
+    
+    if buffer.strip():
+        yield from chunker.chunk(buffer)
+
+
+def _init_chunk_worker():
+    """Process pool initializer: load the model and semantic chunker once per worker"""
+    global _worker_chunker
+    _worker_chunker = build_chunker(StaticModel.from_pretrained(EMBEDDING_MODEL))
+
+
+def _chunk_meeting_worker(meeting_id: str, stored_hash: Optional[str],
+                          pool_embeddings: bool) -> Tuple[str, Optional[str], Optional[List[Dict]]]:
+    """Load and chunk one transcript inside a pool worker
+    
+    Returns (meeting_id, transcript hash, chunks). Chunking is skipped when the
+    transcript still hashes to stored_hash.
+    """
+    transcript = SyncChunkingPipeline.load_transcript(meeting_id)
+    if not transcript:
+        return meeting_id, None, None
+    transcript_hash = content_hash(transcript)
+    if transcript_hash == stored_hash:
+        return meeting_id, transcript_hash, None
+    chunks = SyncChunkingPipeline.chunk_text(_worker_chunker, transcript, meeting_id, pool_embeddings)
+    return meeting_id, transcript_hash, chunks
+
 
 class SyncChunkingPipeline:
-    def __init__(self):
-        """Initialize chunking pipeline with model2vec embeddings"""
+    def __init__(self, pool_embeddings: bool = False, stream_window: Optional[int] = None,
+                 embedding_cache_dir: Optional[Path] = None,
+                 encode_batch_size: int = DEFAULT_ENCODE_BATCH_SIZE):
+        """Initialize chunking pipeline with model2vec embeddings
+        
+        With pool_embeddings, chunk embeddings are pooled from the sentence
+        embeddings the semantic chunker already computed instead of encoding
+        each chunk text again. With stream_window, run() streams each
+        transcript through chunking, embedding and storage in windows of that
+        many characters (see stream_chunks). With embedding_cache_dir, encoded
+        chunk texts are cached on disk across runs and chunker settings.
+        encode_batch_size is the batch size of every model encode call.
+        """
         # Create synchronous database engine
         DATABASE_URL = os.getenv("SUPABASE_DB_URL")
         # Convert asyncpg URL to psycopg2 URL for sync
@@ -59,17 +228,29 @@ class SyncChunkingPipeline:
         
         # Initialize model2vec embedding model
         logger.info("Loading model2vec embeddings...")
-        self.embeddings = StaticModel.from_pretrained('minishlab/potion-base-8M')
+        self.embeddings = StaticModel.from_pretrained(EMBEDDING_MODEL)
         
-        # Initialize semantic chunker with model2vec
+        # Initialize semantic chunker with the same model2vec instance
         logger.info("Initializing semantic chunker...")
-        self.chunker = SemanticChunker(
-            embedding_model='minishlab/potion-base-8M',
-            chunk_size=1000,  # Target chunk size in tokens
-            threshold=0.5,  # Threshold for semantic similarity
-            min_chunk_size=200,  # Minimum chunk size
-            min_sentences=1  # Minimum sentences per chunk
-        )
+        self.chunker = build_chunker(self.embeddings)
+        
+        self.embedding_cache = None
+        if embedding_cache_dir is not None:
+            self.embedding_cache = DiskEmbeddingCache(embedding_cache_dir, EMBEDDING_MODEL, dim=EMBEDDING_DIM)
+        
+        self.pool_embeddings = pool_embeddings
+        self.stream_window = stream_window
+        self.encode_batch_size = encode_batch_size
+        # Called as claim_guard(session, meeting_ids) before chunks are replaced;
+        # queue workers use it to check (and lock) their claims in the same transaction
+        self.claim_guard: Optional[Callable[[Session, List[str]], None]] = None
+        self.fingerprint = chunking_fingerprint(pool_embeddings, stream_window)
+        
+        # Chunk embeddings pooled from sentence embeddings, taken from stored
+        # chunks with the same text, or newly encoded
+        self.embedding_counts = {'pooled': 0, 'reused': 0, 'encoded': 0}
+        # Rows written and time spent in store_meetings, for write throughput
+        self.write_counts = {'rows': 0, 'seconds': 0.0}
         
         logger.info("Initialized chunking pipeline with model2vec embeddings (256 dimensions)")
 
@@ -85,16 +266,17 @@ class SyncChunkingPipeline:
         logger.info(f"Found {len(meetings)} meetings from 2025")
         return meetings
 
-    def load_transcript(self, meeting_id: str) -> Optional[str]:
+    @staticmethod
+    def load_transcript(meeting_id: str) -> Optional[str]:
         """Load transcript from local file"""
-        transcript_path = transcripts_dir / f"{meeting_id}.txt"
+        path = transcript_path(meeting_id)
         
-        if not transcript_path.exists():
-            logger.warning(f"Transcript not found: {transcript_path}")
+        if not path.exists():
+            logger.warning(f"Transcript not found: {path}")
             return None
         
         try:
-            with open(transcript_path, 'r', encoding='utf-8') as f:
+            with open(path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
             logger.debug(f"Loaded transcript for {meeting_id}: {len(content)} characters")
@@ -106,113 +288,367 @@ class SyncChunkingPipeline:
 
     def chunk_transcript(self, transcript: str, meeting_id: str) -> List[Dict]:
         """Chunk transcript using semantic chunking"""
+        return self.chunk_text(self.chunker, transcript, meeting_id, self.pool_embeddings)
+
+    @staticmethod
+    def chunk_text(chunker: SemanticChunker, transcript: str, meeting_id: str,
+                   pool_embeddings: bool = False) -> List[Dict]:
+        """Chunk a transcript with the given chunker (also used by pool workers)
+        
+        With pool_embeddings, each chunk also carries an 'embedding' pooled from
+        its sentence embeddings.
+        """
         try:
             # Use chonkie to create semantic chunks
-            chunks = self.chunker.chunk(transcript)
+            chunks = chunker.chunk(transcript)
             
             logger.info(f"Created {len(chunks)} chunks for meeting {meeting_id}")
             
             # Format chunks for storage
-            formatted_chunks = []
-            for i, chunk in enumerate(chunks):
-                # Extract basic metadata that's JSON serializable
-                token_count = getattr(chunk, 'token_count', len(chunk.text.split()))
-                
-                formatted_chunks.append({
-                    'chunk_index': i,
-                    'chunk_text': chunk.text,
-                    'metadata': {
-                        'token_count': int(token_count),
-                        'chunk_length': len(chunk.text)
-                    }
-                })
-            
-            return formatted_chunks
+            return [SyncChunkingPipeline.format_chunk(chunk, i, pool_embeddings) for i, chunk in enumerate(chunks)]
             
         except Exception as e:
             logger.error(f"Error chunking transcript for {meeting_id}: {e}")
             return []
 
-    def generate_embeddings(self, chunks: List[Dict]) -> List[List[float]]:
-        """Generate embeddings for chunks using model2vec"""
+    @staticmethod
+    def format_chunk(chunk, chunk_index: int, pool_embeddings: bool = False) -> Dict:
+        """Chunk dict for storage from a chonkie chunk"""
+        # Extract basic metadata that's JSON serializable
+        token_count = getattr(chunk, 'token_count', len(chunk.text.split()))
+        
+        formatted_chunk = {
+            'chunk_index': chunk_index,
+            'chunk_text': chunk.text,
+            'metadata': {
+                'token_count': int(token_count),
+                'chunk_length': len(chunk.text)
+            }
+        }
+        if pool_embeddings:
+            formatted_chunk['embedding'] = pool_sentence_embeddings(chunk)
+        return formatted_chunk
+
+    def is_unchanged(self, meeting: Meeting, transcript_hash: str) -> bool:
+        """True if the meeting's stored chunks were built from this transcript with the current settings"""
+        return meeting.transcript_hash == transcript_hash and meeting.chunking_fingerprint == self.fingerprint
+
+    def load_existing_embeddings(self, session: Session, meetings: List[Meeting]) -> Dict[str, np.ndarray]:
+        """Stored chunk embeddings by text hash, for meetings chunked with the current settings"""
+        meeting_ids = [m.meeting_id for m in meetings if m.chunking_fingerprint == self.fingerprint]
+        if not meeting_ids:
+            return {}
+        
+        rows = session.execute(
+            select(MeetingChunk.text_hash, MeetingChunk.embedding).where(
+                MeetingChunk.meeting_id.in_(meeting_ids),
+                MeetingChunk.embedding.isnot(None)
+            )
+        )
+        return {text_hash: embedding for text_hash, embedding in rows}
+
+    def generate_embeddings(self, chunks: List[Dict],
+                            existing: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+        """Generate embeddings for chunks using model2vec
+        
+        Chunks that carry a pooled 'embedding' use it, and chunks whose text
+        hash is in existing reuse the stored embedding; only the rest are
+        encoded. Returns a float32 matrix aligned with chunks; the COPY writer sends its
+        buffer as is, so rows are never converted to Python lists.
+        """
         try:
             # Extract text from chunks
             texts = [chunk['chunk_text'] for chunk in chunks]
+            existing = existing or {}
+            embeddings = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+            pooled, reused, missing = 0, 0, []
+            for i, (chunk, text) in enumerate(zip(chunks, texts)):
+                text_hash = content_hash(text)
+                if chunk.get('embedding') is not None:
+                    embeddings[i] = chunk['embedding']
+                    pooled += 1
+                elif text_hash in existing:
+                    embeddings[i] = existing[text_hash]
+                    reused += 1
+                else:
+                    missing.append(i)
             
-            logger.debug(f"Generating embeddings for {len(texts)} chunks")
+            logger.debug(f"Generating embeddings for {len(missing)} of {len(texts)} chunks")
             
             # Generate embeddings using model2vec (synchronous)
-            embeddings = self.embeddings.encode(texts)
+            if missing:
+                embeddings[missing] = self.encode_texts([texts[i] for i in missing])
             
-            # Convert numpy arrays to lists for JSON serialization
-            embeddings_list = [emb.tolist() for emb in embeddings]
-            
-            logger.info(f"Generated {len(embeddings_list)} embeddings (256 dimensions each)")
-            return embeddings_list
+            self.embedding_counts['pooled'] += pooled
+            self.embedding_counts['encoded'] += len(missing)
+            self.embedding_counts['reused'] += reused
+            logger.info(
+                f"Generated {len(missing)} embeddings (256 dimensions each), "
+                f"pooled {pooled} from sentence embeddings, reused {reused} for unchanged chunk texts"
+            )
+            return embeddings
             
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
-            return []
+            return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
 
-    def store_chunks(self, session: Session, meeting: Meeting, 
-                     chunks: List[Dict], embeddings: List[List[float]]):
-        """Store chunks and embeddings in database"""
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the model, through the on-disk embedding cache if enabled"""
+        def encode(batch: List[str]) -> np.ndarray:
+            return self.embeddings.encode(batch, batch_size=self.encode_batch_size)
+        
+        if self.embedding_cache is None:
+            return encode(texts)
+        return self.embedding_cache.encode(encode, texts)
+
+    def bump_index_version(self, session: Session):
+        """Bump the search index version so search result caches drop stale entries"""
+        session.execute(
+            update(SearchIndexState)
+            .where(SearchIndexState.id == 1)
+            .values(version=SearchIndexState.version + 1, updated_at=func.now())
+        )
+
+    def update_meeting_embeddings(self, session: Session, meeting_ids: List[str]):
+        """Recompute the meetings' centroids from their stored chunk embeddings"""
+        # The upsert below has no row for a meeting left without embedded
+        # chunks, so drop its old centroid explicitly
+        session.execute(
+            text("""
+            DELETE FROM meeting_embeddings me
+            WHERE me.meeting_id = ANY(:meeting_ids)
+              AND NOT EXISTS (
+                  SELECT 1 FROM meeting_chunks mc
+                  WHERE mc.meeting_id = me.meeting_id AND mc.embedding IS NOT NULL
+              )
+            """),
+            {"meeting_ids": meeting_ids}
+        )
+        session.execute(
+            text("""
+            INSERT INTO meeting_embeddings (meeting_id, centroid, chunk_count, updated_at)
+            SELECT meeting_id, AVG(l2_normalize(embedding)), COUNT(*), now()
+            FROM meeting_chunks
+            WHERE meeting_id = ANY(:meeting_ids) AND embedding IS NOT NULL
+            GROUP BY meeting_id
+            ON CONFLICT (meeting_id) DO UPDATE SET
+                centroid = EXCLUDED.centroid,
+                chunk_count = EXCLUDED.chunk_count,
+                updated_at = EXCLUDED.updated_at
+            """),
+            {"meeting_ids": meeting_ids}
+        )
+
+    def lock_meetings(self, session: Session, meeting_ids: List[str]):
+        """Serialize writers of the same meetings until this transaction ends
+        
+        Without it, two transactions replacing one meeting's chunks each DELETE
+        only the rows they can see and both COPY, leaving duplicate chunks.
+        Locks are taken in meeting_id order, so overlapping batches cannot deadlock.
+        """
+        session.execute(
+            text("""
+            SELECT pg_advisory_xact_lock(hashtext(meeting_id))
+            FROM (SELECT unnest(CAST(:meeting_ids AS text[])) AS meeting_id ORDER BY 1) ids
+            """),
+            {"meeting_ids": sorted(meeting_ids)}
+        )
+        if self.claim_guard is not None:
+            self.claim_guard(session, meeting_ids)
+
+    def store_meetings(self, session: Session,
+                       batch: List[Tuple[Meeting, List[Dict], np.ndarray, Optional[str]]]) -> int:
+        """Replace the chunks of a batch of meetings in one transaction
+        
+        batch holds (meeting, chunks, embeddings, transcript_hash) per meeting.
+        Old chunks go in a single DELETE and new ones in a single binary COPY.
+        Returns the number of rows written.
+        """
+        meeting_ids = [meeting.meeting_id for meeting, _, _, _ in batch]
+        start = time.perf_counter()
         try:
-            # Delete existing chunks for this meeting
-            existing = session.execute(
-                select(MeetingChunk).where(MeetingChunk.meeting_id == meeting.meeting_id)
-            )
-            for chunk in existing.scalars():
-                session.delete(chunk)
+            self.lock_meetings(session, meeting_ids)
+            cursor = session.connection().connection.cursor()
+            try:
+                delete_chunks(cursor, meeting_ids)
+                rows = copy_chunks(cursor, (
+                    (meeting.meeting_id, chunks, embeddings) for meeting, chunks, embeddings, _ in batch
+                ))
+            finally:
+                cursor.close()
             
-            # Create new chunks
-            for chunk_data, embedding in zip(chunks, embeddings):
-                chunk = MeetingChunk(
-                    meeting_id=meeting.meeting_id,
-                    chunk_index=chunk_data['chunk_index'],
-                    chunk_text=chunk_data['chunk_text'],
-                    embedding=embedding,
-                    meta_data=chunk_data.get('metadata', {})
-                )
-                session.add(chunk)
+            self.finish_store(session, [(meeting.meeting_id, transcript_hash) for meeting, _, _, transcript_hash in batch])
+            
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error storing chunks for {', '.join(meeting_ids)}: {e}")
+            raise
+        
+        self.record_write(rows, len(batch), time.perf_counter() - start)
+        return rows
+
+    def store_chunk_stream(self, session: Session, meeting: Meeting,
+                           batches: Iterator[Tuple[List[Dict], np.ndarray]],
+                           transcript_hash: Optional[str] = None) -> int:
+        """Replace a meeting's chunks from a stream of (chunks, embeddings) batches
+        
+        Each batch is COPYed as soon as it arrives, inside one transaction that
+        commits after the last batch, so readers never see a partial meeting.
+        Nothing is changed if the stream is empty. Returns the number of rows written.
+        """
+        start = time.perf_counter()
+        rows = 0
+        try:
+            self.lock_meetings(session, [meeting.meeting_id])
+            cursor = session.connection().connection.cursor()
+            try:
+                delete_chunks(cursor, [meeting.meeting_id])
+                for chunks, embeddings in batches:
+                    rows += copy_chunks(cursor, [(meeting.meeting_id, chunks, embeddings)])
+                    logger.debug(f"Wrote {rows} chunks for meeting {meeting.meeting_id}")
+            finally:
+                cursor.close()
             
-            session.commit()
-            logger.info(f"Stored {len(chunks)} chunks for meeting {meeting.meeting_id}")
+            if not rows:
+                session.rollback()
+                return 0
+            self.finish_store(session, [(meeting.meeting_id, transcript_hash)])
             
         except Exception as e:
             session.rollback()
             logger.error(f"Error storing chunks for {meeting.meeting_id}: {e}")
             raise
+        
+        self.record_write(rows, 1, time.perf_counter() - start)
+        return rows
+
+    def finish_store(self, session: Session, stored: List[Tuple[str, Optional[str]]]):
+        """Centroids, content hashes and index version for (meeting_id, transcript_hash) pairs, then commit"""
+        # Same transaction as the chunk changes, so the centroid and
+        # caches never miss an update
+        self.update_meeting_embeddings(session, [meeting_id for meeting_id, _ in stored])
+        # Record what the chunks were built from, so unchanged meetings are skipped next run
+        for meeting_id, transcript_hash in stored:
+            session.execute(
+                update(Meeting)
+                .where(Meeting.meeting_id == meeting_id)
+                .values(transcript_hash=transcript_hash, chunking_fingerprint=self.fingerprint)
+            )
+        self.bump_index_version(session)
+        session.commit()
+
+    def record_write(self, rows: int, meetings: int, elapsed: float):
+        self.write_counts['rows'] += rows
+        self.write_counts['seconds'] += elapsed
+        logger.info(
+            f"Stored {rows} chunks for {meetings} meeting(s) in {elapsed:.2f}s "
+            f"({rows / elapsed if elapsed else 0:.0f} rows/s)"
+        )
 
-    def process_meeting(self, session: Session, meeting: Meeting) -> bool:
-        """Process a single meeting: chunk and embed"""
+    def store_chunks(self, session: Session, meeting: Meeting, 
+                     chunks: List[Dict], embeddings: np.ndarray,
+                     transcript_hash: Optional[str] = None):
+        """Store chunks and embeddings in database"""
+        self.store_meetings(session, [(meeting, chunks, embeddings, transcript_hash)])
+
+    def process_meeting(self, session: Session, meeting: Meeting) -> str:
+        """Process a single meeting: chunk and embed. Returns STORED, UNCHANGED or FAILED"""
         try:
             logger.info(f"Processing meeting {meeting.meeting_id}: {meeting.title}")
             
             # Load transcript
             transcript = self.load_transcript(meeting.meeting_id)
             if not transcript:
-                return False
+                return FAILED
+            
+            transcript_hash = content_hash(transcript)
+            if self.is_unchanged(meeting, transcript_hash):
+                logger.info(f"Skipping unchanged meeting {meeting.meeting_id}")
+                return UNCHANGED
             
             # Chunk transcript
             chunks = self.chunk_transcript(transcript, meeting.meeting_id)
             if not chunks:
-                return False
+                return FAILED
             
             # Generate embeddings
-            embeddings = self.generate_embeddings(chunks)
-            if not embeddings or len(embeddings) != len(chunks):
+            existing = self.load_existing_embeddings(session, [meeting])
+            embeddings = self.generate_embeddings(chunks, existing)
+            if len(embeddings) != len(chunks):
                 logger.error(f"Embedding count mismatch for {meeting.meeting_id}")
-                return False
+                return FAILED
             
             # Store in database
-            self.store_chunks(session, meeting, chunks, embeddings)
+            self.store_chunks(session, meeting, chunks, embeddings, transcript_hash)
+            
+            return STORED
+            
+        except Exception as e:
+            logger.error(f"Error processing meeting {meeting.meeting_id}: {e}")
+            return FAILED
+
+    def process_meeting_streaming(self, session: Session, meeting: Meeting) -> str:
+        """Process a single meeting without holding its transcript or chunks in memory
+        
+        Chunks are embedded and written in groups of STREAM_WRITE_BATCH while
+        the rest of the transcript is still being read and chunked.
+        """
+        try:
+            logger.info(f"Streaming meeting {meeting.meeting_id}: {meeting.title}")
+            
+            path = transcript_path(meeting.meeting_id)
+            if not path.exists():
+                logger.warning(f"Transcript not found: {path}")
+                return FAILED
+            
+            transcript_hash = hash_file(path)
+            if self.is_unchanged(meeting, transcript_hash):
+                logger.info(f"Skipping unchanged meeting {meeting.meeting_id}")
+                return UNCHANGED
+            
+            existing = self.load_existing_embeddings(session, [meeting])
+            
+            def batches() -> Iterator[Tuple[List[Dict], np.ndarray]]:
+                batch = []
+                for index, chunk in enumerate(stream_chunks(self.chunker, path, self.stream_window)):
+                    batch.append(self.format_chunk(chunk, index, self.pool_embeddings))
+                    if len(batch) == STREAM_WRITE_BATCH:
+                        yield batch, self.embed_batch(batch, existing)
+                        batch = []
+                if batch:
+                    yield batch, self.embed_batch(batch, existing)
             
-            return True
+            rows = self.store_chunk_stream(session, meeting, batches(), transcript_hash)
+            return STORED if rows else FAILED
             
         except Exception as e:
             logger.error(f"Error processing meeting {meeting.meeting_id}: {e}")
-            return False
+            return FAILED
+
+    def embed_batch(self, chunks: List[Dict], existing: Dict[str, np.ndarray]) -> np.ndarray:
+        """generate_embeddings that raises instead of returning a short result"""
+        embeddings = self.generate_embeddings(chunks, existing)
+        if len(embeddings) != len(chunks):
+            raise ValueError(f"Embedding count mismatch: {len(embeddings)} for {len(chunks)} chunks")
+        return embeddings
+
+    def log_summary(self, counts: Dict[str, int]):
+        logger.info(
+            f"Chunking and embedding complete: {counts[STORED]} succeeded, {counts[FAILED]} failed, "
+            f"{counts[UNCHANGED]} skipped as unchanged; chunk embeddings: {self.embedding_counts['encoded']} encoded, "
+            f"{self.embedding_counts['pooled']} pooled, {self.embedding_counts['reused']} reused"
+        )
+        if self.embedding_cache is not None:
+            stats = self.embedding_cache.stats()
+            logger.info(
+                f"Embedding cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['size']} entries ({stats['bytes'] / 2**20:.0f} MB), {stats['evictions']} evicted"
+            )
+        if self.write_counts['seconds']:
+            logger.info(
+                f"Wrote {self.write_counts['rows']} chunk rows in {self.write_counts['seconds']:.1f}s "
+                f"({self.write_counts['rows'] / self.write_counts['seconds']:.0f} rows/s)"
+            )
 
     def run(self):
         """Main execution function"""
@@ -222,35 +658,205 @@ class SyncChunkingPipeline:
                 meetings = self.get_2025_meetings(session)
                 
                 # Process each meeting
-                success_count = 0
-                failed_count = 0
+                counts = {STORED: 0, UNCHANGED: 0, FAILED: 0}
                 
                 for i, meeting in enumerate(meetings, 1):
                     logger.info(f"Processing meeting {i}/{len(meetings)}")
                     
-                    success = self.process_meeting(session, meeting)
-                    if success:
-                        success_count += 1
+                    if self.stream_window:
+                        status = self.process_meeting_streaming(session, meeting)
                     else:
-                        failed_count += 1
+                        status = self.process_meeting(session, meeting)
+                    counts[status] += 1
                     
                     # Small delay to be respectful
-                    if i < len(meetings):
+                    if i < len(meetings) and status != UNCHANGED:
                         time.sleep(0.1)
                 
-                logger.info(f"Chunking and embedding complete: {success_count} succeeded, {failed_count} failed")
+                self.log_summary(counts)
                 
         except Exception as e:
             logger.error(f"Pipeline error: {e}")
             raise
 
+    def encode_meetings(self, pending: List[Tuple[Meeting, str, List[Dict]]]) -> List[Tuple[Meeting, List[Dict], np.ndarray, str]]:
+        """Encode the chunks of several meetings in one model call, split back per meeting"""
+        with self.Session() as session:
+            existing = self.load_existing_embeddings(session, [meeting for meeting, _, _ in pending])
+        all_chunks = [chunk for _, _, chunks in pending for chunk in chunks]
+        embeddings = self.embed_batch(all_chunks, existing)
+        
+        encoded = []
+        offset = 0
+        for meeting, transcript_hash, chunks in pending:
+            encoded.append((meeting, chunks, embeddings[offset:offset + len(chunks)], transcript_hash))
+            offset += len(chunks)
+        return encoded
+
+    def write_worker(self, write_queue: queue.Queue, results: Dict):
+        """Writer stage: store encoded batches from the queue until the None sentinel
+        
+        Failures are counted and logged but never end the loop: the encoder
+        blocks on the bounded queue, so a writer that stopped taking batches
+        would hang the run. results is this thread's own; the caller merges it
+        after joining.
+        """
+        session = None
+        while True:
+            batch = write_queue.get()
+            if batch is None:
+                break
+            meeting_ids = [meeting.meeting_id for meeting, _, _, _ in batch]
+            try:
+                if session is None:
+                    session = self.Session()
+                results['chunks'] += self.store_meetings(session, batch)
+                results[STORED] += len(batch)
+            except Exception as e:
+                logger.error(f"Writer failed to store {len(batch)} meetings ({', '.join(meeting_ids)}): {e}")
+                results[FAILED] += len(batch)
+                # Start over with a fresh session in case the connection is broken
+                if session is not None:
+                    session.close()
+                    session = None
+        if session is not None:
+            session.close()
+
+    def run_parallel(self, workers: int = os.cpu_count() or 2,
+                     batch_size: int = DEFAULT_ENCODE_BATCH_SIZE,
+                     queue_size: int = DEFAULT_WRITE_QUEUE_SIZE):
+        """
+        Parallel execution: chunk -> encode -> write as three overlapping stages
+        
+        1. A process pool loads and semantically chunks transcripts (CPU bound)
+        2. This process pools chunk texts from many meetings into encode calls
+           of at least `batch_size` chunks
+        3. A writer thread stores each encoded batch in one transaction from a
+           bounded queue, so database writes overlap with chunking and encoding,
+           and the encoder blocks instead of piling up results when writes fall behind
+        """
+        start = time.perf_counter()
+        self.encode_batch_size = batch_size
+        with self.Session() as session:
+            meetings = self.get_2025_meetings(session)
+            session.expunge_all()
+        by_id = {meeting.meeting_id: meeting for meeting in meetings}
+        
+        results = {STORED: 0, UNCHANGED: 0, FAILED: 0, 'chunks': 0}
+        # Counted by the writer thread alone, merged into results once it is done
+        written = {STORED: 0, FAILED: 0, 'chunks': 0}
+        write_queue = queue.Queue(maxsize=queue_size)
+        writer = threading.Thread(target=self.write_worker, args=(write_queue, written), daemon=True)
+        writer.start()
+        
+        pending = []
+        pending_chunks = 0
+        
+        def flush():
+            nonlocal pending, pending_chunks
+            if not pending:
+                return
+            try:
+                write_queue.put(self.encode_meetings(pending))
+            except Exception as e:
+                logger.error(f"Error encoding {len(pending)} meetings: {e}")
+                results[FAILED] += len(pending)
+            pending, pending_chunks = [], 0
+        
+        def stored_hash(meeting: Meeting) -> Optional[str]:
+            # Workers skip chunking transcripts that still match this hash
+            return meeting.transcript_hash if meeting.chunking_fingerprint == self.fingerprint else None
+        
+        logger.info(f"Chunking {len(meetings)} meetings on {workers} worker processes...")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_chunk_worker) as pool:
+            remaining = iter(meetings)
+            # Keep a couple of transcripts per worker in flight, not all of them
+            in_flight = set()
+            for meeting in remaining:
+                in_flight.add(pool.submit(_chunk_meeting_worker, meeting.meeting_id,
+                                          stored_hash(meeting), self.pool_embeddings))
+                if len(in_flight) >= workers * 2:
+                    break
+            
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        meeting_id, transcript_hash, chunks = future.result()
+                    except Exception as e:
+                        logger.error(f"Chunking worker failed: {e}")
+                        results[FAILED] += 1
+                        continue
+                    meeting = by_id[meeting_id]
+                    if transcript_hash is not None and self.is_unchanged(meeting, transcript_hash):
+                        logger.info(f"Skipping unchanged meeting {meeting_id}")
+                        results[UNCHANGED] += 1
+                        continue
+                    if not chunks:
+                        results[FAILED] += 1
+                        continue
+                    pending.append((meeting, transcript_hash, chunks))
+                    pending_chunks += len(chunks)
+                    if pending_chunks >= batch_size:
+                        flush()
+                
+                for meeting in remaining:
+                    in_flight.add(pool.submit(_chunk_meeting_worker, meeting.meeting_id,
+                                              stored_hash(meeting), self.pool_embeddings))
+                    if len(in_flight) >= workers * 2:
+                        break
+        
+        flush()
+        write_queue.put(None)
+        writer.join()
+        for key, count in written.items():
+            results[key] += count
+        
+        elapsed = time.perf_counter() - start
+        self.log_summary(results)
+        logger.info(f"Stored {results['chunks']} chunks in {elapsed:.1f}s ({results['chunks'] / elapsed:.1f} chunks/s)")
+
 
 def main():
     """Main entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Chunk and embed 2025 meeting transcripts')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Chunking processes; above 1 runs the parallel pipeline (default: 1)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_ENCODE_BATCH_SIZE,
+                       help=f'Model encode batch size, and chunks pooled per encode call in parallel mode '
+                            f'(default: {DEFAULT_ENCODE_BATCH_SIZE})')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_WRITE_QUEUE_SIZE,
+                       help=f'Encoded batches buffered for the writer (default: {DEFAULT_WRITE_QUEUE_SIZE})')
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream each transcript through chunking, embedding and storage (sequential mode)')
+    parser.add_argument('--stream-window', type=int, default=DEFAULT_STREAM_WINDOW,
+                       help=f'Characters chunked at a time when streaming (default: {DEFAULT_STREAM_WINDOW})')
+    parser.add_argument('--embedding-cache', type=Path, default=DEFAULT_CACHE_DIR,
+                       help=f'On-disk cache of encoded chunk texts (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-embedding-cache', action='store_true',
+                       help='Encode every chunk text, bypassing the on-disk embedding cache')
+    parser.add_argument('--pool-sentence-embeddings', action='store_true',
+                       help="Pool chunk embeddings from the chunker's sentence embeddings instead of re-encoding chunks")
+    args = parser.parse_args()
+    if args.stream_window < 1:
+        parser.error("--stream-window must be at least 1 character")
+    if args.stream and args.workers > 1:
+        parser.error("--stream processes meetings one at a time; it cannot be combined with --workers above 1")
+    
     logger.info("Starting synchronous chunking and embedding pipeline for 2025 meetings...")
     
-    pipeline = SyncChunkingPipeline()
-    pipeline.run()
+    pipeline = SyncChunkingPipeline(
+        pool_embeddings=args.pool_sentence_embeddings,
+        stream_window=args.stream_window if args.stream else None,
+        embedding_cache_dir=None if args.no_embedding_cache else args.embedding_cache,
+        encode_batch_size=args.batch_size
+    )
+    if args.workers > 1:
+        pipeline.run_parallel(workers=args.workers, batch_size=args.batch_size, queue_size=args.queue_size)
+    else:
+        pipeline.run()
     
     return 0
 
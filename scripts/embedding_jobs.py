@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Distributed Chunk-and-Embed Workers
+
+Runs SyncChunkingPipeline against the embedding_jobs work queue instead of
+one long loop over every meeting, so any number of workers on any machine
+can share a run and a crash only loses the worker's current claims:
+
+    embedding_jobs.py enqueue [--since 2025-01-01] [--reset]
+    embedding_jobs.py work [--batch-size 4] [--wait]
+    embedding_jobs.py progress
+    embedding_jobs.py reclaim
+"""
+
+import os
+import socket
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from loguru import logger
+from sqlalchemy import create_engine, select
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+# Import the pipeline from the same directory
+from chunk_and_embed_sync import SyncChunkingPipeline, FAILED, DEFAULT_STREAM_WINDOW
+from database.job_queue import (
+    EmbeddingJobQueue, Heartbeat, DEFAULT_MAX_ATTEMPTS, DEFAULT_STALE_AFTER, DEFAULT_HEARTBEAT_INTERVAL
+)
+from database.models import Meeting
+from search.embedding_cache import DEFAULT_CACHE_DIR
+
+
+def process_claims(pipeline: SyncChunkingPipeline, queue: EmbeddingJobQueue, heartbeat: Heartbeat,
+                   meeting_ids: List[str]) -> int:
+    """Chunk, embed and store claimed meetings, completing or failing each job"""
+    processed = 0
+    # Chunks are only replaced while this worker still holds the meeting's claim
+    pipeline.claim_guard = queue.lock_claims
+    heartbeat.meeting_ids = list(meeting_ids)
+    with pipeline.Session() as session:
+        meetings = session.execute(
+            select(Meeting).where(Meeting.meeting_id.in_(meeting_ids))
+        ).scalars().all()
+        for meeting in meetings:
+            if pipeline.stream_window:
+                status = pipeline.process_meeting_streaming(session, meeting)
+            else:
+                status = pipeline.process_meeting(session, meeting)
+
+            if status == FAILED:
+                queue.fail(meeting.meeting_id, "chunking, embedding or storage failed (see worker log)")
+            elif not queue.complete(meeting.meeting_id):
+                # Stored, but the claim expired meanwhile; the retry will find it unchanged
+                logger.warning(f"Lost the claim on {meeting.meeting_id} before completing it")
+            heartbeat.meeting_ids.remove(meeting.meeting_id)
+            processed += 1
+    heartbeat.meeting_ids = []
+    return processed
+
+
+def run_worker(pipeline: SyncChunkingPipeline, queue: EmbeddingJobQueue, batch_size: int,
+               wait: bool, poll_interval: float, heartbeat_interval: float) -> int:
+    """Claim and process batches until the queue is empty (or forever with wait)"""
+    processed = 0
+    with Heartbeat(queue, heartbeat_interval) as heartbeat:
+        while True:
+            queue.reclaim_stale()
+            meeting_ids = queue.claim(batch_size)
+            if not meeting_ids:
+                if not wait:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            logger.info(f"Claimed {len(meeting_ids)} jobs: {', '.join(meeting_ids)}")
+            processed += process_claims(pipeline, queue, heartbeat, meeting_ids)
+
+    logger.info(f"Worker {queue.worker_id} finished: {processed} jobs processed")
+    return processed
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Chunk-and-embed work queue')
+    parser.add_argument('--worker-id', default=f"{socket.gethostname()}:{os.getpid()}",
+                       help='Name recorded on claims (default: host:pid)')
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                       help=f'Attempts before a job is marked failed (default: {DEFAULT_MAX_ATTEMPTS})')
+    parser.add_argument('--stale-after', type=float, default=DEFAULT_STALE_AFTER,
+                       help=f'Seconds without a heartbeat before a claim is reclaimed (default: {DEFAULT_STALE_AFTER:.0f})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = commands.add_parser('enqueue', help='Add a job per meeting')
+    enqueue.add_argument('--since', default='2025-01-01', help='Meetings on or after this date (default: 2025-01-01)')
+    enqueue.add_argument('--meeting-id', nargs='+', help='Only these meetings')
+    enqueue.add_argument('--reset', action='store_true', help='Requeue existing done and failed jobs too')
+
+    work = commands.add_parser('work', help='Claim and process jobs')
+    work.add_argument('--batch-size', type=int, default=4, help='Jobs claimed at a time (default: 4)')
+    work.add_argument('--wait', action='store_true', help='Keep polling for new jobs instead of exiting when empty')
+    work.add_argument('--poll-interval', type=float, default=10.0, help='Seconds between polls with --wait (default: 10)')
+    work.add_argument('--heartbeat-interval', type=float, default=DEFAULT_HEARTBEAT_INTERVAL,
+                     help=f'Seconds between heartbeats (default: {DEFAULT_HEARTBEAT_INTERVAL:.0f})')
+    work.add_argument('--stream', action='store_true', help='Stream each transcript (bounded memory)')
+    work.add_argument('--no-embedding-cache', action='store_true', help='Bypass the on-disk embedding cache')
+
+    commands.add_parser('progress', help='Show job counts per status and ingestion lag')
+    commands.add_parser('reclaim', help='Release claims with stale heartbeats')
+    args = parser.parse_args()
+
+    if args.command == 'work':
+        pipeline = SyncChunkingPipeline(
+            stream_window=DEFAULT_STREAM_WINDOW if args.stream else None,
+            embedding_cache_dir=None if args.no_embedding_cache else DEFAULT_CACHE_DIR
+        )
+        queue = EmbeddingJobQueue(pipeline.engine, args.worker_id, args.max_attempts, args.stale_after)
+        run_worker(pipeline, queue, args.batch_size, args.wait, args.poll_interval, args.heartbeat_interval)
+        return 0
+
+    sync_url = os.getenv("SUPABASE_DB_URL").replace("postgresql+asyncpg://", "postgresql://")
+    engine = create_engine(sync_url, pool_pre_ping=True, connect_args={"sslmode": "require"})
+    queue = EmbeddingJobQueue(engine, args.worker_id, args.max_attempts, args.stale_after)
+
+    if args.command == 'enqueue':
+        count = queue.enqueue(datetime.strptime(args.since, '%Y-%m-%d'), args.meeting_id, reset=args.reset)
+        logger.info(f"Enqueued {count} jobs")
+    elif args.command == 'reclaim':
+        logger.info(f"Reclaimed {queue.reclaim_stale()} stale claims")
+    else:
+        print(f"{'status':<10} {'jobs':>6} {'workers':>8} {'max attempts':>13}  last finished")
+        for row in queue.progress():
+            print(f"{row['status']:<10} {row['jobs']:>6} {row['workers']:>8} {row['max_attempts']:>13}  "
+                  f"{row['last_finished'] or '-'}")
+        lag = queue.lag()
+        if lag['p50_seconds'] is not None:
+            print(f"\nIngestion lag (last day): p50 {lag['p50_seconds']:.0f}s, p95 {lag['p95_seconds']:.0f}s")
+        if lag['queued']:
+            print(f"{lag['queued']} queued, oldest for {lag['oldest_queued_seconds']:.0f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Export Chunk Embeddings for Local Search
+
+This script streams meeting_chunks embeddings from Supabase into a float32 .npy
+file plus a JSON sidecar, so semantic_search.py --backend local can answer
+queries with exact search, fully offline.
+"""
+
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from search.mmap_engine import export_embeddings
+
+# Load environment variables
+load_dotenv(project_root / "local.env")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Export chunk embeddings for local exact search')
+    parser.add_argument('--index-dir', type=Path, default=project_root / "indexes" / "exact",
+                       help='Output directory (default: indexes/exact)')
+    parser.add_argument('--since', default='2025-01-01',
+                       help='Only export meetings on or after this date (default: 2025-01-01)')
+    parser.add_argument('--batch-size', type=int, default=5000,
+                       help='Rows fetched per round trip (default: 5000)')
+    args = parser.parse_args()
+
+    DATABASE_URL = os.getenv("SUPABASE_DB_URL")
+    sync_url = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    engine = create_engine(sync_url, echo=False, connect_args={"sslmode": "require"})
+    Session = sessionmaker(bind=engine)
+
+    since = datetime.strptime(args.since, '%Y-%m-%d') if args.since else None
+
+    with Session() as session:
+        count = export_embeddings(session, args.index_dir, since=since, batch_size=args.batch_size)
+
+    logger.info(f"Exported {count} chunks to {args.index_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,44 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 import json
 
-def scrape_video_page(url):
-    """Scrape video page to get agenda items with timestamps"""
-    
-    response = requests.get(url)
-    response.raise_for_status()
-    
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
-    # Extract agenda items and timestamps
-    agenda_items = []
-    
-    # Find all index-point elements (agenda items)
-    for item in soup.find_all(class_='index-point'):
-        time_attr = item.get('time')
-        if time_attr:
-            # Get the agenda text
-            text = item.get_text(strip=True)
-            
-            # Skip if no text content
-            if not text:
-                continue
-            
-            # Convert time from seconds to HH:MM:SS format
-            total_seconds = int(time_attr)
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            seconds = total_seconds % 60
-            time_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            
-            agenda_items.append({
-                'time_seconds': total_seconds,
-                'time_formatted': time_formatted,
-                'agenda_name': text
-            })
+from http_client import get_text
+from html_parsing import parse_video_page
+
+def scrape_video_page(url, cache=None):
+    """Scrape video page to get agenda items with timestamps (through an HttpCache if given)"""
     
-    return agenda_items
+    return parse_video_page(get_text(url, cache))
 
 def main():
     # Example URL
@@ -0,0 +1,357 @@
+"""
+Parsing layer for Granicus pages (listing, video player and transcript pages)
+
+Each page type has several extraction strategies with the same output:
+- bs4:      full BeautifulSoup tree, the scrapers' original code
+- strainer: BeautifulSoup over only the elements the extraction needs (SoupStrainer)
+- lxml:     lxml tree walked with XPath, text lengths computed in one pass;
+            the default, used by extract_transcript / parse_video_page / parse_listing
+
+Patterns are compiled once at import. Parsing is CPU-bound, so the async
+scrapers run it in a process pool (parse_in_pool) instead of on the event
+loop. scripts/benchmark_parsing.py times every strategy on cached pages.
+"""
+
+import asyncio
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+
+# Transcript pages
+TRANSCRIPT_ID_RE = re.compile(r'transcript', re.I)
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
+# Same result as collapsing every [ \t]+ run to one space, without rewriting the
+# (very many) runs that are already a single space
+SPACES_RE = re.compile(r'[ \t]{2,}|\t')
+# Divs with more text than this are transcript candidates; shorter results fall back to the body
+SUBSTANTIAL_CHARS = 1000
+BODY_LINE_MIN_CHARS = 20
+
+# Listing pages
+MEDIA_PLAYER_RE = re.compile(r'MediaPlayer\.php.*clip_id=(\d+)')
+CLIP_ID_RE = re.compile(r'clip_id=(\d+)')
+AGENDA_VIEWER_RE = re.compile(r'AgendaViewer\.php')
+TRANSCRIPT_VIEWER_RE = re.compile(r'TranscriptViewer\.php')
+MP3_RE = re.compile(r'https://archive-video\.granicus\.com/.*\.mp3')
+DATE_RE = re.compile(r'(\d{1,2}/\d{1,2}/\d{2,4})')
+DURATION_RE = re.compile(r'(\d{1,2}h\s*\d{1,2}m)')
+DURATION_CLOCK_RE = re.compile(r'(\d{1,2}:\d{2}(?::\d{2})?)')
+
+# Text BeautifulSoup's get_text() leaves out
+SKIPPED_TAGS = {'script', 'style', 'template'}
+
+INDEX_POINT_XPATH = "//*[@time][contains(concat(' ', normalize-space(@class), ' '), ' index-point ')]"
+TRANSCRIPT_DIV_XPATH = (
+    "(//div[contains(translate(@id, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),"
+    " 'transcript')])[1]"
+)
+
+PARSE_WORKERS = os.cpu_count() or 2
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+# === lxml helpers ===
+
+def parse_document(html: str) -> Optional[etree._Element]:
+    """lxml document (always with html/body), or None for an empty page"""
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # Unicode input with an XML encoding declaration must be parsed as bytes
+        try:
+            return lxml.html.document_fromstring(html.encode('utf-8'))
+        except etree.ParserError:
+            return None
+    except etree.ParserError:
+        return None
+
+
+def _collect_strings(element: etree._Element, out: List[str]):
+    """Text nodes under element in document order, as BeautifulSoup's .strings yields them"""
+    if element.text and element.tag not in SKIPPED_TAGS:
+        out.append(element.text)
+    for child in element:
+        # Comments and processing instructions have no text of their own, but a tail
+        if isinstance(child.tag, str) and child.tag not in SKIPPED_TAGS:
+            _collect_strings(child, out)
+        if child.tail:
+            out.append(child.tail)
+
+
+def strings(element: etree._Element) -> List[str]:
+    out = []
+    _collect_strings(element, out)
+    return out
+
+
+def get_text(element: etree._Element, separator: str = "", strip: bool = False) -> str:
+    """BeautifulSoup's Tag.get_text for an lxml element"""
+    if strip:
+        return separator.join(s.strip() for s in strings(element) if s.strip())
+    return separator.join(strings(element))
+
+
+def _div_text_lengths(element: etree._Element, lengths: Dict) -> tuple:
+    """(raw, stripped) text length of element, recording both for every div below it"""
+    raw = stripped = 0
+    if element.text and element.tag not in SKIPPED_TAGS:
+        raw, stripped = len(element.text), len(element.text.strip())
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in SKIPPED_TAGS:
+            child_raw, child_stripped = _div_text_lengths(child, lengths)
+            raw += child_raw
+            stripped += child_stripped
+        if child.tail:
+            raw += len(child.tail)
+            stripped += len(child.tail.strip())
+    if element.tag == 'div':
+        lengths[element] = (raw, stripped)
+    return raw, stripped
+
+
+def clean_transcript(text: str) -> str:
+    if text:
+        text = BLANK_LINES_RE.sub('\n\n', text)
+        if '\t' in text or '  ' in text:
+            text = SPACES_RE.sub(' ', text)
+        text = text.strip()
+    return text
+
+
+def _body_lines(body_text: str) -> str:
+    lines = (line.strip() for line in body_text.split('\n'))
+    return '\n'.join(line for line in lines if line and len(line) > BODY_LINE_MIN_CHARS)
+
+
+# === Transcript pages ===
+
+def extract_transcript_lxml(html: str) -> str:
+    """Cleaned transcript text of a transcript page (may be short or empty)"""
+    root = parse_document(html)
+    if root is None:
+        return ""
+    transcript_text = ""
+
+    # Method 1: a transcript container
+    transcript_div = root.xpath(TRANSCRIPT_DIV_XPATH)
+    if transcript_div:
+        transcript_text = get_text(transcript_div[0], '\n', strip=True)
+    # Method 2: pre-formatted text
+    elif root.find('.//pre') is not None:
+        transcript_text = '\n'.join(get_text(pre, strip=True) for pre in root.iter('pre'))
+    # Method 3: the div with the most text, among those with substantial text
+    else:
+        lengths = {}
+        _div_text_lengths(root, lengths)
+        substantial = [div for div, (_, stripped) in lengths.items() if stripped > SUBSTANTIAL_CHARS]
+        if substantial:
+            # Same document-order tie-break as max() over the bs4 find_all list
+            order = {div: i for i, div in enumerate(root.iter('div'))}
+            substantial.sort(key=order.__getitem__)
+            best_div = max(substantial, key=lambda div: lengths[div][0])
+            transcript_text = get_text(best_div, '\n', strip=True)
+
+    # Method 4: substantial lines of the body text
+    if not transcript_text or len(transcript_text) < SUBSTANTIAL_CHARS:
+        body = root.find('body')
+        if body is not None:
+            body_text = _body_lines(get_text(body, '\n', strip=True))
+            if body_text:
+                transcript_text = body_text
+
+    return clean_transcript(transcript_text)
+
+
+def extract_transcript_bs4(html: str) -> str:
+    """The original full-tree BeautifulSoup extraction (reference for the benchmark)"""
+    soup = BeautifulSoup(html, 'lxml')
+    transcript_text = ""
+
+    transcript_div = soup.find('div', {'id': TRANSCRIPT_ID_RE})
+    if transcript_div:
+        transcript_text = transcript_div.get_text(separator='\n', strip=True)
+    elif soup.find_all('pre'):
+        transcript_text = '\n'.join(pre.get_text(strip=True) for pre in soup.find_all('pre'))
+    else:
+        all_divs = soup.find_all('div')
+        substantial_divs = [div for div in all_divs if len(div.get_text(strip=True)) > SUBSTANTIAL_CHARS]
+        if substantial_divs:
+            best_div = max(substantial_divs, key=lambda d: len(d.get_text()))
+            transcript_text = best_div.get_text(separator='\n', strip=True)
+
+    if not transcript_text or len(transcript_text) < SUBSTANTIAL_CHARS:
+        body = soup.find('body')
+        if body:
+            for script_or_style in body(["script", "style"]):
+                script_or_style.decompose()
+            body_text = _body_lines(body.get_text(separator='\n', strip=True))
+            if body_text:
+                transcript_text = body_text
+
+    return clean_transcript(transcript_text)
+
+
+# === Video player pages ===
+
+def _agenda_item(time_attr: str, text: str) -> Dict:
+    total_seconds = int(time_attr)
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    return {
+        'time_seconds': total_seconds,
+        'time_formatted': f"{hours:02d}:{minutes:02d}:{seconds:02d}",
+        'agenda_name': text
+    }
+
+
+def parse_video_page_lxml(html: str) -> List[Dict]:
+    """Agenda items with timestamps from a video player page"""
+    root = parse_document(html)
+    if root is None:
+        return []
+    agenda_items = []
+    for item in root.xpath(INDEX_POINT_XPATH):
+        text = get_text(item, strip=True)
+        if item.get('time') and text:
+            agenda_items.append(_agenda_item(item.get('time'), text))
+    return agenda_items
+
+
+def _video_page_items(soup: BeautifulSoup) -> List[Dict]:
+    agenda_items = []
+    for item in soup.find_all(class_='index-point'):
+        time_attr = item.get('time')
+        if time_attr:
+            text = item.get_text(strip=True)
+            if text:
+                agenda_items.append(_agenda_item(time_attr, text))
+    return agenda_items
+
+
+def parse_video_page_strainer(html: str) -> List[Dict]:
+    # Strain on the time attribute: a class_ strainer misses multi-class elements
+    return _video_page_items(BeautifulSoup(html, 'lxml', parse_only=SoupStrainer(attrs={'time': True})))
+
+
+def parse_video_page_bs4(html: str) -> List[Dict]:
+    return _video_page_items(BeautifulSoup(html, 'html.parser'))
+
+
+# === Listing pages ===
+
+def _absolute(href: str) -> str:
+    return f"https:{href}" if href.startswith('//') else href
+
+
+def _viewer_link(hrefs: List[str], viewer_re: re.Pattern, clip_id: str) -> Optional[str]:
+    """First link to the viewer for this clip (same match as AgendaViewer\\.php.*clip_id=<id>)"""
+    for href in hrefs:
+        match = viewer_re.search(href)
+        if match and f"clip_id={clip_id}" in href[match.end():]:
+            return _absolute(href)
+    return None
+
+
+def _listing_row(clip_id: str, href: str, cell_texts: List[str], hrefs: List[str]) -> Dict:
+    meeting = {
+        'clip_id': clip_id,
+        'video_url': _absolute(href),
+        'date': None,
+        'duration': None,
+        'agenda_url': _viewer_link(hrefs, AGENDA_VIEWER_RE, clip_id),
+        'transcript_url': _viewer_link(hrefs, TRANSCRIPT_VIEWER_RE, clip_id),
+        'audio_url': next((h for h in hrefs if MP3_RE.search(h)), None),
+    }
+    for cell_text in cell_texts:
+        # Dates are MM/DD/YY; durations "06h 00m", or HH:MM:SS / MM:SS
+        date_match = DATE_RE.search(cell_text)
+        if date_match and not meeting['date']:
+            meeting['date'] = date_match.group(1)
+        duration_match = DURATION_RE.search(cell_text.replace('&nbsp;', ' '))
+        if duration_match and not meeting['duration']:
+            meeting['duration'] = duration_match.group(1)
+        if not meeting['duration']:
+            clock_match = DURATION_CLOCK_RE.search(cell_text)
+            if clock_match:
+                meeting['duration'] = clock_match.group(1)
+    return meeting
+
+
+def parse_listing_lxml(html: str) -> List[Dict]:
+    """One dict per clip on a ViewPublisher listing page (first row wins), in page order"""
+    root = parse_document(html)
+    if root is None:
+        return []
+    meetings = {}
+    for table in root.iter('table'):
+        for row in table.iter('tr'):
+            hrefs = None
+            for link in row.iter('a'):
+                href = link.get('href')
+                if href is None or not MEDIA_PLAYER_RE.search(href):
+                    continue
+                clip_id = CLIP_ID_RE.search(href).group(1)
+                if clip_id in meetings:
+                    continue
+                if hrefs is None:
+                    hrefs = [a.get('href') for a in row.iter('a') if a.get('href') is not None]
+                    cell_texts = [get_text(cell, strip=True) for cell in row.xpath('.//td | .//th')]
+                meetings[clip_id] = _listing_row(clip_id, href, cell_texts, hrefs)
+    return list(meetings.values())
+
+
+def _listing_rows(soup: BeautifulSoup) -> List[Dict]:
+    meetings = {}
+    for table in soup.find_all('table'):
+        for row in table.find_all('tr'):
+            for video_link in row.find_all('a', href=MEDIA_PLAYER_RE):
+                href = video_link.get('href')
+                clip_id = CLIP_ID_RE.search(href).group(1)
+                if clip_id in meetings:
+                    continue
+                hrefs = [a.get('href') for a in row.find_all('a', href=True)]
+                cell_texts = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+                meetings[clip_id] = _listing_row(clip_id, href, cell_texts, hrefs)
+    return list(meetings.values())
+
+
+def parse_listing_strainer(html: str) -> List[Dict]:
+    return _listing_rows(BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('table')))
+
+
+def parse_listing_bs4(html: str) -> List[Dict]:
+    return _listing_rows(BeautifulSoup(html, 'lxml'))
+
+
+# Defaults used by the scrapers
+extract_transcript = extract_transcript_lxml
+parse_video_page = parse_video_page_lxml
+parse_listing = parse_listing_lxml
+
+STRATEGIES: Dict[str, Dict[str, Callable]] = {
+    'transcript': {'bs4': extract_transcript_bs4, 'lxml': extract_transcript_lxml},
+    'video_page': {'bs4': parse_video_page_bs4, 'strainer': parse_video_page_strainer,
+                   'lxml': parse_video_page_lxml},
+    'listing': {'bs4': parse_listing_bs4, 'strainer': parse_listing_strainer, 'lxml': parse_listing_lxml},
+}
+
+
+# === Process pool ===
+
+def parse_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all parsing in this process, started on first use"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _pool
+
+
+async def parse_in_pool(parse: Callable, html: str):
+    """Run a parsing function in the process pool, keeping the event loop free for downloads"""
+    return await asyncio.get_running_loop().run_in_executor(parse_pool(), parse, html)
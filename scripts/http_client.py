@@ -0,0 +1,302 @@
+"""
+Shared HTTP layer for the Granicus scrapers
+
+- TokenBucket / HostRateLimiter: requests per second per host, with bursts
+- AimdConcurrency: how many requests may be in flight, grown by one per
+  round trip while responses are fast and halved on 429/5xx, timeouts or
+  latency above target (additive increase, multiplicative decrease)
+- HttpCache: response bodies on disk with their ETag/Last-Modified; pages
+  are revalidated with conditional GETs and a 304 is served from disk. In
+  replay mode nothing goes to the network and a page that isn't cached
+  raises CacheMiss, so a whole scrape can be re-run offline
+- fetch_text (async) / get_text (sync): GET through the cache and the rate
+  limiter, retrying connection errors, timeouts, 429s and 5xx responses with
+  jittered exponential backoff (Retry-After is honoured when sent)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from loguru import logger
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 4.0  # requests per second per host
+DEFAULT_BURST = 8
+DEFAULT_RETRIES = 4
+DEFAULT_TIMEOUT = 30.0
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_HTTP_CACHE_DIR = Path(__file__).parent.parent / "indexes" / "http_cache"
+
+
+class CacheMiss(Exception):
+    """A replay-only run asked for a page that was never cached"""
+
+
+@dataclass
+class CachedPage:
+    url: str
+    body: bytes
+    encoding: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: Optional[float] = None
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding, errors='replace')
+
+    def validators(self) -> Dict[str, str]:
+        """Headers for a conditional GET of this page"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    def __init__(self, cache_dir: Path = DEFAULT_HTTP_CACHE_DIR, replay: bool = False):
+        """On-disk cache of response bodies keyed by URL; replay=True never touches the network"""
+        self.directory = Path(cache_dir)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.replay = replay
+        # Downloaded in full, answered 304 by the server, or served without a request
+        self.counts = {'downloaded': 0, 'not_modified': 0, 'replayed': 0}
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        shard = self.directory / key[:2]
+        return shard / f"{key}.json", shard / f"{key}.body"
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        meta_path, body_path = self._paths(url)
+        page = self._read(meta_path, body_path)
+        return page if page is not None and page.url == url else None
+
+    def _read(self, meta_path: Path, body_path: Path) -> Optional[CachedPage]:
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return CachedPage(body=body, **meta)
+
+    def pages(self) -> Iterator[CachedPage]:
+        """Every cached page (e.g. to benchmark parsing on real pages)"""
+        for meta_path in sorted(self.directory.glob("*/*.json")):
+            page = self._read(meta_path, meta_path.with_suffix(".body"))
+            if page is not None:
+                yield page
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """Cached page for url; in replay mode a missing page raises CacheMiss"""
+        page = self.get(url)
+        if self.replay and page is None:
+            raise CacheMiss(url)
+        return page
+
+    def put(self, url: str, body: bytes, encoding: str, headers: Mapping[str, str]) -> CachedPage:
+        page = CachedPage(url=url, body=body, encoding=encoding, etag=headers.get('ETag'),
+                          last_modified=headers.get('Last-Modified'), fetched_at=time.time())
+        meta_path, body_path = self._paths(url)
+        meta_path.parent.mkdir(exist_ok=True)
+        meta = {'url': url, 'encoding': page.encoding, 'etag': page.etag,
+                'last_modified': page.last_modified, 'fetched_at': page.fetched_at}
+        # Body first, metadata last: an entry only counts once its metadata exists
+        for path, payload in ((body_path, body), (meta_path, json.dumps(meta).encode())):
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+        return page
+
+    def log_stats(self):
+        logger.info(
+            f"HTTP cache: {self.counts['downloaded']} downloaded, {self.counts['not_modified']} not modified (304), "
+            f"{self.counts['replayed']} replayed from {self.directory}"
+        )
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        """Allow rate acquisitions per second on average and up to burst at once"""
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """One token bucket per host"""
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str):
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        await self._buckets[host].acquire()
+
+
+class AimdConcurrency:
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16,
+                 latency_target: float = 10.0, decrease: float = 0.5):
+        """In-flight request limit adjusted by AIMD between minimum and maximum"""
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.decrease = decrease
+        self.in_flight = 0
+        self.peak = self.limit
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: float, congested: bool):
+        """Free a slot and adjust the limit from the request's outcome"""
+        async with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if congested or latency > self.latency_target:
+                # Requests in flight during congestion all report it; cut once per round trip
+                if now - self._last_decrease > latency:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = now
+                    self.decreases += 1
+                    logger.debug(f"Concurrency cut to {int(self.limit)} (latency {latency:.1f}s, congested={congested})")
+            else:
+                # +1/limit per response is +1 per round trip of limit requests
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self.peak = max(self.peak, self.limit)
+            self._condition.notify_all()
+
+
+class RetryableStatus(Exception):
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max, base * 2^attempt)]"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return min(float(value), BACKOFF_MAX) if value else None
+    except ValueError:
+        # HTTP-date form; fall back to our own backoff
+        return None
+
+
+def make_session(concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT) -> aiohttp.ClientSession:
+    """ClientSession with a connection pool sized for concurrency"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=concurrency),
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    )
+
+
+async def fetch_text(session: aiohttp.ClientSession, url: str, limiter: Optional[HostRateLimiter] = None,
+                     retries: int = DEFAULT_RETRIES, cache: Optional[HttpCache] = None,
+                     concurrency: Optional[AimdConcurrency] = None) -> str:
+    """GET url as text, rate limited per host, retrying transient failures
+    
+    With concurrency, every attempt holds one of its slots and reports its
+    latency and whether it hit a 429/5xx, timeout or connection error.
+    """
+    cached = cache.lookup(url) if cache is not None else None
+    if cache is not None and cache.replay:
+        cache.counts['replayed'] += 1
+        return cached.text
+    
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            await limiter.acquire(url)
+        if concurrency is not None:
+            await concurrency.acquire()
+        start = time.monotonic()
+        congested = True
+        try:
+            async with session.get(url, headers=cached.validators() if cached else None) as response:
+                congested = response.status in RETRY_STATUSES
+                if response.status == 304 and cached is not None:
+                    cache.counts['not_modified'] += 1
+                    return cached.text
+                if response.status in RETRY_STATUSES:
+                    raise RetryableStatus(response.status, parse_retry_after(response.headers.get('Retry-After')))
+                response.raise_for_status()
+                body = await response.read()
+                encoding = response.get_encoding()
+                if cache is not None:
+                    cache.counts['downloaded'] += 1
+                    cache.put(url, body, encoding, response.headers)
+                return body.decode(encoding, errors='replace')
+        except (RetryableStatus, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                asyncio.TimeoutError) as e:
+            congested = True
+            if attempt == retries:
+                raise
+            error = e
+        finally:
+            if concurrency is not None:
+                await concurrency.release(time.monotonic() - start, congested)
+        
+        delay = getattr(error, 'retry_after', None) or backoff_delay(attempt)
+        logger.debug(f"Retrying {url} in {delay:.1f}s ({error or type(error).__name__})")
+        await asyncio.sleep(delay)
+
+
+def get_text(url: str, cache: Optional[HttpCache] = None, timeout: float = DEFAULT_TIMEOUT) -> str:
+    """Blocking GET of url as text through the cache (no rate limiting or retries)"""
+    cached = cache.lookup(url) if cache is not None else None
+    if cache is not None and cache.replay:
+        cache.counts['replayed'] += 1
+        return cached.text
+    
+    response = requests.get(url, headers=cached.validators() if cached else None, timeout=timeout)
+    if response.status_code == 304 and cached is not None:
+        cache.counts['not_modified'] += 1
+        return cached.text
+    response.raise_for_status()
+    if cache is not None:
+        cache.counts['downloaded'] += 1
+        cache.put(url, response.content, response.encoding or 'utf-8', response.headers)
+    return response.text
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Continuous Ingestion Daemon
+
+Keeps the search index current without running upload-metadata,
+scrape-transcripts and chunk-and-embed by hand. Triggers (migration
+a95729ff2131) put a job on the embedding_jobs queue whenever a meeting is
+inserted or its transcript_url changes, and NOTIFY the embedding_jobs
+channel. The daemon LISTENs on that channel and, for each wake-up:
+1. Waits --debounce seconds for more notifications, so a burst is one batch
+2. Claims pending jobs (the same queue embedding_jobs.py workers use)
+3. Downloads transcripts that are missing or changed since the last run
+4. Chunks, embeds and stores them, bumping the search index version
+
+It also polls every --poll-interval seconds, for jobs enqueued while it was
+disconnected. Ingestion lag is logged after every batch and kept in the
+ingestion_lag view (see `just embedding-jobs progress`).
+
+LISTEN needs a session connection: point --listen-url (or SUPABASE_DB_URL)
+at the database directly, not at a transaction-mode pooler.
+"""
+
+import asyncio
+import os
+import select
+import signal
+import socket
+import time
+from typing import Dict, List
+
+from loguru import logger
+from sqlalchemy import create_engine, select as select_rows
+
+# Import the pipeline and scraper from the same directory
+from chunk_and_embed_sync import SyncChunkingPipeline, DEFAULT_STREAM_WINDOW, transcript_path
+from embedding_jobs import process_claims
+from scrape_transcripts import TranscriptScraper
+from http_client import make_session
+from database.job_queue import (
+    EmbeddingJobQueue, Heartbeat, DEFAULT_MAX_ATTEMPTS, DEFAULT_STALE_AFTER, DEFAULT_HEARTBEAT_INTERVAL
+)
+from database.models import Meeting
+from search.embedding_cache import DEFAULT_CACHE_DIR
+
+CHANNEL = "embedding_jobs"
+NO_TRANSCRIPT_URL = "no transcript_url yet"
+
+
+class IngestionDaemon:
+    def __init__(self, pipeline: SyncChunkingPipeline, queue: EmbeddingJobQueue, listen_url: str,
+                 batch_size: int = 8, debounce: float = 2.0, max_delay: float = 10.0,
+                 poll_interval: float = 60.0, heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL):
+        """LISTEN for new embedding jobs and ingest them as they arrive
+
+        After a notification the daemon keeps collecting for debounce seconds
+        after the latest one, but never longer than max_delay in total.
+        """
+        self.pipeline = pipeline
+        self.queue = queue
+        self.listen_engine = create_engine(listen_url, pool_pre_ping=True, pool_size=1,
+                                           connect_args={"sslmode": "require"})
+        self.batch_size = batch_size
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.scraper = TranscriptScraper()
+        self.listener = None
+        self.stopping = False
+
+    def connect(self):
+        """(Re)open the LISTEN connection"""
+        if self.listener is not None:
+            self.listener.invalidate()
+        self.listener = self.listen_engine.raw_connection()
+        self.listener.dbapi_connection.autocommit = True
+        with self.listener.dbapi_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        logger.info(f"Listening on channel {CHANNEL}")
+
+    def wait_for_notifications(self, timeout: float) -> int:
+        """Block up to timeout seconds; returns the number of notifications received"""
+        connection = self.listener.dbapi_connection
+        if timeout > 0 and not connection.notifies:
+            readable, _, _ = select.select([connection], [], [], timeout)
+            if readable:
+                connection.poll()
+        count = len(connection.notifies)
+        connection.notifies.clear()
+        return count
+
+    def wait_for_burst(self) -> int:
+        """Wait for a notification (or the poll interval), then let the burst settle"""
+        received = self.wait_for_notifications(self.poll_interval)
+        if not received:
+            return 0
+        deadline = time.monotonic() + self.max_delay
+        while not self.stopping:
+            more = self.wait_for_notifications(min(self.debounce, deadline - time.monotonic()))
+            if not more:
+                break
+            received += more
+        return received
+
+    async def fetch_transcripts(self, meetings: List[Meeting]) -> Dict[str, str]:
+        """Download the transcripts ingestion needs; returns an error per meeting that has none"""
+        errors = {}
+        to_fetch = []
+        for meeting in meetings:
+            url = (meeting.meta_data or {}).get('transcript_url')
+            # Use a transcript already on disk unless the meeting was ingested
+            # before: then it is back in the queue because its transcript changed
+            if transcript_path(meeting.meeting_id).exists() and meeting.transcript_hash is None:
+                continue
+            if not url:
+                if not transcript_path(meeting.meeting_id).exists():
+                    errors[meeting.meeting_id] = NO_TRANSCRIPT_URL
+                continue
+            to_fetch.append((meeting, url))
+
+        if to_fetch:
+            async with make_session(concurrency=4) as session:
+                contents = await asyncio.gather(*(
+                    self.scraper.scrape_transcript(session, url) for _, url in to_fetch
+                ))
+            for (meeting, _), content in zip(to_fetch, contents):
+                if not content:
+                    errors[meeting.meeting_id] = "transcript download failed"
+                elif not self.scraper.save_transcript_to_disk(meeting.meeting_id, content):
+                    errors[meeting.meeting_id] = "could not save transcript"
+        return errors
+
+    def ingest(self, heartbeat: Heartbeat) -> int:
+        """Claim and ingest pending jobs until the queue is empty"""
+        ingested = 0
+        while not self.stopping:
+            meeting_ids = self.queue.claim(self.batch_size)
+            if not meeting_ids:
+                break
+            logger.info(f"Claimed {len(meeting_ids)} jobs: {', '.join(meeting_ids)}")
+            heartbeat.meeting_ids = list(meeting_ids)
+
+            with self.pipeline.Session() as session:
+                meetings = session.execute(
+                    select_rows(Meeting).where(Meeting.meeting_id.in_(meeting_ids))
+                ).scalars().all()
+                errors = asyncio.run(self.fetch_transcripts(meetings))
+
+            for meeting_id, error in errors.items():
+                logger.warning(f"Not ingesting {meeting_id}: {error}")
+                # Without a URL there is nothing to retry; the metadata trigger
+                # requeues the meeting once its transcript_url is set
+                self.queue.fail(meeting_id, error, retry=error != NO_TRANSCRIPT_URL)
+            ready = [meeting_id for meeting_id in meeting_ids if meeting_id not in errors]
+            if ready:
+                ingested += process_claims(self.pipeline, self.queue, heartbeat, ready)
+        return ingested
+
+    def log_lag(self):
+        lag = self.queue.lag()
+        message = f"Ingestion lag: {lag['queued']} queued"
+        if lag['oldest_queued_seconds'] is not None:
+            message += f" (oldest {lag['oldest_queued_seconds']:.0f}s)"
+        if lag['p50_seconds'] is not None:
+            message += f", enqueue-to-searchable p50 {lag['p50_seconds']:.1f}s, p95 {lag['p95_seconds']:.1f}s (last day)"
+        logger.info(message)
+
+    def stop(self, *_):
+        logger.info("Stopping after the current batch...")
+        self.stopping = True
+
+    def run(self):
+        """Main loop: catch up on the backlog, then ingest on every notification"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.connect()
+
+        with Heartbeat(self.queue, self.heartbeat_interval) as heartbeat:
+            received = 0
+            while not self.stopping:
+                start = time.monotonic()
+                try:
+                    self.queue.reclaim_stale()
+                    ingested = self.ingest(heartbeat)
+                    if ingested:
+                        logger.info(f"Ingested {ingested} meetings ({received} notifications) "
+                                    f"in {time.monotonic() - start:.1f}s")
+                        self.log_lag()
+                    received = self.wait_for_burst()
+                except Exception as e:
+                    # Lost connection or a database hiccup: back off, reconnect, and
+                    # let the next pass pick up whatever was missed
+                    logger.error(f"Ingestion error: {e}")
+                    heartbeat.meeting_ids = []
+                    time.sleep(self.debounce)
+                    try:
+                        self.connect()
+                    except Exception as e:
+                        logger.error(f"Could not reconnect listener: {e}")
+
+        logger.info("Ingestion daemon stopped")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Ingest new meetings as they are added (LISTEN/NOTIFY)')
+    parser.add_argument('--listen-url', help='Direct (session) database URL for LISTEN (default: SUPABASE_DB_URL)')
+    parser.add_argument('--worker-id', default=f"ingest:{socket.gethostname()}:{os.getpid()}",
+                       help='Name recorded on claims (default: ingest:host:pid)')
+    parser.add_argument('--batch-size', type=int, default=8, help='Jobs claimed at a time (default: 8)')
+    parser.add_argument('--debounce', type=float, default=2.0,
+                       help='Seconds of quiet that end a burst of notifications (default: 2)')
+    parser.add_argument('--max-delay', type=float, default=10.0,
+                       help='Longest wait for a burst to settle, in seconds (default: 10)')
+    parser.add_argument('--poll-interval', type=float, default=60.0,
+                       help='Seconds between polls without notifications (default: 60)')
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                       help=f'Attempts before a job is marked failed (default: {DEFAULT_MAX_ATTEMPTS})')
+    parser.add_argument('--stale-after', type=float, default=DEFAULT_STALE_AFTER,
+                       help=f'Seconds without a heartbeat before a claim is reclaimed (default: {DEFAULT_STALE_AFTER:.0f})')
+    parser.add_argument('--stream', action='store_true', help='Stream each transcript (bounded memory)')
+    parser.add_argument('--no-embedding-cache', action='store_true', help='Bypass the on-disk embedding cache')
+    args = parser.parse_args()
+
+    pipeline = SyncChunkingPipeline(
+        stream_window=DEFAULT_STREAM_WINDOW if args.stream else None,
+        embedding_cache_dir=None if args.no_embedding_cache else DEFAULT_CACHE_DIR
+    )
+    queue = EmbeddingJobQueue(pipeline.engine, args.worker_id, args.max_attempts, args.stale_after)
+    listen_url = args.listen_url or os.getenv("SUPABASE_DB_URL").replace("postgresql+asyncpg://", "postgresql://")
+
+    daemon = IngestionDaemon(pipeline, queue, listen_url, batch_size=args.batch_size,
+                             debounce=args.debounce, max_delay=args.max_delay,
+                             poll_interval=args.poll_interval)
+    daemon.run()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,18 +1,28 @@
 #!/usr/bin/env python3
 """
-SFGovTV Scraper - Initial version
+SFGovTV Scraper - Incremental multi-department crawler
 
 This script scrapes meeting data from the San Francisco Government TV website.
-Starting with basic functionality to fetch and parse the main listing page.
+Each Granicus view_id (Board of Supervisors, committees, commissions) listed
+in departments.json has its own ViewPublisher listing page; the listings are
+fetched concurrently. For every view, crawl_state.json records a high-water
+clip_id: clips at or below it only have their listing fields (e.g. a newly
+posted transcript link) refreshed, and only newer clips have their player
+pages fetched for agenda timestamps. Results are merged into
+parsed_meetings.json, so a daily run costs one listing per department plus
+the new meetings. A clip whose player page fails is retried on later runs,
+up to MAX_DETAIL_ATTEMPTS runs, then kept without timestamps so it no longer
+holds the mark back. Use --full to crawl every clip again.
 """
 
-import requests
+import asyncio
+import json
+import time
 import sys
 from pathlib import Path
 from loguru import logger
-from bs4 import BeautifulSoup
-import re
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
+from datetime import datetime
 from typing import List, Optional, Dict
 
 # Add the project root to Python path
@@ -21,13 +31,28 @@ sys.path.append(str(project_root))
 
 # Import the get_timestamps function from the same directory
 from get_timestamps import scrape_video_page
+from html_parsing import parse_listing, parse_video_page, parse_in_pool
+from http_client import (
+    HostRateLimiter, HttpCache, fetch_text, make_session,
+    DEFAULT_CONCURRENCY, DEFAULT_RATE, DEFAULT_BURST, DEFAULT_RETRIES, DEFAULT_HTTP_CACHE_DIR
+)
+
+DEPARTMENTS_FILE = project_root / "scripts" / "departments.json"
+CRAWL_STATE_FILE = project_root / "scripts" / "crawl_state.json"
+MEETINGS_FILE = project_root / "scripts" / "parsed_meetings.json"
+
+LISTING_URL = "https://sanfrancisco.granicus.com/ViewPublisher.php?view_id={view_id}"
+
+# Runs in which a clip's player page may fail before the crawler gives up on it
+MAX_DETAIL_ATTEMPTS = 3
 
 
 @dataclass
 class MeetingInfo:
     """Data structure for meeting information"""
     clip_id: str
-    view_id: str = "10"
+    view_id: str
+    department: Optional[str] = None
     date: Optional[str] = None
     duration: Optional[str] = None
     title: Optional[str] = None
@@ -38,17 +63,14 @@ class MeetingInfo:
     timestamps: Optional[List[Dict]] = None
 
 
-def get_timestamps_for_meeting(meeting: MeetingInfo) -> Optional[List[Dict]]:
+def get_timestamps_for_meeting(meeting: MeetingInfo, cache: Optional[HttpCache] = None) -> Optional[List[Dict]]:
     """Get timestamps for a meeting using its video player URL"""
     if not meeting.clip_id or not meeting.view_id:
         return None
     
-    # Construct the player URL
-    player_url = f"https://sanfrancisco.granicus.com/player/clip/{meeting.clip_id}?view_id={meeting.view_id}&redirect=true"
-    
     try:
         logger.info(f"Fetching timestamps for clip_id={meeting.clip_id}")
-        timestamps = scrape_video_page(player_url)
+        timestamps = scrape_video_page(player_url(meeting), cache)
         logger.info(f"Found {len(timestamps)} timestamps for clip_id={meeting.clip_id}")
         return timestamps
     except Exception as e:
@@ -56,173 +78,287 @@ def get_timestamps_for_meeting(meeting: MeetingInfo) -> Optional[List[Dict]]:
         return None
 
 
-def parse_meetings_from_html(html_content: str) -> List[MeetingInfo]:
-    """Parse meeting information from HTML content"""
-    soup = BeautifulSoup(html_content, 'lxml')
-    meetings = {}  # Use dict to avoid duplicates
-    
-    # Look for the main table containing meeting data
-    # The meetings are typically in table rows
-    tables = soup.find_all('table')
-    logger.info(f"Found {len(tables)} tables")
-    
-    for table in tables:
-        rows = table.find_all('tr')
-        for row in rows:
-            # Look for video links in this row
-            video_links = row.find_all('a', href=re.compile(r'MediaPlayer\.php.*clip_id=(\d+)'))
-            
-            for video_link in video_links:
-                href = video_link.get('href')
-                clip_id_match = re.search(r'clip_id=(\d+)', href)
-                
-                if clip_id_match:
-                    clip_id = clip_id_match.group(1)
-                    
-                    # Skip if we already have this meeting
-                    if clip_id in meetings:
-                        continue
-                        
-                    # Create meeting info with basic data
-                    meeting = MeetingInfo(
-                        clip_id=clip_id,
-                        video_url=f"https:{href}" if href.startswith('//') else href
-                    )
-                    
-                    # Extract data from the same row
-                    cells = row.find_all(['td', 'th'])
-                    
-                    # Extract date and duration from specific table cells
-                    for cell in cells:
-                        cell_text = cell.get_text(strip=True)
-                        
-                        # Look for date patterns (MM/DD/YY format)
-                        date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{2,4})', cell_text)
-                        if date_match and not meeting.date:
-                            meeting.date = date_match.group(1)
-                        
-                        # Look for duration patterns (06h 00m format)
-                        duration_match = re.search(r'(\d{1,2}h\s*\d{1,2}m)', cell_text.replace('&nbsp;', ' '))
-                        if duration_match and not meeting.duration:
-                            meeting.duration = duration_match.group(1)
-                        
-                        # Alternative duration patterns (HH:MM:SS or MM:SS)
-                        if not meeting.duration:
-                            duration_match2 = re.search(r'(\d{1,2}:\d{2}(?::\d{2})?)', cell_text)
-                            if duration_match2:
-                                meeting.duration = duration_match2.group(1)
-                    
-                    # Find agenda and transcript links in the same row
-                    agenda_link = row.find('a', href=re.compile(f'AgendaViewer\\.php.*clip_id={clip_id}'))
-                    if agenda_link:
-                        agenda_href = agenda_link.get('href')
-                        meeting.agenda_url = f"https:{agenda_href}" if agenda_href.startswith('//') else agenda_href
-                    
-                    transcript_link = row.find('a', href=re.compile(f'TranscriptViewer\\.php.*clip_id={clip_id}'))
-                    if transcript_link:
-                        transcript_href = transcript_link.get('href')
-                        meeting.transcript_url = f"https:{transcript_href}" if transcript_href.startswith('//') else transcript_href
-                    
-                    # Look for MP3 audio links in the same row
-                    audio_links = row.find_all('a', href=re.compile(r'https://archive-video\.granicus\.com/.*\.mp3'))
-                    if audio_links:
-                        meeting.audio_url = audio_links[0].get('href')  # Take the first MP3 link
-                    
-                    # Try to construct a basic title
-                    if meeting.date:
-                        # Convert MM/DD/YY to a more readable format
-                        try:
-                            from datetime import datetime
-                            date_obj = datetime.strptime(meeting.date, '%m/%d/%y')
-                            formatted_date = date_obj.strftime('%B %d, %Y')
-                            meeting.title = f"Board of Supervisors Regular Meeting - {formatted_date}"
-                        except ValueError:
-                            # Fallback if date parsing fails
-                            meeting.title = f"Board of Supervisors Regular Meeting - {meeting.date}"
-                    
-                    meetings[clip_id] = meeting
-                    logger.debug(f"Parsed meeting: clip_id={clip_id}, date={meeting.date}, duration={meeting.duration}")
-    
-    logger.info(f"Found {len(meetings)} unique meetings")
-    return list(meetings.values())
+def player_url(meeting: MeetingInfo) -> str:
+    """Video player URL for a meeting (its agenda index points carry the timestamps)"""
+    return f"https://sanfrancisco.granicus.com/player/clip/{meeting.clip_id}?view_id={meeting.view_id}&redirect=true"
 
 
-def main():
-    """Main scraping function"""
-    logger.info("Starting SFGovTV scraper...")
+async def crawl_timestamps(meetings: List[MeetingInfo], concurrency: int = DEFAULT_CONCURRENCY,
+                           rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                           retries: int = DEFAULT_RETRIES, cache: Optional[HttpCache] = None):
+    """Fetch timestamps for all meetings concurrently, setting meeting.timestamps
     
-    # Base URL for Board of Supervisors meetings (view_id=10)
-    base_url = "https://sanfrancisco.granicus.com/ViewPublisher.php?view_id=10"
+    At most concurrency player pages are in flight at once, over one shared
+    connection pool, and requests to each host stay within rate per second.
+    With a cache, unchanged pages are revalidated instead of downloaded.
+    """
+    limiter = HostRateLimiter(rate, burst)
+    semaphore = asyncio.Semaphore(concurrency)
     
-    logger.info(f"Fetching: {base_url}")
+    async def crawl(session, meeting: MeetingInfo):
+        if not meeting.clip_id or not meeting.view_id:
+            return
+        try:
+            async with semaphore:
+                html = await fetch_text(session, player_url(meeting), limiter, retries, cache)
+            meeting.timestamps = await parse_in_pool(parse_video_page, html)
+        except Exception as e:
+            # One bad page leaves only its own meeting without timestamps
+            logger.error(f"Failed to get timestamps for clip_id={meeting.clip_id}: {e}")
+            return
+        logger.debug(f"Found {len(meeting.timestamps)} timestamps for clip_id={meeting.clip_id}")
     
-    try:
-        response = requests.get(base_url)
-        response.raise_for_status()
-        
-        logger.info(f"Successfully fetched page. Status: {response.status_code}")
-        logger.info(f"Content length: {len(response.text)} characters")
-        
-        # Parse meetings from the HTML
-        meetings = parse_meetings_from_html(response.text)
-        
-        # Display results
-        logger.info(f"Successfully parsed {len(meetings)} meetings")
-        
-        # Sort meetings by clip_id (newest first)
-        meetings.sort(key=lambda m: int(m.clip_id), reverse=True)
-        
-        # Fetch timestamps for each meeting (optionally limit this for testing)
-        logger.info("Fetching timestamps for meetings...")
-        for i, meeting in enumerate(meetings):
-            meeting.timestamps = get_timestamps_for_meeting(meeting)
-            if meeting.timestamps:
-                logger.info(f"Meeting {meeting.clip_id} has {len(meeting.timestamps)} agenda items")
-        
-        for i, meeting in enumerate(meetings[:10], 1):  # Show first 10 meetings
-            logger.info(f"Meeting {i}:")
-            logger.info(f"  Clip ID: {meeting.clip_id}")
-            logger.info(f"  Date: {meeting.date or 'Unknown'}")
-            logger.info(f"  Duration: {meeting.duration or 'Unknown'}")
-            logger.info(f"  Title: {meeting.title or 'Unknown'}")
-            logger.info(f"  Video: {meeting.video_url}")
-            if meeting.agenda_url:
-                logger.info(f"  Agenda: {meeting.agenda_url}")
-            if meeting.transcript_url:
-                logger.info(f"  Transcript: {meeting.transcript_url}")
-            if meeting.timestamps:
-                logger.info(f"  Timestamps: {len(meeting.timestamps)} agenda items")
-            logger.info("---")
-        
-        if len(meetings) > 10:
-            logger.info(f"... and {len(meetings) - 10} more meetings")
-            
-        # Save results to a JSON file for inspection
-        import json
-        output_file = project_root / "scripts" / "parsed_meetings.json"
-        with open(output_file, 'w') as f:
-            # Convert dataclasses to dicts for JSON serialization
-            meetings_data = [
-                {
-                    'clip_id': m.clip_id,
-                    'view_id': m.view_id,
-                    'date': m.date,
-                    'duration': m.duration,
-                    'title': m.title,
-                    'video_url': m.video_url,
-                    'agenda_url': m.agenda_url,
-                    'transcript_url': m.transcript_url,
-                    'audio_url': m.audio_url,
-                    'timestamps': m.timestamps
-                }
-                for m in meetings
-            ]
-            json.dump(meetings_data, f, indent=2)
+    start = time.perf_counter()
+    async with make_session(concurrency) as session:
+        await asyncio.gather(*(crawl(session, meeting) for meeting in meetings))
+    elapsed = time.perf_counter() - start
+    fetched = sum(1 for meeting in meetings if meeting.timestamps is not None)
+    logger.info(f"Fetched {fetched}/{len(meetings)} player pages in {elapsed:.1f}s "
+                f"({fetched / elapsed if elapsed else 0:.1f} pages/s)")
+
+
+def parse_meetings_from_html(html_content: str, view_id: str = "10",
+                             department: str = "Board of Supervisors") -> List[MeetingInfo]:
+    """Parse meeting information from a view's listing page HTML"""
+    return meetings_from_listing(parse_listing(html_content), view_id, department)
+
+
+def meetings_from_listing(rows: List[Dict], view_id: str, department: str) -> List[MeetingInfo]:
+    """MeetingInfo for each parsed listing row, titled with the department"""
+    meetings = []
+    for row in rows:
+        meeting = MeetingInfo(view_id=view_id, department=department, **row)
         
-        logger.info(f"Meeting data saved to: {output_file}")
+        # Try to construct a basic title
+        if meeting.date:
+            # Convert MM/DD/YY to a more readable format
+            try:
+                date_obj = datetime.strptime(meeting.date, '%m/%d/%y')
+                formatted_date = date_obj.strftime('%B %d, %Y')
+                meeting.title = f"{department} Regular Meeting - {formatted_date}"
+            except ValueError:
+                # Fallback if date parsing fails
+                meeting.title = f"{department} Regular Meeting - {meeting.date}"
         
-    except requests.RequestException as e:
-        logger.error(f"Failed to fetch page: {e}")
+        meetings.append(meeting)
+        logger.debug(f"Parsed meeting: clip_id={meeting.clip_id}, date={meeting.date}, duration={meeting.duration}")
+    
+    logger.info(f"Found {len(meetings)} unique meetings for view_id={view_id} ({department})")
+    return meetings
+
+
+def load_departments() -> Dict[str, str]:
+    """Granicus view_id -> department name for every view to crawl"""
+    with open(DEPARTMENTS_FILE, 'r') as f:
+        return json.load(f)
+
+
+def load_json(path: Path, default):
+    if not path.exists():
+        return default
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_json(path: Path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+async def crawl_listings(departments: Dict[str, str], rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                         retries: int = DEFAULT_RETRIES,
+                         cache: Optional[HttpCache] = None) -> Dict[str, Optional[List[MeetingInfo]]]:
+    """Fetch and parse every view's listing page concurrently
+    
+    Returns the meetings per view_id, or None for a view whose listing could
+    not be fetched (its high-water mark is then left alone).
+    """
+    limiter = HostRateLimiter(rate, burst)
+    
+    async def crawl(session, view_id: str, department: str) -> Optional[List[MeetingInfo]]:
+        url = LISTING_URL.format(view_id=view_id)
+        try:
+            html = await fetch_text(session, url, limiter, retries, cache)
+        except Exception as e:
+            logger.error(f"Failed to fetch listing for view_id={view_id} ({department}): {e}")
+            return None
+        logger.debug(f"Listing for view_id={view_id}: {len(html)} characters")
+        return meetings_from_listing(await parse_in_pool(parse_listing, html), view_id, department)
+    
+    async with make_session(max(1, len(departments))) as session:
+        results = await asyncio.gather(*(
+            crawl(session, view_id, department) for view_id, department in departments.items()
+        ))
+    return dict(zip(departments, results))
+
+
+def high_water_mark(state: Dict, stored: Dict[str, Dict], view_id: str) -> int:
+    """Highest clip_id of a view whose details were already fetched
+    
+    Without a recorded mark (first incremental run) it falls back to the
+    newest clip of that view already in parsed_meetings.json.
+    """
+    if view_id in state:
+        return state[view_id]['high_water']
+    return max((int(m['clip_id']) for m in stored.values() if m['view_id'] == view_id), default=0)
+
+
+def record_failures(failures: Dict[str, int], new_meetings: List[MeetingInfo]):
+    """Count one more failed run for each clip still without timestamps; forget fetched ones"""
+    for meeting in new_meetings:
+        if meeting.timestamps is not None:
+            failures.pop(meeting.clip_id, None)
+            continue
+        failures[meeting.clip_id] = failures.get(meeting.clip_id, 0) + 1
+        if failures[meeting.clip_id] == MAX_DETAIL_ATTEMPTS:
+            logger.warning(f"Giving up on timestamps for clip_id={meeting.clip_id} "
+                           f"after {MAX_DETAIL_ATTEMPTS} failed runs")
+
+
+def advanced_high_water(previous: int, new_meetings: List[MeetingInfo], failures: Dict[str, int]) -> int:
+    """New mark: up to the newest clip done with no clip still to retry at or below it
+    
+    A clip is done once fetched or given up on (MAX_DETAIL_ATTEMPTS failed runs).
+    """
+    retry = [int(m.clip_id) for m in new_meetings
+             if m.timestamps is None and failures.get(m.clip_id, 0) < MAX_DETAIL_ATTEMPTS]
+    ceiling = min(retry) if retry else None
+    done = [int(m.clip_id) for m in new_meetings
+            if int(m.clip_id) not in retry and (ceiling is None or int(m.clip_id) < ceiling)]
+    return max([previous] + done)
+
+
+def main():
+    """Main scraping function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Scrape SFGovTV meeting listings and agenda timestamps')
+    parser.add_argument('--view', action='append', dest='views', metavar='VIEW_ID',
+                       help=f'Only crawl this view_id (repeatable; default: every view in {DEPARTMENTS_FILE.name})')
+    parser.add_argument('--full', action='store_true',
+                       help='Ignore the high-water marks and fetch player pages for every clip')
+    parser.add_argument('--sequential', action='store_true',
+                       help='Fetch player pages one at a time (the original behaviour)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help=f'Player pages in flight at once (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                       help=f'Requests per second per host (default: {DEFAULT_RATE:g})')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST,
+                       help=f'Requests allowed at once before rate limiting (default: {DEFAULT_BURST})')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                       help=f'Retries per page on errors, 429 and 5xx (default: {DEFAULT_RETRIES})')
+    parser.add_argument('--http-cache', type=Path, default=DEFAULT_HTTP_CACHE_DIR,
+                       help=f'On-disk HTTP cache, revalidated with conditional GETs (default: {DEFAULT_HTTP_CACHE_DIR})')
+    parser.add_argument('--no-http-cache', action='store_true', help='Download every page in full')
+    parser.add_argument('--replay', action='store_true',
+                       help='Offline: serve every page from the HTTP cache, failing on pages never cached')
+    args = parser.parse_args()
+    
+    if args.replay and args.no_http_cache:
+        parser.error("--replay needs the HTTP cache")
+    cache = None if args.no_http_cache else HttpCache(args.http_cache, replay=args.replay)
+    
+    departments = load_departments()
+    if args.views:
+        unknown = [view_id for view_id in args.views if view_id not in departments]
+        if unknown:
+            parser.error(f"view_id {', '.join(unknown)} not in {DEPARTMENTS_FILE}; add it with its department name")
+        departments = {view_id: departments[view_id] for view_id in args.views}
+    
+    logger.info(f"Starting SFGovTV scraper for {len(departments)} views: "
+                f"{', '.join(f'{v} ({d})' for v, d in departments.items())}")
+    start = time.perf_counter()
+    
+    state = load_json(CRAWL_STATE_FILE, {})
+    stored = {f"{m['view_id']}_{m['clip_id']}": m for m in load_json(MEETINGS_FILE, [])}
+    listings = asyncio.run(crawl_listings(departments, args.rate, args.burst, args.retries, cache))
+    
+    # Split every listing at its view's high-water mark
+    marks: Dict[str, int] = {}
+    new_by_view: Dict[str, List[MeetingInfo]] = {}
+    refreshed = 0
+    for view_id, meetings in listings.items():
+        if meetings is None:
+            continue
+        mark = marks[view_id] = 0 if args.full else high_water_mark(state, stored, view_id)
+        new_by_view[view_id] = []
+        for meeting in meetings:
+            key = f"{meeting.view_id}_{meeting.clip_id}"
+            if int(meeting.clip_id) > mark or key not in stored:
+                new_by_view[view_id].append(meeting)
+                continue
+            # Known clip: take the listing's current links, keep the fetched timestamps and title
+            listing_fields = asdict(meeting)
+            for field in ('timestamps', 'title'):
+                listing_fields.pop(field)
+            if any(stored[key].get(k) != v for k, v in listing_fields.items()):
+                stored[key].update(listing_fields)
+                refreshed += 1
+        logger.info(f"view_id={view_id}: {len(new_by_view[view_id])} new clips above clip_id {mark}")
+    
+    new_meetings = [meeting for meetings in new_by_view.values() for meeting in meetings]
+    new_meetings.sort(key=lambda m: int(m.clip_id), reverse=True)
+    
+    # Fetch timestamps for new meetings only
+    if new_meetings:
+        logger.info(f"Fetching timestamps for {len(new_meetings)} new meetings...")
+        if args.sequential:
+            for meeting in new_meetings:
+                meeting.timestamps = get_timestamps_for_meeting(meeting, cache)
+                if meeting.timestamps:
+                    logger.info(f"Meeting {meeting.clip_id} has {len(meeting.timestamps)} agenda items")
+        else:
+            asyncio.run(crawl_timestamps(new_meetings, args.concurrency, args.rate, args.burst, args.retries, cache))
+    if cache is not None:
+        cache.log_stats()
+    
+    for i, meeting in enumerate(new_meetings[:10], 1):  # Show first 10 new meetings
+        logger.info(f"Meeting {i}:")
+        logger.info(f"  Clip ID: {meeting.clip_id} (view_id={meeting.view_id}, {meeting.department})")
+        logger.info(f"  Date: {meeting.date or 'Unknown'}")
+        logger.info(f"  Duration: {meeting.duration or 'Unknown'}")
+        logger.info(f"  Title: {meeting.title or 'Unknown'}")
+        logger.info(f"  Video: {meeting.video_url}")
+        if meeting.agenda_url:
+            logger.info(f"  Agenda: {meeting.agenda_url}")
+        if meeting.transcript_url:
+            logger.info(f"  Transcript: {meeting.transcript_url}")
+        if meeting.timestamps:
+            logger.info(f"  Timestamps: {len(meeting.timestamps)} agenda items")
+        logger.info("---")
+    
+    if len(new_meetings) > 10:
+        logger.info(f"... and {len(new_meetings) - 10} more new meetings")
+    
+    # Merge into the saved meetings, then advance the marks: a clip whose
+    # player page failed stays above its view's mark and is retried next run
+    for meeting in new_meetings:
+        stored[f"{meeting.view_id}_{meeting.clip_id}"] = asdict(meeting)
+    meetings_data = sorted(stored.values(), key=lambda m: int(m['clip_id']), reverse=True)
+    save_json(MEETINGS_FILE, meetings_data)
+    logger.info(f"Meeting data saved to: {MEETINGS_FILE} ({len(meetings_data)} meetings, "
+                f"{len(new_meetings)} new, {refreshed} refreshed from listings)")
+    
+    crawled_at = datetime.now().isoformat()
+    for view_id, meetings in new_by_view.items():
+        failures = state.get(view_id, {}).get('failures', {})
+        record_failures(failures, meetings)
+        mark = advanced_high_water(marks[view_id], meetings, failures)
+        state[view_id] = {
+            'department': departments[view_id],
+            'high_water': mark,
+            'clips': len(listings[view_id]),
+            'new_clips': len(meetings),
+            'crawled_at': crawled_at,
+            # Failed runs per clip above the mark
+            'failures': {clip_id: count for clip_id, count in failures.items() if int(clip_id) > mark},
+        }
+    save_json(CRAWL_STATE_FILE, state)
+    
+    failed_views = [view_id for view_id, meetings in listings.items() if meetings is None]
+    logger.info(f"Crawled {len(new_by_view)}/{len(departments)} views in {time.perf_counter() - start:.1f}s")
+    if failed_views:
+        logger.error(f"Listings failed for view_id {', '.join(failed_views)}")
         return 1
     
     logger.info("Scraper completed successfully")
@@ -230,4 +366,4 @@ def main():
 
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())
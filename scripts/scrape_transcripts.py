@@ -8,24 +8,48 @@ to a local transcripts/ directory as raw text files.
 
 import asyncio
 import json
-import re
+import os
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict
 
 import aiohttp
 from loguru import logger
-from bs4 import BeautifulSoup
+
+# Import the shared HTTP and parsing layers from the same directory
+from html_parsing import extract_transcript, parse_in_pool, SUBSTANTIAL_CHARS
+from http_client import (
+    AimdConcurrency, HostRateLimiter, HttpCache, fetch_text, make_session,
+    DEFAULT_BURST, DEFAULT_HTTP_CACHE_DIR, DEFAULT_RATE
+)
 
 # Set up paths
 project_root = Path(__file__).parent.parent
 
+# Meetings whose download failed this many times are skipped on later runs
+MAX_ATTEMPTS = 3
+FAILED_STATUSES = ("scrape_failed", "save_failed")
+STATUS_SAVE_INTERVAL = 5.0  # seconds
+
 
 class TranscriptScraper:
-    def __init__(self):
-        """Initialize transcript scraper and create transcripts directory"""
+    def __init__(self, http_cache: Optional[HttpCache] = None):
+        """Initialize transcript scraper and create transcripts directory
+        
+        With http_cache, transcript pages are revalidated with conditional
+        GETs (or, in replay mode, read from the cache only).
+        """
+        self.http_cache = http_cache
+        
         # Create transcripts directory
         self.transcripts_dir = project_root / "transcripts"
         self.transcripts_dir.mkdir(exist_ok=True)
+        self.status_path = self.transcripts_dir / "download_status.json"
+        
+        # Set by process_transcripts; single scrape_transcript calls go unthrottled
+        self.concurrency: Optional[AimdConcurrency] = None
+        self.limiter: Optional[HostRateLimiter] = None
         
         logger.info(f"Initialized transcript scraper, saving to: {self.transcripts_dir}")
 
@@ -36,72 +60,14 @@ class TranscriptScraper:
         
         try:
             logger.debug(f"Fetching transcript: {transcript_url}")
-            async with session.get(transcript_url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                response.raise_for_status()
-                html_content = await response.text()
-            
-            # Parse HTML content
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # Look for transcript content
-            transcript_text = ""
-            
-            # Method 1: Look for specific transcript containers
-            transcript_div = soup.find('div', {'id': re.compile(r'transcript', re.I)})
-            if transcript_div:
-                transcript_text = transcript_div.get_text(separator='\n', strip=True)
-                logger.debug(f"Using transcript div, extracted {len(transcript_text)} characters")
-            
-            # Method 2: Look for pre-formatted text (common for transcripts)
-            elif soup.find_all('pre'):
-                pre_tags = soup.find_all('pre')
-                transcript_text = '\n'.join(pre.get_text(strip=True) for pre in pre_tags)
-                logger.debug(f"Using pre tags, extracted {len(transcript_text)} characters")
-            
-            # Method 3: Look for substantial divs with content
-            else:
-                all_divs = soup.find_all('div')
-                substantial_divs = [div for div in all_divs if len(div.get_text(strip=True)) > 1000]
-                if substantial_divs:
-                    # Pick the div with the most content
-                    best_div = max(substantial_divs, key=lambda d: len(d.get_text()))
-                    transcript_text = best_div.get_text(separator='\n', strip=True)
-                    logger.debug(f"Using substantial div, extracted {len(transcript_text)} characters")
-            
-            # Method 4: Extract from body text (works for SFGovTV format)
-            if not transcript_text or len(transcript_text) < 1000:
-                logger.debug("Trying to extract from body text...")
-                body = soup.find('body')
-                if body:
-                    # Remove script and style tags
-                    for script_or_style in body(["script", "style"]):
-                        script_or_style.decompose()
-                    
-                    # Get all text content, preserving line breaks
-                    body_text = body.get_text(separator='\n', strip=True)
-                    
-                    # Filter lines to keep substantial content only
-                    lines = body_text.split('\n')
-                    transcript_lines = []
-                    
-                    for line in lines:
-                        line = line.strip()
-                        if line and len(line) > 20:  # Only include lines with substantial content
-                            transcript_lines.append(line)
-                    
-                    if transcript_lines:
-                        transcript_text = '\n'.join(transcript_lines)
-                        logger.debug(f"Extracted transcript from body, {len(transcript_text)} characters")
+            html_content = await fetch_text(session, transcript_url, self.limiter,
+                                            cache=self.http_cache, concurrency=self.concurrency)
             
-            # Clean up the text
-            if transcript_text:
-                # Remove excessive whitespace
-                transcript_text = re.sub(r'\n\s*\n', '\n\n', transcript_text)
-                transcript_text = re.sub(r'[ \t]+', ' ', transcript_text)
-                transcript_text = transcript_text.strip()
+            # Parse in a worker process so large pages don't stall other downloads
+            transcript_text = await parse_in_pool(extract_transcript, html_content)
             
             # Basic validation - transcript should be reasonably long
-            if transcript_text and len(transcript_text) > 1000:  # Increased threshold
+            if transcript_text and len(transcript_text) > SUBSTANTIAL_CHARS:
                 logger.debug(f"Successfully scraped transcript ({len(transcript_text)} chars)")
                 return transcript_text
             else:
@@ -170,16 +136,45 @@ class TranscriptScraper:
             logger.warning(f"No transcript content found for meeting: {meeting_id}")
             return meeting_id, "scrape_failed"
 
-    async def process_transcripts(self):
-        """Process transcripts for all meetings with parallel downloads"""
+    def load_status(self) -> Dict[str, Dict]:
+        """Per-meeting download status from earlier (possibly interrupted) runs"""
+        if not self.status_path.exists():
+            return {}
+        try:
+            return json.loads(self.status_path.read_text())
+        except ValueError:
+            logger.warning(f"Ignoring unreadable status file: {self.status_path}")
+            return {}
+
+    def save_status(self, status: Dict[str, Dict]):
+        tmp = self.status_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(status, indent=1))
+        os.replace(tmp, self.status_path)
+
+    async def process_transcripts(self, max_concurrency: int = 16, initial_concurrency: int = 4,
+                                  latency_target: float = 10.0, rate: float = DEFAULT_RATE,
+                                  retry_failed: bool = False):
+        """Process transcripts for all meetings with parallel downloads
+        
+        max_concurrency workers pull meetings off a shared queue, so a slow
+        transcript only holds its own slot. How many requests are actually in
+        flight is set by AIMD (see AimdConcurrency): it starts at
+        initial_concurrency, grows while responses come back within
+        latency_target seconds and halves on 429/5xx, timeouts or slow
+        responses. Each meeting's outcome is saved to the status file, so an
+        interrupted run resumes where it stopped; meetings that failed
+        MAX_ATTEMPTS times are skipped unless retry_failed.
+        """
         logger.info("Starting parallel transcript processing...")
         
         # Load meetings from JSON
         meetings = self.load_meetings_from_json()
+        status = self.load_status()
         
         # Filter to only meetings that need processing
         meetings_to_process = []
         skipped_count = 0
+        given_up_count = 0
         
         for meeting_data in meetings:
             meeting_id = f"{meeting_data['view_id']}_{meeting_data['clip_id']}"
@@ -192,58 +187,79 @@ class TranscriptScraper:
             if local_file.exists():
                 skipped_count += 1
                 continue
+            
+            previous = status.get(meeting_id, {})
+            if (previous.get('status') in FAILED_STATUSES and previous.get('attempts', 0) >= MAX_ATTEMPTS
+                    and not retry_failed):
+                given_up_count += 1
+                continue
                 
             meetings_to_process.append(meeting_data)
         
-        logger.info(f"Found {len(meetings_to_process)} meetings to process, {skipped_count} already exist")
+        logger.info(f"Found {len(meetings_to_process)} meetings to process, {skipped_count} already exist, "
+                    f"{given_up_count} failed {MAX_ATTEMPTS} times before (--retry-failed to try again)")
         
         if not meetings_to_process:
             logger.info("No meetings to process!")
             return
         
-        # Set up async HTTP session with concurrency limit
-        connector = aiohttp.TCPConnector(limit=4)  # Max 4 concurrent connections
-        timeout = aiohttp.ClientTimeout(total=30)
+        work = asyncio.Queue()
+        for meeting_data in meetings_to_process:
+            work.put_nowait(meeting_data)
         
-        processed_count = 0
-        failed_count = 0
+        self.concurrency = AimdConcurrency(initial_concurrency, 1, max_concurrency, latency_target)
+        self.limiter = HostRateLimiter(rate, DEFAULT_BURST)
+        counts = {"success": 0, "skipped": 0, "no_url": 0, "scrape_failed": 0, "save_failed": 0}
+        last_saved = time.monotonic()
         
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-            # Process in batches of 4 for politeness to server
-            batch_size = 4
-            
-            for i in range(0, len(meetings_to_process), batch_size):
-                batch = meetings_to_process[i:i + batch_size]
-                logger.info(f"Processing batch {i//batch_size + 1} ({len(batch)} meetings)")
-                
-                # Process batch concurrently
-                tasks = [self.process_single_transcript(session, meeting) for meeting in batch]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def worker(session: aiohttp.ClientSession):
+            nonlocal last_saved
+            while not work.empty():
+                meeting_data = work.get_nowait()
+                meeting_id = f"{meeting_data['view_id']}_{meeting_data['clip_id']}"
+                try:
+                    _, result = await self.process_single_transcript(session, meeting_data)
+                except Exception as e:
+                    logger.error(f"Exception processing {meeting_id}: {e}")
+                    result = "scrape_failed"
                 
-                # Count results
-                for result in results:
-                    if isinstance(result, Exception):
-                        logger.error(f"Exception in batch processing: {result}")
-                        failed_count += 1
-                    else:
-                        meeting_id, status = result
-                        if status == "success":
-                            processed_count += 1
-                        elif status in ["scrape_failed", "save_failed"]:
-                            failed_count += 1
-                        # skipped and no_url don't count as processed or failed
+                counts[result] += 1
+                entry = status.setdefault(meeting_id, {'attempts': 0})
+                entry.update(status=result, attempts=entry['attempts'] + 1, updated_at=datetime.now().isoformat())
+                if time.monotonic() - last_saved > STATUS_SAVE_INTERVAL:
+                    self.save_status(status)
+                    last_saved = time.monotonic()
                 
-                # Small delay between batches to be respectful
-                if i + batch_size < len(meetings_to_process):
-                    await asyncio.sleep(1)
+                done = sum(counts.values())
+                if done % 25 == 0:
+                    logger.info(f"{done}/{len(meetings_to_process)} transcripts, "
+                                f"concurrency {int(self.concurrency.limit)} ({self.concurrency.in_flight} in flight)")
+        
+        start = time.perf_counter()
+        async with make_session(max_concurrency) as session:
+            try:
+                await asyncio.gather(*(worker(session) for _ in range(max_concurrency)))
+            finally:
+                # Also on interrupt, so the next run resumes from here
+                self.save_status(status)
+        elapsed = time.perf_counter() - start
         
+        processed_count = counts["success"]
+        failed_count = counts["scrape_failed"] + counts["save_failed"]
         logger.info(f"Transcript processing complete: {processed_count} processed, {failed_count} failed, {skipped_count} skipped")
+        logger.info(
+            f"Downloaded in {elapsed:.1f}s ({processed_count / elapsed if elapsed else 0:.1f} transcripts/s); "
+            f"concurrency peaked at {int(self.concurrency.peak)}, ended at {int(self.concurrency.limit)}, "
+            f"cut {self.concurrency.decreases} times"
+        )
+        if self.http_cache is not None:
+            self.http_cache.log_stats()
 
-    async def run(self):
-        """Main execution function"""
+    async def run(self, **options):
+        """Main execution function (options go to process_transcripts)"""
         try:
             # Process transcripts
-            await self.process_transcripts()
+            await self.process_transcripts(**options)
             
             logger.info("Transcript scraping completed successfully!")
             
@@ -254,10 +270,33 @@ class TranscriptScraper:
 
 async def main():
     """Main entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Scrape transcripts to local disk')
+    parser.add_argument('--http-cache', type=Path, default=DEFAULT_HTTP_CACHE_DIR,
+                       help=f'On-disk HTTP cache, revalidated with conditional GETs (default: {DEFAULT_HTTP_CACHE_DIR})')
+    parser.add_argument('--no-http-cache', action='store_true', help='Download every page in full')
+    parser.add_argument('--replay', action='store_true',
+                       help='Offline: serve every page from the HTTP cache, failing on pages never cached')
+    parser.add_argument('--concurrency', type=int, default=16,
+                       help='Most transcript requests in flight at once (default: 16)')
+    parser.add_argument('--initial-concurrency', type=int, default=4,
+                       help='Requests in flight at the start, before AIMD adjusts it (default: 4)')
+    parser.add_argument('--latency-target', type=float, default=10.0,
+                       help='Responses slower than this many seconds reduce concurrency (default: 10)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                       help=f'Requests per second per host (default: {DEFAULT_RATE:g})')
+    parser.add_argument('--retry-failed', action='store_true',
+                       help=f'Also retry meetings that already failed {MAX_ATTEMPTS} times')
+    args = parser.parse_args()
+    if args.replay and args.no_http_cache:
+        parser.error("--replay needs the HTTP cache")
+    
     logger.info("Starting parallel transcript scraping to local disk...")
     
-    scraper = TranscriptScraper()
-    await scraper.run()
+    scraper = TranscriptScraper(None if args.no_http_cache else HttpCache(args.http_cache, replay=args.replay))
+    await scraper.run(max_concurrency=args.concurrency, initial_concurrency=args.initial_concurrency,
+                      latency_target=args.latency_target, rate=args.rate, retry_failed=args.retry_failed)
     
     return 0
 
@@ -7,15 +7,17 @@ to find the most relevant content for a given query.
 """
 
 import os
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import numpy as np
 
 # Enable MPS fallback for torch on Mac
 os.environ["PYTORCH_ENABLE_MPS_FALLBACK"] = "1"
 
 from loguru import logger
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, select, text
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from model2vec import StaticModel
@@ -23,118 +25,531 @@ from model2vec import StaticModel
 # Import database models
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
+from app.constants import EMBEDDING_MODEL
+from database.models import SearchIndexState
+from search.cache import LRUCache, TTLCache, normalize_query
+from search.embedding_cache import DiskEmbeddingCache, DEFAULT_CACHE_DIR
+from search.filters import SearchFilters
+from search.mmap_engine import ExactSearchEngine
+from search.sql import (
+    SEARCH_MODES, HYBRID_CANDIDATES, RRF_K, PRECISIONS, RERANK_FACTORS,
+    BATCH_VECTOR_SEARCH_SQL, FILTERED_CHUNK_COUNT_SQL,
+    chunk_search_sql, expected_rows, render_named,
+)
 
 # Load environment variables
 load_dotenv(Path(__file__).parent.parent / "local.env")
 
+# Default location of the exported embeddings for the local backend
+DEFAULT_INDEX_DIR = Path(__file__).parent.parent / "indexes" / "exact"
+
+SEARCH_BACKENDS = ("postgres", "local")
+
+# Only meetings from this date onwards are searched unless filters say otherwise
+SEARCH_START_DATE = datetime(2025, 1, 1)
+DEFAULT_FILTERS = SearchFilters(date_from=SEARCH_START_DATE)
+
+
+# Cache sizing: query embeddings are tiny (1 KB each), results are a few KB per entry
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096"))
+SEARCH_RESULT_CACHE_SIZE = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "512"))
+SEARCH_RESULT_TTL = float(os.getenv("SEARCH_RESULT_TTL", "300"))
+
+# How often (seconds) cached results are checked against search_index_state
+INDEX_VERSION_CHECK_INTERVAL = float(os.getenv("INDEX_VERSION_CHECK_INTERVAL", "5"))
+
+# pgvector's default hnsw.ef_search; larger values trade latency for recall
+DEFAULT_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "40"))
+
+# Meetings taken from the centroid ANN search before exact rescoring
+MEETING_CANDIDATES = 20
+
+# Chunk statements live in search/sql.py, shared with the API. Meeting
+# statements below are templates too: {filters} is the WHERE body rendered
+# by SearchFilters.to_named_sql
+
+# Stage one: ANN over meeting centroids; stage two: exact rescoring of
+# only those meetings' chunks. Filters here apply to meetings (alias m)
+MEETING_SEARCH_SQL = """
+WITH top_meetings AS (
+    SELECT me.meeting_id
+    FROM meeting_embeddings me
+    JOIN meetings m ON me.meeting_id = m.meeting_id
+    WHERE {filters}
+    ORDER BY me.centroid <#> CAST(:embedding AS vector)
+    LIMIT :candidates
+)
+SELECT 
+    m.meeting_id,
+    m.title,
+    m.date,
+    COUNT(mc.id) as chunk_count,
+    AVG(1 - (mc.embedding <=> CAST(:embedding AS vector))) AS avg_similarity,
+    MAX(1 - (mc.embedding <=> CAST(:embedding AS vector))) AS max_similarity
+FROM top_meetings t
+JOIN meetings m ON m.meeting_id = t.meeting_id
+JOIN meeting_chunks mc ON mc.meeting_id = t.meeting_id
+GROUP BY m.meeting_id, m.title, m.date
+ORDER BY avg_similarity DESC
+LIMIT :limit
+"""
+
+# Full aggregation over every chunk, used for exact=True
+EXACT_MEETING_SEARCH_SQL = """
+SELECT 
+    m.meeting_id,
+    m.title,
+    m.date,
+    COUNT(mc.id) as chunk_count,
+    AVG(1 - (mc.embedding <=> CAST(:embedding AS vector))) AS avg_similarity,
+    MAX(1 - (mc.embedding <=> CAST(:embedding AS vector))) AS max_similarity
+FROM meetings m
+JOIN meeting_chunks mc ON m.meeting_id = mc.meeting_id
+WHERE {filters}
+GROUP BY m.meeting_id, m.title, m.date
+ORDER BY avg_similarity DESC
+LIMIT :limit
+"""
+
+# Meetings with chunks matching the filters, counted only up to :limit
+FILTERED_MEETING_COUNT_SQL = """
+SELECT COUNT(*) FROM (
+    SELECT 1
+    FROM meetings m
+    WHERE {filters}
+      AND EXISTS (SELECT 1 FROM meeting_chunks mc WHERE mc.meeting_id = m.meeting_id)
+    LIMIT :limit
+) matching
+"""
+
 
 class SemanticSearcher:
-    def __init__(self):
-        """Initialize semantic searcher"""
-        # Create synchronous database engine
-        DATABASE_URL = os.getenv("SUPABASE_DB_URL")
-        sync_url = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
-        
-        self.engine = create_engine(
-            sync_url,
-            echo=False,
-            pool_pre_ping=True,
-            connect_args={"sslmode": "require"}
-        )
-        
-        self.Session = sessionmaker(bind=self.engine)
+    def __init__(self, backend: str = "postgres", index_dir: Path = DEFAULT_INDEX_DIR,
+                 cache_results: bool = True, database_url: Optional[str] = None,
+                 embedding_cache_dir: Optional[Path] = None):
+        """Initialize semantic searcher
+
+        backend="postgres" searches Supabase with pgvector. backend="local"
+        runs exact search over embeddings exported by export_embeddings.py
+        and needs no database connection at all.
+
+        database_url points the postgres backend at another database (e.g.
+        the docker-compose one used by the benchmarks); SSL is only required
+        for the default Supabase URL.
+
+        cache_results=False disables the result cache (benchmarks need every
+        query to hit the backend); query embeddings are always cached in
+        memory, and also on disk (shared across runs) with embedding_cache_dir.
+        """
+        if backend not in SEARCH_BACKENDS:
+            raise ValueError(f"Invalid search backend: '{backend}'")
+        self.backend = backend
+        self.engine = None
+        self.Session = None
+        self.local_engine = None
+
+        # normalized query -> embedding, and (query, filters, k) -> results
+        self.cache_results = cache_results
+        self.embedding_cache = LRUCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+        self.disk_cache = None
+        if embedding_cache_dir is not None:
+            self.disk_cache = DiskEmbeddingCache(embedding_cache_dir, EMBEDDING_MODEL)
+        self.result_cache = TTLCache(maxsize=SEARCH_RESULT_CACHE_SIZE, ttl=SEARCH_RESULT_TTL)
+        self.version_checked_at = 0.0
+
+        if backend == "local":
+            self.local_engine = ExactSearchEngine(index_dir)
+            # The exported index never changes under a running searcher
+            self.result_cache.set_version(self.local_engine.exported_at)
+        else:
+            # Create synchronous database engine
+            DATABASE_URL = database_url or os.getenv("SUPABASE_DB_URL")
+            sync_url = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+            
+            self.engine = create_engine(
+                sync_url,
+                echo=False,
+                pool_pre_ping=True,
+                connect_args={} if database_url else {"sslmode": "require"}
+            )
+            
+            self.Session = sessionmaker(bind=self.engine)
         
         # Initialize model2vec embedding model
         logger.info("Loading model2vec embeddings...")
-        self.embeddings = StaticModel.from_pretrained('minishlab/potion-base-8M')
+        self.embeddings = StaticModel.from_pretrained(EMBEDDING_MODEL)
         
         logger.info("Semantic searcher initialized")
 
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the model, through the disk cache if there is one"""
+        if self.disk_cache is None:
+            return self.embeddings.encode(texts)
+        return self.disk_cache.encode(self.embeddings.encode, texts)
+
     def embed_query(self, query: str) -> List[float]:
-        """Generate embedding for search query"""
-        embedding = self.embeddings.encode([query])[0]
-        return embedding.tolist()
+        """Generate embedding for search query, reusing cached embeddings"""
+        key = normalize_query(query)
+        embedding = self.embedding_cache.get(key)
+        if embedding is None:
+            embedding = self.encode([query])[0].tolist()
+            self.embedding_cache.put(key, embedding)
+        return embedding
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed many queries, encoding every cache miss in a single model call"""
+        keys = [normalize_query(query) for query in queries]
+        embeddings = {}
+        for key in keys:
+            embedding = self.embedding_cache.get(key)
+            if embedding is not None:
+                embeddings[key] = embedding
+
+        # First query text seen for each missing key, encoded as written
+        missing = {}
+        for key, query in zip(keys, queries):
+            if key not in embeddings:
+                missing.setdefault(key, query)
+        if missing:
+            for key, embedding in zip(missing, self.encode(list(missing.values()))):
+                embeddings[key] = embedding.tolist()
+                self.embedding_cache.put(key, embeddings[key])
+
+        return [embeddings[key] for key in keys]
+
+    def refresh_index_version(self):
+        """Drop cached results if the ingestion pipeline bumped the index version"""
+        if self.backend != "postgres":
+            return
+        now = time.monotonic()
+        if now - self.version_checked_at < INDEX_VERSION_CHECK_INTERVAL:
+            return
+        with self.Session() as session:
+            version = session.execute(
+                select(SearchIndexState.version).where(SearchIndexState.id == 1)
+            ).scalar()
+        self.version_checked_at = now
+        if self.result_cache.set_version(version):
+            logger.debug(f"Search index version is now {version}, result cache cleared")
+
+    def cached_search(self, key: Tuple, search) -> List[Dict]:
+        """Return cached results for key, or run search() and cache its results"""
+        if not self.cache_results:
+            return search()
+        self.refresh_index_version()
+        results = self.result_cache.get(key)
+        if results is None:
+            results = search()
+            self.result_cache.put(key, results)
+        # Callers get their own list so they cannot reorder the cached one
+        return list(results)
+
+    def cache_stats(self) -> Dict:
+        """Hit-rate metrics for the query embedding and search result caches"""
+        stats = {
+            'query_embeddings': self.embedding_cache.stats(),
+            'search_results': self.result_cache.stats(),
+        }
+        if self.disk_cache is not None:
+            stats['disk_embeddings'] = self.disk_cache.stats()
+        return stats
+
+    def apply_search_settings(self, session, limit: int,
+                              ef_search: Optional[int] = None, exact: bool = False,
+                              filtered: bool = False):
+        """Apply per-query planner settings for the current transaction only"""
+        if exact:
+            # Skip the ANN index entirely for a brute-force, exact result
+            session.execute(text("SELECT set_config('enable_indexscan', 'off', true)"))
+            return
+        if filtered:
+            # Keep walking the HNSW graph until enough rows pass the filters
+            # instead of stopping after ef_search candidates (pgvector >= 0.8)
+            session.execute(text("SELECT set_config('hnsw.iterative_scan', 'strict_order', true)"))
+        if ef_search is None:
+            return
+        # HNSW returns at most ef_search candidates, so never go below the limit
+        ef_search = max(ef_search, limit)
+        session.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+            {"ef_search": str(ef_search)}
+        )
+
+    @staticmethod
+    def count_statement(template: str, filters: SearchFilters, limit: int,
+                        **filter_kwargs) -> Optional[Tuple[str, Dict]]:
+        """Rendered filtered-count statement for execute_search, None without filters"""
+        if filters.is_empty():
+            return None
+        return render_named(template, {"limit": limit}, filters, **filter_kwargs)
+
+    def execute_search(self, sql: str, params: Dict, limit: int, ann_limit: int,
+                       ef_search: Optional[int], exact: bool,
+                       count: Optional[Tuple[str, Dict]] = None, queries: int = 1,
+                       exact_sql: Optional[str] = None) -> List:
+        """Run a search statement, guaranteeing `limit` rows per query when filters are set
+
+        count is the rendered filtered-count statement, None without filters.
+        An iterative scan stops at hnsw.max_scan_tuples, so a very selective
+        filter can still return fewer rows than requested. Only when the
+        filters match more rows than came back is the statement (or
+        exact_sql) re-run as an exact scan, where the filter indexes on
+        meeting_chunks do the work.
+        """
+        filtered = count is not None
+        with self.Session() as session:
+            self.apply_search_settings(session, ann_limit, ef_search, exact, filtered)
+            rows = session.execute(text(exact_sql if exact and exact_sql else sql), params).fetchall()
+            if not filtered or exact or len(rows) >= limit * queries:
+                return rows
+            count_sql, count_params = count
+            expected = expected_rows(session.execute(text(count_sql), count_params).scalar(), limit, queries)
+
+        if len(rows) < expected:
+            logger.debug(f"Filtered ANN scan returned {len(rows)}/{expected} rows, re-running exactly")
+            with self.Session() as session:
+                self.apply_search_settings(session, ann_limit, exact=True)
+                rows = session.execute(text(exact_sql or sql), params).fetchall()
+
+        return rows
 
-    def search_chunks(self, query: str, limit: int = 10) -> List[Dict]:
-        """Search for most relevant chunks using cosine similarity"""
+    def search_chunks(self, query: str, limit: int = 10,
+                      ef_search: Optional[int] = DEFAULT_EF_SEARCH,
+                      exact: bool = False, mode: str = "vector",
+                      candidates: int = HYBRID_CANDIDATES,
+                      precision: str = "full",
+                      filters: Optional[SearchFilters] = None) -> List[Dict]:
+        """Search for most relevant chunks
+
+        mode="vector" ranks chunks by cosine similarity. mode="hybrid" also
+        runs a full-text query over chunk_tsv and merges both candidate lists
+        with reciprocal rank fusion, so exact names and file numbers surface
+        even when their embeddings are not the closest.
+
+        ef_search controls the HNSW candidate list size for this query:
+        higher values improve recall at the cost of latency. exact=True
+        bypasses the index and scans every chunk.
+
+        precision="half" or "binary" (vector mode only) searches the compact
+        halfvec or bit index and reranks the top candidates with the full
+        float32 embeddings, in the same statement.
+
+        filters restricts the search by date range, department, view_id and
+        meeting ids (default: meetings since SEARCH_START_DATE). Filters are
+        applied during the index scan and `limit` results are returned
+        whenever that many chunks match.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Invalid search mode: '{mode}'")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Invalid precision: '{precision}'")
+        if precision != "full" and mode != "vector":
+            raise ValueError("Quantized precision only supports mode='vector'")
+        if filters is None:
+            filters = DEFAULT_FILTERS
+
+        key = ('chunks', normalize_query(query), mode, limit, ef_search, exact, candidates, precision, filters)
+        return self.cached_search(
+            key, lambda: self._search_chunks(query, limit, ef_search, exact, mode, candidates, precision, filters)
+        )
+
+    def _search_chunks(self, query: str, limit: int, ef_search: Optional[int],
+                       exact: bool, mode: str, candidates: int,
+                       precision: str = "full",
+                       filters: SearchFilters = DEFAULT_FILTERS) -> List[Dict]:
+        """Run a chunk search against the configured backend, bypassing the cache"""
         # Generate query embedding
         query_embedding = self.embed_query(query)
+
+        if self.backend == "local":
+            if mode != "vector":
+                raise ValueError("The local backend only supports mode='vector'")
+            if precision != "full":
+                raise ValueError("The local backend only supports precision='full'")
+            # Exact search: ef_search and exact do not apply
+            mask = self.local_engine.filter_mask(**filters.mask_kwargs())
+            return self.local_engine.search(np.asarray(query_embedding), k=limit, mask=mask)
         
-        # Convert to PostgreSQL array format
+        # Convert to pgvector text format, bound as a query parameter
         embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
+        values = {"embedding": embedding_str, "limit": limit}
         
-        # SQL query with cosine similarity using pgvector
-        sql = text(f"""
-        SELECT 
-            mc.meeting_id,
-            mc.chunk_index,
-            mc.chunk_text,
-            mc.metadata,
-            m.title,
-            m.date,
-            1 - (mc.embedding <=> '{embedding_str}'::vector) AS similarity_score
-        FROM meeting_chunks mc
-        JOIN meetings m ON mc.meeting_id = m.meeting_id
-        WHERE m.date >= '2025-01-01'
-        ORDER BY mc.embedding <=> '{embedding_str}'::vector
-        LIMIT {limit}
-        """)
+        if mode == "hybrid":
+            values.update({"query": query, "candidates": max(candidates, limit), "rrf_k": RRF_K})
+            ann_limit = values["candidates"]
+        elif precision != "full":
+            values["candidates"] = limit * RERANK_FACTORS[precision]
+            ann_limit = values["candidates"]
+        else:
+            ann_limit = limit
         
-        with self.Session() as session:
-            result = session.execute(sql)
-            
-            chunks = []
-            for row in result:
-                chunks.append({
-                    'meeting_id': row.meeting_id,
-                    'chunk_index': row.chunk_index,
-                    'chunk_text': row.chunk_text,
-                    'metadata': row.metadata,
-                    'meeting_title': row.title,
-                    'meeting_date': row.date,
-                    'similarity_score': float(row.similarity_score)
-                })
-            
-            return chunks
+        sql, params = render_named(chunk_search_sql(mode, precision), values, filters)
+        rows = self.execute_search(
+            sql, params, limit=limit, ann_limit=ann_limit, ef_search=ef_search, exact=exact,
+            count=self.count_statement(FILTERED_CHUNK_COUNT_SQL, filters, limit)
+        )
+        
+        chunks = []
+        for row in rows:
+            chunk = {
+                'meeting_id': row.meeting_id,
+                'chunk_index': row.chunk_index,
+                'chunk_text': row.chunk_text,
+                'metadata': row.metadata,
+                'meeting_title': row.title,
+                'meeting_date': row.date,
+                'similarity_score': float(row.similarity_score)
+            }
+            if mode == "hybrid":
+                chunk['rrf_score'] = float(row.rrf_score)
+                chunk['semantic_rank'] = row.semantic_rank
+                chunk['keyword_rank'] = row.keyword_rank
+            chunks.append(chunk)
+        
+        return chunks
+
+    def search_chunks_batch(self, queries: List[str], limit: int = 10,
+                            ef_search: Optional[int] = DEFAULT_EF_SEARCH,
+                            exact: bool = False,
+                            filters: Optional[SearchFilters] = None) -> List[List[Dict]]:
+        """Vector search for many queries at once
+
+        Returns one result list per query, in input order, identical to
+        calling search_chunks(query, mode="vector") for each. Cached queries
+        are answered from the result cache; the rest are embedded in one
+        batch and searched in a single statement (or one matrix product on
+        the local backend).
+        """
+        if filters is None:
+            filters = DEFAULT_FILTERS
+
+        keys = [
+            ('chunks', normalize_query(query), 'vector', limit, ef_search, exact, HYBRID_CANDIDATES, 'full', filters)
+            for query in queries
+        ]
+        results = {}
+        if self.cache_results:
+            self.refresh_index_version()
+            for key in keys:
+                cached = self.result_cache.get(key)
+                if cached is not None:
+                    results[key] = cached
+
+        # Duplicate queries in the batch are searched once, using the first
+        # query text seen for each key, embedded as written
+        pending = {}
+        for key, query in zip(keys, queries):
+            if key not in results:
+                pending.setdefault(key, query)
+        if pending:
+            searched = self._search_chunks_batch(list(pending.values()), limit, ef_search, exact, filters)
+            for key, chunks in zip(pending, searched):
+                results[key] = chunks
+                if self.cache_results:
+                    self.result_cache.put(key, chunks)
+
+        return [list(results[key]) for key in keys]
+
+    def _search_chunks_batch(self, queries: List[str], limit: int, ef_search: Optional[int],
+                             exact: bool, filters: SearchFilters = DEFAULT_FILTERS) -> List[List[Dict]]:
+        """Run a batched vector search against the configured backend, bypassing the cache"""
+        query_embeddings = self.embed_queries(queries)
 
-    def search_meetings_summary(self, query: str, limit: int = 5) -> List[Dict]:
-        """Get meeting-level relevance by aggregating chunk scores"""
+        if self.backend == "local":
+            mask = self.local_engine.filter_mask(**filters.mask_kwargs())
+            return self.local_engine.search_batch(np.asarray(query_embeddings), k=limit, mask=mask)
+
+        # Postgres array literal of pgvector text values: {"[..]","[..]"}
+        embeddings_str = '{' + ','.join(
+            '"[' + ','.join(map(str, embedding)) + ']"' for embedding in query_embeddings
+        ) + '}'
+        sql, params = render_named(
+            BATCH_VECTOR_SEARCH_SQL, {"embeddings": embeddings_str, "limit": limit}, filters
+        )
+
+        rows = self.execute_search(
+            sql, params, limit=limit, ann_limit=limit, ef_search=ef_search, exact=exact,
+            count=self.count_statement(FILTERED_CHUNK_COUNT_SQL, filters, limit),
+            queries=len(queries)
+        )
+
+        results = [[] for _ in queries]
+        for row in rows:
+            # WITH ORDINALITY is 1-based
+            results[row.query_index - 1].append({
+                'meeting_id': row.meeting_id,
+                'chunk_index': row.chunk_index,
+                'chunk_text': row.chunk_text,
+                'metadata': row.metadata,
+                'meeting_title': row.title,
+                'meeting_date': row.date,
+                'similarity_score': float(row.similarity_score)
+            })
+
+        return results
+
+    def search_meetings_summary(self, query: str, limit: int = 5,
+                                candidates: int = MEETING_CANDIDATES,
+                                exact: bool = False,
+                                filters: Optional[SearchFilters] = None) -> List[Dict]:
+        """Get meeting-level relevance by aggregating chunk scores
+
+        Runs in two stages: an ANN search over precomputed meeting centroids
+        picks the top `candidates` meetings, then only their chunks are
+        rescored exactly. exact=True aggregates over every chunk instead.
+        """
+        if filters is None:
+            filters = DEFAULT_FILTERS
+
+        key = ('meetings', normalize_query(query), limit, candidates, exact, filters)
+        return self.cached_search(
+            key, lambda: self._search_meetings_summary(query, limit, candidates, exact, filters)
+        )
+
+    def _search_meetings_summary(self, query: str, limit: int, candidates: int, exact: bool,
+                                 filters: SearchFilters = DEFAULT_FILTERS) -> List[Dict]:
+        """Run a meeting-level search against the configured backend, bypassing the cache"""
         # Generate query embedding
         query_embedding = self.embed_query(query)
-        embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
+
+        if self.backend == "local":
+            mask = self.local_engine.filter_mask(**filters.mask_kwargs())
+            return self.local_engine.search_meetings(np.asarray(query_embedding), k=limit, mask=mask)
+
+        # Centroids are means of unit vectors, so rank them by inner product
+        # with the normalized query: that equals the average chunk similarity
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector) or 1.0
+        embedding_str = '[' + ','.join(map(str, query_vector.tolist())) + ']'
+        # Meeting-level filters, applied to the meetings table
+        where, filter_params = filters.to_named_sql(alias="m", date_column="date")
+        params = {
+            "embedding": embedding_str, "limit": limit, "candidates": max(candidates, limit),
+            **filter_params
+        }
+        
+        rows = self.execute_search(
+            MEETING_SEARCH_SQL.format(filters=where), params,
+            limit=limit, ann_limit=params["candidates"],
+            ef_search=DEFAULT_EF_SEARCH, exact=exact,
+            count=self.count_statement(
+                FILTERED_MEETING_COUNT_SQL, filters, limit, alias="m", date_column="date"
+            ),
+            exact_sql=EXACT_MEETING_SEARCH_SQL.format(filters=where)
+        )
         
-        # SQL query to get top meetings by average similarity
-        sql = text(f"""
-        SELECT 
-            m.meeting_id,
-            m.title,
-            m.date,
-            COUNT(mc.id) as chunk_count,
-            AVG(1 - (mc.embedding <=> '{embedding_str}'::vector)) AS avg_similarity,
-            MAX(1 - (mc.embedding <=> '{embedding_str}'::vector)) AS max_similarity
-        FROM meetings m
-        JOIN meeting_chunks mc ON m.meeting_id = mc.meeting_id
-        WHERE m.date >= '2025-01-01'
-        GROUP BY m.meeting_id, m.title, m.date
-        ORDER BY avg_similarity DESC
-        LIMIT {limit}
-        """)
+        meetings = []
+        for row in rows:
+            meetings.append({
+                'meeting_id': row.meeting_id,
+                'title': row.title,
+                'date': row.date,
+                'chunk_count': row.chunk_count,
+                'avg_similarity': float(row.avg_similarity),
+                'max_similarity': float(row.max_similarity)
+            })
         
-        with self.Session() as session:
-            result = session.execute(sql)
-            
-            meetings = []
-            for row in result:
-                meetings.append({
-                    'meeting_id': row.meeting_id,
-                    'title': row.title,
-                    'date': row.date,
-                    'chunk_count': row.chunk_count,
-                    'avg_similarity': float(row.avg_similarity),
-                    'max_similarity': float(row.max_similarity)
-                })
-            
-            return meetings
+        return meetings
 
 
 def main():
@@ -144,23 +559,58 @@ def main():
     parser = argparse.ArgumentParser(description='Search meeting transcripts')
     parser.add_argument('--query', '-q', default='pipeline water damage', 
                        help='Search query (default: "pipeline water damage")')
+    parser.add_argument('--limit', '-n', type=int, default=10,
+                       help='Number of chunks to return (default: 10)')
+    parser.add_argument('--mode', choices=SEARCH_MODES, default='vector',
+                       help='vector = embeddings only, hybrid = keyword + vector with RRF (default: vector)')
+    parser.add_argument('--ef-search', type=int, default=DEFAULT_EF_SEARCH,
+                       help=f'HNSW candidate list size, higher = better recall (default: {DEFAULT_EF_SEARCH})')
+    parser.add_argument('--precision', choices=PRECISIONS, default='full',
+                       help='Index to search: full = float32, half/binary = compact index + float32 rerank (default: full)')
+    parser.add_argument('--date-from', default=SEARCH_START_DATE.strftime('%Y-%m-%d'),
+                       help='Only meetings on or after this date (default: %(default)s)')
+    parser.add_argument('--date-to', help='Only meetings on or before this date')
+    parser.add_argument('--department', nargs='+', help='Only meetings of these departments')
+    parser.add_argument('--view-id', nargs='+', help='Only meetings with these view ids')
+    parser.add_argument('--meeting-id', nargs='+', help='Only these meetings')
+    parser.add_argument('--backend', choices=SEARCH_BACKENDS, default='postgres',
+                       help='postgres = Supabase/pgvector, local = exact search over exported embeddings (default: postgres)')
+    parser.add_argument('--index-dir', type=Path, default=DEFAULT_INDEX_DIR,
+                       help=f'Exported embeddings for the local backend (default: {DEFAULT_INDEX_DIR})')
+    parser.add_argument('--embedding-cache', type=Path, nargs='?', const=DEFAULT_CACHE_DIR,
+                       help=f'Persist query embeddings in an on-disk cache (default dir: {DEFAULT_CACHE_DIR})')
     args = parser.parse_args()
     
     query = args.query
+    filters = SearchFilters(
+        date_from=datetime.strptime(args.date_from, '%Y-%m-%d') if args.date_from else None,
+        # Inclusive of the whole end day
+        date_to=datetime.strptime(args.date_to, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
+        if args.date_to else None,
+        departments=args.department,
+        view_ids=args.view_id,
+        meeting_ids=args.meeting_id
+    )
     
     logger.info(f"Searching for: '{query}'")
     
-    searcher = SemanticSearcher()
+    searcher = SemanticSearcher(backend=args.backend, index_dir=args.index_dir,
+                                embedding_cache_dir=args.embedding_cache)
     
     # Search for most relevant chunks
     logger.info("Finding most relevant chunks...")
-    chunks = searcher.search_chunks(query, limit=10)
+    chunks = searcher.search_chunks(query, limit=args.limit, ef_search=args.ef_search, mode=args.mode,
+                                    precision=args.precision, filters=filters)
     
     print(f"\n🔍 TOP CHUNKS FOR: '{query}'")
     print("=" * 80)
     
     for i, chunk in enumerate(chunks, 1):
-        print(f"\n📄 RESULT {i} (Similarity: {chunk['similarity_score']:.3f})")
+        if 'rrf_score' in chunk:
+            print(f"\n📄 RESULT {i} (RRF: {chunk['rrf_score']:.4f}, Similarity: {chunk['similarity_score']:.3f}, "
+                  f"semantic rank: {chunk['semantic_rank'] or '-'}, keyword rank: {chunk['keyword_rank'] or '-'})")
+        else:
+            print(f"\n📄 RESULT {i} (Similarity: {chunk['similarity_score']:.3f})")
         print(f"Meeting: {chunk['meeting_title']}")
         print(f"Date: {chunk['meeting_date'].strftime('%Y-%m-%d')}")
         print(f"Meeting ID: {chunk['meeting_id']}, Chunk: {chunk['chunk_index']}")
@@ -174,7 +624,7 @@ def main():
     
     # Search for most relevant meetings
     logger.info("Finding most relevant meetings...")
-    meetings = searcher.search_meetings_summary(query, limit=5)
+    meetings = searcher.search_meetings_summary(query, limit=5, filters=filters)
     
     print(f"\n📊 TOP MEETINGS FOR: '{query}'")
     print("=" * 80)
@@ -188,6 +638,8 @@ def main():
         print(f"Avg Similarity: {meeting['avg_similarity']:.3f}")
         print(f"Max Similarity: {meeting['max_similarity']:.3f}")
         print("-" * 80)
+    
+    logger.debug(f"Cache stats: {searcher.cache_stats()}")
 
 
 if __name__ == "__main__":
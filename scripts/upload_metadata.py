@@ -131,7 +131,8 @@ class MetadataUploader:
                 meeting_id=meeting_id,
                 clip_id=meeting_data['clip_id'],
                 view_id=meeting_data['view_id'],
-                department="Board of Supervisors",  # Default for view_id=10
+                # Meetings scraped before departments were tracked are all view_id=10
+                department=meeting_data.get('department') or "Board of Supervisors",
                 date=date_obj or datetime.now(),  # Use current time if date parsing fails
                 duration=duration_obj,
                 title=meeting_data.get('title'),
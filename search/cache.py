@@ -0,0 +1,122 @@
+"""
+In-process caches for query embeddings and search results
+
+- LRUCache: bounded least-recently-used cache (query key -> embedding)
+- TTLCache: bounded cache whose entries expire after a TTL and are all dropped
+  when the search index version changes (query + filters + k -> results)
+
+Both are thread-safe and count hits and misses so hit rates can be reported.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: trimmed and single-spaced
+
+    Only the key is normalized; the original query text is what gets
+    encoded. Case is kept, since a cased model embeds "Muni" and "muni"
+    differently.
+    """
+    return " ".join(query.split())
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 1024):
+        """Bounded cache that evicts the least recently used entry when full"""
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class TTLCache(LRUCache):
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        """LRU cache whose entries expire after `ttl` seconds or on index version change"""
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.version = None
+        self.expirations = 0
+        self.invalidations = 0
+
+    def set_version(self, version: Any) -> bool:
+        """Record the current index version; a change drops every cached entry"""
+        with self._lock:
+            if version == self.version:
+                return False
+            if self.version is not None:
+                self.invalidations += 1
+            self.version = version
+            self._data.clear()
+            return True
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        super().put(key, (time.monotonic() + self.ttl, value))
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        stats.update({
+            'ttl_seconds': self.ttl,
+            'index_version': self.version,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        })
+        return stats
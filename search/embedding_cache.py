@@ -0,0 +1,283 @@
+"""
+Persistent, content-addressed embedding cache
+
+Embeddings are keyed by (model id, md5 of the text), so any text a model
+has encoded before - a chunk re-created by a new chunker setting, a repeated
+search query - is read back instead of encoded again, across runs.
+
+Layout, one directory per model under the cache root:
+- NN.f32:   float32 rows (n x dim), read through a memory map
+- NN.keys:  row-aligned text hashes, one per line (the shard's index)
+- NN.atime: row-aligned float64 last-use times, updated in place
+
+Keys are spread over shards by hash. When the cache grows past max_bytes the
+least recently used rows are evicted and the affected shards are compacted.
+
+Several processes (pipeline runs, queue workers, the search CLI) can share a
+cache directory: appends and evictions hold an exclusive flock on the model
+directory's .lock file, and first reload any shard another process changed,
+so keys and rows stay aligned. Compaction replaces shard files, so a process
+that has not reloaded yet keeps reading its old, consistent mapping.
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "indexes" / "embedding_cache"
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB per model
+DEFAULT_SHARDS = 16
+# Evicting down to this fraction of max_bytes, so eviction doesn't run on every put
+EVICT_TO = 0.9
+KEY_LENGTH = 32  # md5 hex digest
+
+
+def text_hash(text: str) -> str:
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+class _Shard:
+    def __init__(self, directory: Path, number: int, dim: int):
+        self.data_path = directory / f"{number:02d}.f32"
+        self.keys_path = directory / f"{number:02d}.keys"
+        self.atime_path = directory / f"{number:02d}.atime"
+        self.dim = dim
+        self.keys: List[str] = []
+        self.vectors: Optional[np.memmap] = None
+        self.atimes: Optional[np.memmap] = None
+        # (inode, size) of the keys file as this process last saw it
+        self._signature: Optional[Tuple[int, int]] = None
+        self._load()
+
+    def _keys_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.keys_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def refresh(self) -> bool:
+        """Reload the shard if another process appended to or compacted it; True if it did"""
+        if self._keys_signature() == self._signature:
+            return False
+        self._load()
+        return True
+
+    def _load(self):
+        keys = self.keys_path.read_text().split() if self.keys_path.exists() else []
+        data_rows = self.data_path.stat().st_size // (4 * self.dim) if self.data_path.exists() else 0
+        atime_rows = self.atime_path.stat().st_size // 8 if self.atime_path.exists() else 0
+        # A run interrupted mid-append can leave files of different lengths;
+        # only rows present in all three are valid
+        rows = min(len(keys), data_rows, atime_rows)
+        if rows < max(len(keys), data_rows, atime_rows):
+            self._truncate(keys[:rows], rows)
+        self.keys = keys[:rows]
+        self._signature = self._keys_signature()
+        self._map()
+
+    def _truncate(self, keys: List[str], rows: int):
+        self.keys_path.write_text("".join(f"{key}\n" for key in keys))
+        for path, row_bytes in ((self.data_path, 4 * self.dim), (self.atime_path, 8)):
+            with open(path, 'ab') as f:
+                f.truncate(rows * row_bytes)
+
+    def _map(self):
+        rows = len(self.keys)
+        if rows:
+            self.vectors = np.memmap(self.data_path, dtype=np.float32, mode='r', shape=(rows, self.dim))
+            self.atimes = np.memmap(self.atime_path, dtype=np.float64, mode='r+', shape=(rows,))
+        else:
+            self.vectors = self.atimes = None
+
+    def append(self, keys: List[str], vectors: np.ndarray, now: float):
+        with open(self.data_path, 'ab') as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(self.atime_path, 'ab') as f:
+            f.write(np.full(len(keys), now, dtype=np.float64).tobytes())
+        # Keys last: a row only counts once its key is written
+        with open(self.keys_path, 'a') as f:
+            f.write("".join(f"{key}\n" for key in keys))
+        self.keys.extend(keys)
+        self._signature = self._keys_signature()
+        self._map()
+
+    def compact(self, keep: np.ndarray):
+        """Rewrite the shard with only the rows in keep (sorted row numbers)"""
+        keys = [self.keys[row] for row in keep]
+        vectors = np.array(self.vectors[keep]) if len(keep) else np.empty((0, self.dim), np.float32)
+        atimes = np.array(self.atimes[keep]) if len(keep) else np.empty(0, np.float64)
+        self.vectors = self.atimes = None
+
+        for path, payload in ((self.data_path, vectors.tobytes()), (self.atime_path, atimes.tobytes()),
+                              (self.keys_path, "".join(f"{key}\n" for key in keys).encode())):
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+        self.keys = keys
+        self._signature = self._keys_signature()
+        self._map()
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.keys) * self.row_bytes
+
+    @property
+    def row_bytes(self) -> int:
+        return 4 * self.dim + 8 + KEY_LENGTH + 1
+
+
+class DiskEmbeddingCache:
+    def __init__(self, cache_dir: Path, model_id: str, dim: int = 256,
+                 max_bytes: int = DEFAULT_MAX_BYTES, shards: int = DEFAULT_SHARDS):
+        """Embedding cache for one model under cache_dir, evicting LRU rows past max_bytes"""
+        self.model_id = model_id
+        self.dim = dim
+        self.max_bytes = max_bytes
+        self.directory = Path(cache_dir) / re.sub(r"[^A-Za-z0-9_.-]+", "__", model_id)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_path = self.directory / ".lock"
+        with self._file_lock():
+            self._shards = [_Shard(self.directory, i, dim) for i in range(shards)]
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._reindex()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock on the model directory, shared with other processes"""
+        with open(self._lock_path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refresh(self):
+        """Pick up shards other processes changed since this one last looked"""
+        if any([shard.refresh() for shard in self._shards]):
+            self._reindex()
+
+    def _reindex(self):
+        self._index = {
+            key: (number, row)
+            for number, shard in enumerate(self._shards)
+            for row, key in enumerate(shard.keys)
+        }
+
+    def _shard_of(self, key: str) -> int:
+        return int(key[:8], 16) % len(self._shards)
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Cached embedding per text, None where missing"""
+        now = time.time()
+        found = []
+        with self._lock:
+            for text in texts:
+                location = self._index.get(text_hash(text))
+                if location is None:
+                    self.misses += 1
+                    found.append(None)
+                    continue
+                shard = self._shards[location[0]]
+                shard.atimes[location[1]] = now
+                found.append(np.array(shard.vectors[location[1]]))
+                self.hits += 1
+        return found
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        return self.get_many([text])[0]
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray):
+        """Store embeddings for texts not cached yet, then evict if over max_bytes"""
+        now = time.time()
+        with self._lock, self._file_lock():
+            self._refresh()
+            pending: Dict[int, Tuple[List[str], List[int]]] = {}
+            seen = set()
+            for i, text in enumerate(texts):
+                key = text_hash(text)
+                if key in self._index or key in seen:
+                    continue
+                seen.add(key)
+                keys, rows = pending.setdefault(self._shard_of(key), ([], []))
+                keys.append(key)
+                rows.append(i)
+            for number, (keys, rows) in pending.items():
+                shard = self._shards[number]
+                first = len(shard.keys)
+                shard.append(keys, np.asarray(vectors)[rows], now)
+                for offset, key in enumerate(keys):
+                    self._index[key] = (number, first + offset)
+            if self.nbytes > self.max_bytes:
+                self._evict()
+
+    def put(self, text: str, vector: np.ndarray):
+        self.put_many([text], np.asarray(vector)[None, :])
+
+    def encode(self, encode: Callable[[List[str]], np.ndarray], texts: Sequence[str]) -> np.ndarray:
+        """Embeddings for texts, calling encode only for the ones not cached"""
+        embeddings = np.empty((len(texts), self.dim), dtype=np.float32)
+        missing = []
+        for i, vector in enumerate(self.get_many(texts)):
+            if vector is None:
+                missing.append(i)
+            else:
+                embeddings[i] = vector
+        if missing:
+            encoded = np.asarray(encode([texts[i] for i in missing]), dtype=np.float32)
+            embeddings[missing] = encoded
+            self.put_many([texts[i] for i in missing], encoded)
+        return embeddings
+
+    def _evict(self):
+        """Drop least recently used rows until the cache is under EVICT_TO * max_bytes"""
+        atimes = np.concatenate([
+            shard.atimes if shard.atimes is not None else np.empty(0) for shard in self._shards
+        ])
+        shard_of_row = np.concatenate([np.full(len(shard.keys), n) for n, shard in enumerate(self._shards)])
+        row_in_shard = np.concatenate([np.arange(len(shard.keys)) for shard in self._shards])
+
+        row_bytes = self._shards[0].row_bytes
+        n_evict = len(atimes) - int(self.max_bytes * EVICT_TO) // row_bytes
+        evict = np.argsort(atimes, kind='stable')[:n_evict]
+        keep = np.ones(len(atimes), dtype=bool)
+        keep[evict] = False
+
+        for number in np.unique(shard_of_row[evict]):
+            in_shard = shard_of_row == number
+            self._shards[number].compact(row_in_shard[in_shard & keep])
+        self._reindex()
+        self.evictions += len(evict)
+        logger.info(f"Evicted {len(evict)} embeddings from {self.directory}")
+
+    @property
+    def nbytes(self) -> int:
+        return sum(shard.nbytes for shard in self._shards)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._index),
+            'bytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
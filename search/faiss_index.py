@@ -0,0 +1,281 @@
+"""
+Persistent FAISS IVF / IVF-PQ index over meeting_chunks embeddings
+
+The builder streams embeddings out of Postgres in batches, trains an IVF-PQ
+(or IVF-Flat) index on a random sample and writes it to disk with a version
+stamp. FaissSearcher loads the newest version and hot-swaps it when a newer
+one appears, so the API never has to restart after a rebuild.
+
+Files in the index directory, per version:
+- chunks-<version>.faiss: the FAISS index, ids are meeting_chunks.id
+- chunks-<version>.json: manifest with build parameters, written last
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from loguru import logger
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from database.models import Meeting, MeetingChunk
+
+EMBEDDING_DIM = 256
+
+# Defaults: 32 sub-quantizers x 8 bits = 32 bytes per vector instead of 1024
+DEFAULT_PQ_M = 32
+DEFAULT_PQ_NBITS = 8
+DEFAULT_TRAIN_SIZE = 50000
+DEFAULT_NPROBE = 16
+
+INDEX_TYPES = ("ivfpq", "ivfflat")
+INDEX_PREFIX = "chunks"
+
+
+def iter_embedding_batches(session: Session, since: Optional[datetime] = None,
+                           batch_size: int = 5000) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield (chunk ids, normalized float32 vectors) batches from meeting_chunks"""
+    query = (
+        select(MeetingChunk.id, MeetingChunk.embedding)
+        .join(Meeting, MeetingChunk.meeting_id == Meeting.meeting_id)
+        .where(MeetingChunk.embedding.isnot(None))
+        .order_by(MeetingChunk.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if since is not None:
+        query = query.where(Meeting.date >= since)
+
+    for partition in session.execute(query).partitions():
+        ids = np.fromiter((row.id for row in partition), dtype=np.int64, count=len(partition))
+        vectors = np.vstack([row.embedding for row in partition]).astype(np.float32)
+        faiss.normalize_L2(vectors)
+        yield ids, vectors
+
+
+def sample_embeddings(session: Session, size: int,
+                      since: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Random sample of (chunk ids, normalized embeddings) for training and recall checks"""
+    query = (
+        select(MeetingChunk.id, MeetingChunk.embedding)
+        .join(Meeting, MeetingChunk.meeting_id == Meeting.meeting_id)
+        .where(MeetingChunk.embedding.isnot(None))
+        .order_by(func.random())
+        .limit(size)
+    )
+    if since is not None:
+        query = query.where(Meeting.date >= since)
+
+    rows = session.execute(query).all()
+    ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+    vectors = np.vstack([row.embedding for row in rows]).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return ids, vectors
+
+
+def default_nlist(train_count: int) -> int:
+    """Roughly 4 * sqrt(n) lists, keeping at least 39 training points per list"""
+    return max(1, min(int(4 * np.sqrt(train_count)), train_count // 39))
+
+
+def build_faiss_index(session: Session, index_dir: Path, index_type: str = "ivfpq",
+                      nlist: Optional[int] = None, pq_m: int = DEFAULT_PQ_M,
+                      pq_nbits: int = DEFAULT_PQ_NBITS, train_size: int = DEFAULT_TRAIN_SIZE,
+                      since: Optional[datetime] = None, batch_size: int = 5000) -> Dict:
+    """Train an IVF or IVF-PQ index, add every chunk in streamed batches and save it
+
+    Returns the manifest of the new version.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Invalid index type: '{index_type}'")
+
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Sampling up to {train_size} embeddings for training...")
+    _, train_vectors = sample_embeddings(session, train_size, since=since)
+    if nlist is None:
+        nlist = default_nlist(len(train_vectors))
+
+    # Inner product on L2-normalized vectors is cosine similarity
+    quantizer = faiss.IndexFlatIP(EMBEDDING_DIM)
+    if index_type == "ivfpq":
+        index = faiss.IndexIVFPQ(quantizer, EMBEDDING_DIM, nlist, pq_m, pq_nbits,
+                                 faiss.METRIC_INNER_PRODUCT)
+    else:
+        index = faiss.IndexIVFFlat(quantizer, EMBEDDING_DIM, nlist, faiss.METRIC_INNER_PRODUCT)
+
+    logger.info(f"Training {index_type} index: nlist={nlist}, {len(train_vectors)} vectors")
+    start = time.perf_counter()
+    index.train(train_vectors)
+    train_seconds = time.perf_counter() - start
+    del train_vectors
+
+    start = time.perf_counter()
+    for ids, vectors in iter_embedding_batches(session, since=since, batch_size=batch_size):
+        index.add_with_ids(vectors, ids)
+        logger.debug(f"Added {index.ntotal} vectors")
+    add_seconds = time.perf_counter() - start
+
+    version = datetime.now().strftime('%Y%m%d%H%M%S')
+    manifest = {
+        'version': version,
+        'index_type': index_type,
+        'count': int(index.ntotal),
+        'dim': EMBEDDING_DIM,
+        'nlist': nlist,
+        'pq_m': pq_m if index_type == "ivfpq" else None,
+        'pq_nbits': pq_nbits if index_type == "ivfpq" else None,
+        'since': since.isoformat() if since else None,
+        'train_seconds': round(train_seconds, 2),
+        'add_seconds': round(add_seconds, 2),
+        'built_at': datetime.now().isoformat(),
+    }
+
+    # Write the index first; the manifest appearing is what makes a version visible
+    index_path = index_dir / f"{INDEX_PREFIX}-{version}.faiss"
+    faiss.write_index(index, str(index_path) + ".tmp")
+    os.replace(str(index_path) + ".tmp", index_path)
+    manifest['bytes'] = index_path.stat().st_size
+
+    manifest_path = index_dir / f"{INDEX_PREFIX}-{version}.json"
+    with open(str(manifest_path) + ".tmp", 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(str(manifest_path) + ".tmp", manifest_path)
+
+    raw_bytes = manifest['count'] * EMBEDDING_DIM * 4
+    logger.info(
+        f"Saved index version {version}: {manifest['count']} vectors, "
+        f"{manifest['bytes'] / 1e6:.1f} MB (raw float32: {raw_bytes / 1e6:.1f} MB)"
+    )
+    return manifest
+
+
+def list_versions(index_dir: Path) -> List[str]:
+    """Complete index versions in the directory, oldest first"""
+    return sorted(path.stem.split("-", 1)[1] for path in Path(index_dir).glob(f"{INDEX_PREFIX}-*.json"))
+
+
+def prune_versions(index_dir: Path, keep: int = 2):
+    """Delete all but the newest `keep` versions"""
+    for version in list_versions(index_dir)[:-keep]:
+        for suffix in (".json", ".faiss"):
+            path = Path(index_dir) / f"{INDEX_PREFIX}-{version}{suffix}"
+            if path.exists():
+                path.unlink()
+        logger.info(f"Removed old index version {version}")
+
+
+def exact_top_k(session: Session, queries: np.ndarray, k: int,
+                since: Optional[datetime] = None, batch_size: int = 5000) -> np.ndarray:
+    """Exact top-k chunk ids per query, best first, computed over streamed batches"""
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+
+    for ids, vectors in iter_embedding_batches(session, since=since, batch_size=batch_size):
+        scores = np.concatenate([best_scores, queries @ vectors.T], axis=1)
+        candidate_ids = np.concatenate([best_ids, np.broadcast_to(ids, (len(queries), len(ids)))], axis=1)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, top, axis=1)
+        best_ids = np.take_along_axis(candidate_ids, top, axis=1)
+
+    # Best first, like index.search
+    order = np.argsort(-best_scores, axis=1)
+    return np.take_along_axis(best_ids, order, axis=1)
+
+
+def without_self(ids: np.ndarray, query_ids: np.ndarray, k: int) -> List[List[int]]:
+    """Each row's first k ids other than the query's own chunk id (and FAISS's -1 padding)"""
+    return [
+        [chunk_id for chunk_id in row if chunk_id != query_id and chunk_id != -1][:k]
+        for row, query_id in zip(ids.tolist(), query_ids.tolist())
+    ]
+
+
+def check_recall(session: Session, index: faiss.Index, k: int = 10, n_queries: int = 100,
+                 nprobe_values: Tuple[int, ...] = (1, 4, 16, 64),
+                 since: Optional[datetime] = None) -> List[Dict]:
+    """Recall@k of the index against exact search, using stored chunks as queries
+    
+    A stored chunk is always its own exact nearest neighbour, and trivially
+    found, so each query's own id is dropped from both result lists (k + 1
+    are retrieved) before comparing the remaining top k.
+    """
+    query_ids, queries = sample_embeddings(session, n_queries, since=since)
+    truth = without_self(exact_top_k(session, queries, k + 1, since=since), query_ids, k)
+
+    results = []
+    for nprobe in nprobe_values:
+        params = faiss.SearchParametersIVF(nprobe=nprobe)
+        start = time.perf_counter()
+        _, found = index.search(queries, k + 1, params=params)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        found = without_self(found, query_ids, k)
+
+        recall = np.mean([
+            len(set(found[i]) & set(truth[i])) / k for i in range(len(queries))
+        ])
+        results.append({'nprobe': nprobe, 'recall': float(recall), 'ms_per_query': elapsed_ms})
+        logger.info(f"nprobe={nprobe}: recall@{k}={recall:.3f}, {elapsed_ms:.3f} ms/query")
+
+    return results
+
+
+class FaissSearcher:
+    def __init__(self, index_dir: Path, nprobe: int = DEFAULT_NPROBE, reload_interval: float = 30.0):
+        """In-process searcher that hot-swaps to newer index versions"""
+        self.index_dir = Path(index_dir)
+        self.nprobe = nprobe
+        self.reload_interval = reload_interval
+        # (version, index) is swapped as one reference so readers never see a mix
+        self._state: Tuple[Optional[str], Optional[faiss.Index]] = (None, None)
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._state[0]
+
+    def reload_due(self) -> bool:
+        """Whether reload_interval has passed since the last version check"""
+        return time.monotonic() - self._last_check >= self.reload_interval
+
+    def maybe_reload(self, force: bool = False) -> bool:
+        """Load the newest index version if it changed; checks at most every reload_interval"""
+        now = time.monotonic()
+        if not force and not self.reload_due():
+            return False
+
+        with self._lock:
+            self._last_check = now
+            versions = list_versions(self.index_dir)
+            if not versions or versions[-1] == self.version:
+                return False
+
+            latest = versions[-1]
+            index = faiss.read_index(str(self.index_dir / f"{INDEX_PREFIX}-{latest}.faiss"))
+            index.nprobe = self.nprobe
+            previous = self.version
+            self._state = (latest, index)
+
+        logger.info(f"Loaded FAISS index version {latest} ({index.ntotal} vectors, previous: {previous})")
+        return True
+
+    def search(self, query_embeddings: np.ndarray, k: int = 10,
+               nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (scores, chunk ids) arrays of shape (n_queries, k); missing hits have id -1"""
+        version, index = self._state
+        if index is None:
+            raise RuntimeError(f"No FAISS index loaded from {self.index_dir}")
+
+        queries = np.array(query_embeddings, dtype=np.float32, ndmin=2)
+        faiss.normalize_L2(queries)
+
+        params = faiss.SearchParametersIVF(nprobe=nprobe) if nprobe else None
+        return index.search(queries, k, params=params)
@@ -0,0 +1,74 @@
+"""
+Search filters shared by the scripts, the API and the local backend
+
+SearchFilters renders its conditions as a SQL fragment for either
+SQLAlchemy text() queries (:name parameters) or asyncpg ($n parameters),
+and as keyword arguments for ExactSearchEngine.filter_mask. It is frozen
+and hashable, so it can be part of a result cache key.
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _as_tuple(values: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    """Sorted, de-duplicated tuple so equal filters hash equally"""
+    if values is None:
+        return None
+    if isinstance(values, str):
+        values = [values]
+    return tuple(sorted(set(values)))
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    departments: Optional[Tuple[str, ...]] = None
+    view_ids: Optional[Tuple[str, ...]] = None
+    meeting_ids: Optional[Tuple[str, ...]] = None
+
+    def __post_init__(self):
+        for name in ("departments", "view_ids", "meeting_ids"):
+            object.__setattr__(self, name, _as_tuple(getattr(self, name)))
+
+    def is_empty(self) -> bool:
+        return all(getattr(self, f.name) is None for f in fields(self))
+
+    def conditions(self, alias: str = "mc",
+                   date_column: str = "meeting_date") -> List[Tuple[str, str, Any]]:
+        """(name, SQL condition with a {} parameter placeholder, value) per set filter"""
+        conditions = []
+        if self.date_from is not None:
+            conditions.append(("date_from", f"{alias}.{date_column} >= {{}}", self.date_from))
+        if self.date_to is not None:
+            conditions.append(("date_to", f"{alias}.{date_column} <= {{}}", self.date_to))
+        if self.departments is not None:
+            conditions.append(("departments", f"{alias}.department = ANY(CAST({{}} AS text[]))",
+                               list(self.departments)))
+        if self.view_ids is not None:
+            conditions.append(("view_ids", f"{alias}.view_id = ANY(CAST({{}} AS text[]))",
+                               list(self.view_ids)))
+        if self.meeting_ids is not None:
+            conditions.append(("meeting_ids", f"{alias}.meeting_id = ANY(CAST({{}} AS text[]))",
+                               list(self.meeting_ids)))
+        return conditions
+
+    def to_named_sql(self, alias: str = "mc",
+                     date_column: str = "meeting_date") -> Tuple[str, Dict[str, Any]]:
+        """WHERE body and parameters for SQLAlchemy text() (:name placeholders)"""
+        conditions = self.conditions(alias, date_column)
+        sql = " AND ".join(cond.format(f":{name}") for name, cond, _ in conditions)
+        return sql or "TRUE", {name: value for name, _, value in conditions}
+
+    def to_numbered_sql(self, first: int, alias: str = "mc",
+                        date_column: str = "meeting_date") -> Tuple[str, List[Any]]:
+        """WHERE body and arguments for asyncpg, numbering placeholders from $first"""
+        conditions = self.conditions(alias, date_column)
+        sql = " AND ".join(cond.format(f"${first + i}") for i, (_, cond, _) in enumerate(conditions))
+        return sql or "TRUE", [value for _, _, value in conditions]
+
+    def mask_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for ExactSearchEngine.filter_mask"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
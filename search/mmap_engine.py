@@ -0,0 +1,304 @@
+"""
+Memory-mapped exact search over exported chunk embeddings
+
+The export writes two files to an index directory:
+- embeddings.npy: L2-normalized float32 matrix (n_chunks x 256), opened with mmap
+- chunks.json: row-aligned sidecar with chunk ids, text, metadata and meeting info
+
+A search is a single matrix-vector product followed by argpartition, with
+meeting/date filters applied as boolean masks over the rows.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from database.models import Meeting, MeetingChunk
+
+EMBEDDINGS_FILE = "embeddings.npy"
+SIDECAR_FILE = "chunks.json"
+EMBEDDING_DIM = 256
+
+
+def export_embeddings(session: Session, index_dir: Path,
+                      since: Optional[datetime] = None, batch_size: int = 5000) -> int:
+    """Stream meeting_chunks embeddings into a float32 .npy file plus JSON sidecar
+
+    Rows are written straight into a memory-mapped output file, so the export
+    never holds more than one batch of vectors in memory. Files are written
+    under temporary names and swapped in when complete.
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    filters = [MeetingChunk.embedding.isnot(None)]
+    if since is not None:
+        filters.append(Meeting.date >= since)
+
+    total = session.execute(
+        select(func.count(MeetingChunk.id))
+        .join(Meeting, MeetingChunk.meeting_id == Meeting.meeting_id)
+        .where(*filters)
+    ).scalar()
+
+    logger.info(f"Exporting {total} chunk embeddings to {index_dir}")
+
+    tmp_embeddings = index_dir / f"{EMBEDDINGS_FILE}.tmp"
+    matrix = np.lib.format.open_memmap(tmp_embeddings, mode="w+", dtype=np.float32,
+                                       shape=(total, EMBEDDING_DIM))
+
+    query = (
+        select(
+            MeetingChunk.id,
+            MeetingChunk.meeting_id,
+            MeetingChunk.chunk_index,
+            MeetingChunk.chunk_text,
+            MeetingChunk.meta_data,
+            MeetingChunk.embedding,
+            Meeting.title,
+            Meeting.date,
+            Meeting.department,
+            Meeting.view_id,
+        )
+        .join(Meeting, MeetingChunk.meeting_id == Meeting.meeting_id)
+        .where(*filters)
+        .order_by(MeetingChunk.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    chunks = []
+    meetings = {}
+    row = 0
+    for record in session.execute(query):
+        # Rows beyond the counted total (concurrent inserts) are left for the next export
+        if row >= total:
+            break
+        matrix[row] = record.embedding
+        chunks.append({
+            'id': record.id,
+            'meeting_id': record.meeting_id,
+            'chunk_index': record.chunk_index,
+            'chunk_text': record.chunk_text,
+            'metadata': record.meta_data,
+        })
+        if record.meeting_id not in meetings:
+            meetings[record.meeting_id] = {
+                'title': record.title,
+                'date': record.date.isoformat(),
+                'department': record.department,
+                'view_id': record.view_id,
+            }
+        row += 1
+
+    # Normalize once at export time so cosine similarity is a plain dot product
+    norms = np.linalg.norm(matrix[:row], axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix[:row] /= norms
+    matrix.flush()
+    del matrix
+
+    if row < total:
+        # Chunks deleted while exporting: shrink to the rows actually written
+        trimmed = np.load(tmp_embeddings, mmap_mode="r")[:row]
+        np.save(index_dir / f"{EMBEDDINGS_FILE}.trim", trimmed)
+        del trimmed
+        os.replace(index_dir / f"{EMBEDDINGS_FILE}.trim.npy", tmp_embeddings)
+
+    tmp_sidecar = index_dir / f"{SIDECAR_FILE}.tmp"
+    with open(tmp_sidecar, 'w', encoding='utf-8') as f:
+        json.dump({
+            'exported_at': datetime.now().isoformat(),
+            'count': row,
+            'chunks': chunks,
+            'meetings': meetings,
+        }, f)
+
+    os.replace(tmp_embeddings, index_dir / EMBEDDINGS_FILE)
+    os.replace(tmp_sidecar, index_dir / SIDECAR_FILE)
+
+    logger.info(f"Exported {row} chunks from {len(meetings)} meetings")
+    return row
+
+
+class ExactSearchEngine:
+    def __init__(self, index_dir: Path):
+        """Open an exported index; the embedding matrix is memory-mapped, not loaded"""
+        index_dir = Path(index_dir)
+        embeddings_path = index_dir / EMBEDDINGS_FILE
+        sidecar_path = index_dir / SIDECAR_FILE
+
+        if not embeddings_path.exists() or not sidecar_path.exists():
+            raise FileNotFoundError(f"Exported index not found in {index_dir}")
+
+        self.embeddings = np.load(embeddings_path, mmap_mode="r")
+
+        with open(sidecar_path, 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+
+        self.chunks = sidecar['chunks']
+        self.meetings = sidecar['meetings']
+        self.exported_at = sidecar.get('exported_at')
+
+        if len(self.chunks) != self.embeddings.shape[0]:
+            raise ValueError(
+                f"Sidecar has {len(self.chunks)} rows but embeddings have {self.embeddings.shape[0]}"
+            )
+
+        # Row-aligned columns used to build filter masks
+        self.meeting_ids = sorted(self.meetings)
+        self.meeting_codes = {meeting_id: i for i, meeting_id in enumerate(self.meeting_ids)}
+        self.row_meeting = np.array([self.meeting_codes[c['meeting_id']] for c in self.chunks], dtype=np.int32)
+        meeting_dates = np.array(
+            [self.meetings[m]['date'] for m in self.meeting_ids], dtype='datetime64[s]'
+        )
+        meeting_departments = np.array([self.meetings[m]['department'] for m in self.meeting_ids])
+        meeting_view_ids = np.array([self.meetings[m]['view_id'] for m in self.meeting_ids])
+        self.row_date = meeting_dates[self.row_meeting]
+        self.row_department = meeting_departments[self.row_meeting]
+        self.row_view_id = meeting_view_ids[self.row_meeting]
+
+        logger.info(f"Opened exact search index: {len(self.chunks)} chunks, {len(self.meetings)} meetings")
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def filter_mask(self, meeting_ids: Optional[Iterable[str]] = None,
+                    date_from: Optional[datetime] = None,
+                    date_to: Optional[datetime] = None,
+                    departments: Optional[Iterable[str]] = None,
+                    view_ids: Optional[Iterable[str]] = None) -> Optional[np.ndarray]:
+        """Boolean mask of rows matching every given filter, None if unfiltered"""
+        mask = None
+
+        def combine(current, condition):
+            return condition if current is None else current & condition
+
+        if meeting_ids is not None:
+            codes = [self.meeting_codes[m] for m in meeting_ids if m in self.meeting_codes]
+            mask = combine(mask, np.isin(self.row_meeting, codes))
+        if date_from is not None:
+            mask = combine(mask, self.row_date >= np.datetime64(date_from, 's'))
+        if date_to is not None:
+            mask = combine(mask, self.row_date <= np.datetime64(date_to, 's'))
+        if departments is not None:
+            mask = combine(mask, np.isin(self.row_department, list(departments)))
+        if view_ids is not None:
+            mask = combine(mask, np.isin(self.row_view_id, list(view_ids)))
+
+        return mask
+
+    def scores(self, query_embedding: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query against every row (one matrix-vector product)"""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        return self.embeddings @ query
+
+    def search(self, query_embedding: np.ndarray, k: int = 10,
+               mask: Optional[np.ndarray] = None) -> List[Dict]:
+        """Exact top-k chunks by cosine similarity, optionally restricted by a filter mask"""
+        scores = self.scores(query_embedding)
+
+        if mask is not None:
+            candidates = np.flatnonzero(mask)
+            scores = scores[candidates]
+        else:
+            candidates = None
+
+        k = min(k, scores.shape[0])
+        if k == 0:
+            return []
+
+        # argpartition finds the top k in O(n); only those k get sorted
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        rows = candidates[top] if candidates is not None else top
+        return [self.format_row(int(row), float(score)) for row, score in zip(rows, scores[top])]
+
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 10,
+                     mask: Optional[np.ndarray] = None) -> List[List[Dict]]:
+        """Exact top-k for many queries at once with a single matrix-matrix product"""
+        queries = np.array(query_embeddings, dtype=np.float32, ndmin=2)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries /= norms
+
+        if mask is not None:
+            candidates = np.flatnonzero(mask)
+            scores = self.embeddings[candidates] @ queries.T
+        else:
+            candidates = None
+            scores = self.embeddings @ queries.T
+
+        k = min(k, scores.shape[0])
+        if k == 0:
+            return [[] for _ in range(len(queries))]
+
+        top = np.argpartition(-scores, k - 1, axis=0)[:k]
+        results = []
+        for j in range(len(queries)):
+            column = top[:, j]
+            column = column[np.argsort(-scores[column, j])]
+            rows = candidates[column] if candidates is not None else column
+            results.append([
+                self.format_row(int(row), float(score)) for row, score in zip(rows, scores[column, j])
+            ])
+        return results
+
+    def search_meetings(self, query_embedding: np.ndarray, k: int = 5,
+                        mask: Optional[np.ndarray] = None) -> List[Dict]:
+        """Meeting-level relevance: average and max chunk similarity per meeting"""
+        scores = self.scores(query_embedding)
+        codes = self.row_meeting
+
+        if mask is not None:
+            scores = scores[mask]
+            codes = codes[mask]
+
+        n_meetings = len(self.meeting_ids)
+        counts = np.bincount(codes, minlength=n_meetings)
+        sums = np.bincount(codes, weights=scores, minlength=n_meetings)
+        maxes = np.full(n_meetings, -np.inf)
+        np.maximum.at(maxes, codes, scores)
+
+        present = np.flatnonzero(counts)
+        averages = sums[present] / counts[present]
+        order = np.argsort(-averages)[:k]
+
+        meetings = []
+        for i in order:
+            code = present[i]
+            meeting_id = self.meeting_ids[code]
+            meeting = self.meetings[meeting_id]
+            meetings.append({
+                'meeting_id': meeting_id,
+                'title': meeting['title'],
+                'date': datetime.fromisoformat(meeting['date']),
+                'chunk_count': int(counts[code]),
+                'avg_similarity': float(averages[i]),
+                'max_similarity': float(maxes[code])
+            })
+        return meetings
+
+    def format_row(self, row: int, score: float) -> Dict:
+        """Result dictionary in the same shape as SemanticSearcher.search_chunks"""
+        chunk = self.chunks[row]
+        meeting = self.meetings[chunk['meeting_id']]
+        return {
+            'meeting_id': chunk['meeting_id'],
+            'chunk_index': chunk['chunk_index'],
+            'chunk_text': chunk['chunk_text'],
+            'metadata': chunk['metadata'],
+            'meeting_title': meeting['title'],
+            'meeting_date': datetime.fromisoformat(meeting['date']),
+            'similarity_score': score
+        }
@@ -0,0 +1,212 @@
+"""
+Chunk search statements shared by scripts/semantic_search.py and the API
+
+Templates use {name} markers for their parameters and {filters} for the
+WHERE body of a SearchFilters. render_named fills them in for SQLAlchemy
+text() (:name parameters), render_numbered for asyncpg ($n parameters),
+so both callers run the same SQL whatever their driver. Filters use the
+meeting fields copied onto meeting_chunks, so they apply during the ANN
+scan and meetings is only joined for the final rows.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from search.filters import SearchFilters
+
+SEARCH_MODES = ("vector", "hybrid")
+
+# Candidates taken from each of the keyword and ANN lists before fusion
+HYBRID_CANDIDATES = 50
+
+# Reciprocal rank fusion constant: score = sum(1 / (RRF_K + rank))
+RRF_K = 60
+
+# "full" searches the float32 HNSW index; "half" and "binary" search the
+# compact halfvec / bit indexes and rerank their candidates at full precision
+PRECISIONS = ("full", "half", "binary")
+
+# Compact-index candidates per requested result, reranked with the float32
+# vectors. Hamming distance over 256 bits is coarse, so binary needs more
+RERANK_FACTORS = {"half": 2, "binary": 10}
+
+# Cosine similarity using pgvector: {embedding}, {limit}
+VECTOR_SEARCH_SQL = """
+WITH ann AS (
+    SELECT
+        mc.id,
+        mc.embedding <=> CAST({embedding} AS vector) AS distance
+    FROM meeting_chunks mc
+    WHERE {filters}
+    ORDER BY distance
+    LIMIT {limit}
+)
+SELECT
+    mc.meeting_id,
+    mc.chunk_index,
+    mc.chunk_text,
+    mc.metadata,
+    m.title,
+    m.date,
+    1 - ann.distance AS similarity_score
+FROM ann
+JOIN meeting_chunks mc ON mc.id = ann.id
+JOIN meetings m ON mc.meeting_id = m.meeting_id
+ORDER BY ann.distance
+"""
+
+# ANN over a quantized column, then an exact float32 rerank of the
+# candidates: {embedding}, {limit}, {candidates}
+QUANTIZED_SEARCH_SQL_TEMPLATE = """
+WITH candidates AS (
+    SELECT mc.id
+    FROM meeting_chunks mc
+    WHERE {{filters}}
+    ORDER BY {distance}
+    LIMIT {{candidates}}
+)
+SELECT
+    mc.meeting_id,
+    mc.chunk_index,
+    mc.chunk_text,
+    mc.metadata,
+    m.title,
+    m.date,
+    1 - (mc.embedding <=> CAST({{embedding}} AS vector)) AS similarity_score
+FROM candidates c
+JOIN meeting_chunks mc ON mc.id = c.id
+JOIN meetings m ON mc.meeting_id = m.meeting_id
+ORDER BY mc.embedding <=> CAST({{embedding}} AS vector)
+LIMIT {{limit}}
+"""
+
+# The embedding is always bound as a vector (text for SQLAlchemy, the
+# pgvector codec for asyncpg) and cast from there
+QUANTIZED_SEARCH_SQL = {
+    "half": QUANTIZED_SEARCH_SQL_TEMPLATE.format(
+        distance="mc.embedding_half <=> CAST(CAST({embedding} AS vector) AS halfvec(256))"
+    ),
+    "binary": QUANTIZED_SEARCH_SQL_TEMPLATE.format(
+        distance="mc.embedding_bit <~> CAST(binary_quantize(CAST({embedding} AS vector)) AS bit(256))"
+    ),
+}
+
+# Many queries in one round trip: each query embedding drives its own
+# LATERAL index scan, rows come back tagged with the query's position:
+# {embeddings} (vector[]), {limit} per query
+BATCH_VECTOR_SEARCH_SQL = """
+SELECT
+    q.query_index,
+    mc.meeting_id,
+    mc.chunk_index,
+    mc.chunk_text,
+    mc.metadata,
+    m.title,
+    m.date,
+    1 - r.distance AS similarity_score
+FROM unnest(CAST({embeddings} AS vector[])) WITH ORDINALITY AS q(embedding, query_index)
+CROSS JOIN LATERAL (
+    SELECT mc.id, mc.embedding <=> q.embedding AS distance
+    FROM meeting_chunks mc
+    WHERE {filters}
+    ORDER BY distance
+    LIMIT {limit}
+) r
+JOIN meeting_chunks mc ON mc.id = r.id
+JOIN meetings m ON mc.meeting_id = m.meeting_id
+ORDER BY q.query_index, r.distance
+"""
+
+# Keyword (full-text) and ANN candidate lists merged with reciprocal rank
+# fusion, all in a single statement so hybrid search is one round trip:
+# {embedding}, {limit}, {query}, {candidates}, {rrf_k}
+HYBRID_SEARCH_SQL = """
+WITH semantic AS (
+    SELECT id, ROW_NUMBER() OVER (ORDER BY distance) AS rank
+    FROM (
+        SELECT mc.id, mc.embedding <=> CAST({embedding} AS vector) AS distance
+        FROM meeting_chunks mc
+        WHERE {filters}
+        ORDER BY distance
+        LIMIT {candidates}
+    ) ann
+),
+keyword AS (
+    SELECT id, ROW_NUMBER() OVER (ORDER BY score DESC) AS rank
+    FROM (
+        SELECT mc.id, ts_rank_cd(mc.chunk_tsv, q) AS score
+        FROM meeting_chunks mc,
+             websearch_to_tsquery('english', {query}) q
+        WHERE mc.chunk_tsv @@ q
+          AND {filters}
+        ORDER BY score DESC
+        LIMIT {candidates}
+    ) fts
+),
+fused AS (
+    SELECT
+        COALESCE(s.id, k.id) AS id,
+        COALESCE(1.0 / ({rrf_k} + s.rank), 0) + COALESCE(1.0 / ({rrf_k} + k.rank), 0) AS rrf_score,
+        s.rank AS semantic_rank,
+        k.rank AS keyword_rank
+    FROM semantic s
+    FULL OUTER JOIN keyword k ON s.id = k.id
+)
+SELECT
+    mc.meeting_id,
+    mc.chunk_index,
+    mc.chunk_text,
+    mc.metadata,
+    m.title,
+    m.date,
+    1 - (mc.embedding <=> CAST({embedding} AS vector)) AS similarity_score,
+    f.rrf_score,
+    f.semantic_rank,
+    f.keyword_rank
+FROM fused f
+JOIN meeting_chunks mc ON mc.id = f.id
+JOIN meetings m ON mc.meeting_id = m.meeting_id
+ORDER BY f.rrf_score DESC
+LIMIT {limit}
+"""
+
+# Chunks matching the filters, counted only up to {limit}: whether an ANN
+# shortfall is the index giving up early or simply all there is
+FILTERED_CHUNK_COUNT_SQL = """
+SELECT COUNT(*) FROM (
+    SELECT 1
+    FROM meeting_chunks mc
+    WHERE {filters}
+    LIMIT {limit}
+) matching
+"""
+
+
+def chunk_search_sql(mode: str = "vector", precision: str = "full") -> str:
+    """Template for a single-query chunk search"""
+    if mode == "hybrid":
+        return HYBRID_SEARCH_SQL
+    if precision != "full":
+        return QUANTIZED_SEARCH_SQL[precision]
+    return VECTOR_SEARCH_SQL
+
+
+def render_named(template: str, values: Dict[str, Any], filters: SearchFilters,
+                 **filter_kwargs) -> Tuple[str, Dict[str, Any]]:
+    """SQL and parameters for SQLAlchemy text(), with :name placeholders"""
+    where, filter_params = filters.to_named_sql(**filter_kwargs)
+    sql = template.format(filters=where, **{name: f":{name}" for name in values})
+    return sql, {**values, **filter_params}
+
+
+def render_numbered(template: str, values: Dict[str, Any], filters: SearchFilters,
+                    **filter_kwargs) -> Tuple[str, List[Any]]:
+    """SQL and arguments for asyncpg: values take $1..$n in order, then the filters"""
+    where, filter_args = filters.to_numbered_sql(len(values) + 1, **filter_kwargs)
+    placeholders = {name: f"${i}" for i, name in enumerate(values, start=1)}
+    sql = template.format(filters=where, **placeholders)
+    return sql, [*values.values(), *filter_args]
+
+
+def expected_rows(matching: int, limit: int, queries: int = 1) -> int:
+    """Rows a complete search returns when `matching` (capped at limit) chunks pass the filters"""
+    return min(matching, limit) * queries
@@ -0,0 +1,247 @@
+"""
+Synthetic meetings / meeting_chunks corpus for retrieval benchmarks
+
+Chunks are generated around a fixed set of topics: every topic has a unit
+centroid and a few keywords, each meeting covers a handful of topics and
+each chunk is its topic's centroid plus Gaussian noise, with text mixing
+the topic's keywords into filler words. Benchmark queries are drawn the
+same way, so query vectors follow the corpus distribution and keyword
+queries have real matches for hybrid search.
+
+Everything is derived from the seed, so a corpus of any size can be
+regenerated (or its queries recreated) from its manifest alone.
+"""
+
+import io
+import json
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from database.models import MeetingChunk, MeetingEmbedding
+
+EMBEDDING_DIM = 256
+
+DEPARTMENTS = [
+    ("10", "Board of Supervisors"),
+    ("11", "Budget and Appropriations Committee"),
+    ("12", "Land Use and Transportation Committee"),
+    ("13", "Planning Commission"),
+    ("14", "Police Commission"),
+    ("15", "Public Utilities Commission"),
+    ("16", "Health Commission"),
+    ("17", "Rules Committee"),
+]
+
+KEYWORDS = [
+    "housing", "affordable", "zoning", "permit", "budget", "appropriation", "transit", "muni",
+    "bicycle", "parking", "police", "staffing", "overtime", "homelessness", "shelter", "navigation",
+    "sewer", "pipeline", "water", "stormwater", "climate", "emissions", "solar", "library",
+    "parks", "recreation", "tenant", "eviction", "rent", "landlord", "ordinance", "resolution",
+    "hearing", "appeal", "variance", "setback", "density", "height", "historic", "preservation",
+    "cannabis", "retail", "business", "tourism", "airport", "port", "ferry", "pier",
+    "hospital", "clinic", "vaccination", "overdose", "fentanyl", "treatment", "education", "school",
+    "childcare", "seniors", "veterans", "immigrant", "language", "election", "ballot", "ethics",
+    "lobbying", "contract", "procurement", "audit", "pension", "salary", "union", "grant",
+    "traffic", "calming", "pedestrian", "crosswalk", "speed", "camera", "surveillance", "privacy",
+]
+
+FILLER = [
+    "the", "committee", "discussed", "item", "number", "supervisor", "commissioner", "public",
+    "comment", "motion", "second", "vote", "department", "staff", "report", "thank", "you",
+    "chair", "next", "please", "call", "roll", "continued", "amended", "approved", "city",
+    "county", "san", "francisco", "members", "question", "presentation", "director", "plan",
+]
+
+
+@dataclass
+class CorpusSpec:
+    n_chunks: int = 10000
+    chunks_per_meeting: int = 50
+    n_topics: int = 256
+    topics_per_meeting: int = 4
+    # Per-dimension noise, scaled so the noise vector has norm ~noise
+    noise: float = 0.9
+    words_per_chunk: int = 60
+    date_from: str = "2023-01-01"
+    date_to: str = "2025-12-31"
+    seed: int = 42
+
+    @property
+    def n_meetings(self) -> int:
+        return -(-self.n_chunks // self.chunks_per_meeting)
+
+
+class SyntheticCorpus:
+    def __init__(self, spec: CorpusSpec):
+        """Deterministic corpus and query generator for a CorpusSpec"""
+        self.spec = spec
+        rng = np.random.default_rng(spec.seed)
+        centroids = rng.standard_normal((spec.n_topics, EMBEDDING_DIM)).astype(np.float32)
+        self.centroids = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+        self.topic_keywords = [
+            list(rng.choice(KEYWORDS, size=3, replace=False)) for _ in range(spec.n_topics)
+        ]
+
+    def _vectors(self, rng: np.random.Generator, topics: np.ndarray) -> np.ndarray:
+        noise = rng.standard_normal((len(topics), EMBEDDING_DIM)).astype(np.float32)
+        vectors = self.centroids[topics] + noise * (self.spec.noise / np.sqrt(EMBEDDING_DIM))
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def _text(self, rng: np.random.Generator, topic: int) -> str:
+        n_keywords = max(1, self.spec.words_per_chunk // 10)
+        words = list(rng.choice(FILLER, size=self.spec.words_per_chunk - n_keywords))
+        words += list(rng.choice(self.topic_keywords[topic], size=n_keywords))
+        rng.shuffle(words)
+        return " ".join(words)
+
+    def meetings(self) -> Iterator[Dict]:
+        """Meeting rows spread evenly over the date range and departments"""
+        start = datetime.strptime(self.spec.date_from, "%Y-%m-%d")
+        end = datetime.strptime(self.spec.date_to, "%Y-%m-%d")
+        step = (end - start) / max(1, self.spec.n_meetings - 1)
+        for i in range(self.spec.n_meetings):
+            view_id, department = DEPARTMENTS[i % len(DEPARTMENTS)]
+            clip_id = str(100000 + i)
+            yield {
+                'meeting_id': f"{view_id}_{clip_id}",
+                'clip_id': clip_id,
+                'view_id': view_id,
+                'department': department,
+                'date': (start + step * i).replace(microsecond=0),
+                'title': f"{department} - synthetic meeting {i}",
+            }
+
+    def chunk_batches(self, batch_size: int = 10000) -> Iterator[List[Tuple[str, int, str, np.ndarray]]]:
+        """Yield (meeting_id, chunk_index, text, vector) batches, a whole number of meetings each"""
+        spec = self.spec
+        rng = np.random.default_rng(spec.seed + 1)
+        meetings_per_batch = max(1, batch_size // spec.chunks_per_meeting)
+        remaining = spec.n_chunks
+        meetings = self.meetings()
+
+        while remaining > 0:
+            batch = []
+            for meeting in meetings:
+                count = min(spec.chunks_per_meeting, remaining)
+                remaining -= count
+                meeting_topics = rng.choice(spec.n_topics, size=spec.topics_per_meeting, replace=False)
+                topics = rng.choice(meeting_topics, size=count)
+                vectors = self._vectors(rng, topics)
+                for index in range(count):
+                    batch.append((meeting['meeting_id'], index, self._text(rng, topics[index]), vectors[index]))
+                if remaining == 0 or len(batch) >= meetings_per_batch * spec.chunks_per_meeting:
+                    break
+            yield batch
+
+    def queries(self, n: int, seed_offset: int = 1000) -> List[Tuple[str, np.ndarray]]:
+        """Fixed query workload: (keyword text, vector) pairs drawn around random topics"""
+        rng = np.random.default_rng(self.spec.seed + seed_offset)
+        topics = rng.choice(self.spec.n_topics, size=n)
+        vectors = self._vectors(rng, topics)
+        return [
+            (" ".join(rng.choice(self.topic_keywords[t], size=2, replace=False)), vectors[i])
+            for i, t in enumerate(topics)
+        ]
+
+
+def _copy(cursor, table: str, columns: List[str], rows: Iterator[List[str]]):
+    """COPY rows (already in COPY text format, no tabs or newlines) into a table"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def load_corpus(engine: Engine, spec: CorpusSpec, batch_size: int = 10000,
+                reset: bool = False, maintenance_work_mem: str = "1GB") -> Dict:
+    """Write a synthetic corpus into meetings / meeting_chunks / meeting_embeddings
+
+    Secondary indexes on meeting_chunks and meeting_embeddings are dropped
+    during the load and rebuilt afterwards, which is much faster than
+    maintaining HNSW graphs row by row. Returns load and index build timings.
+    """
+    corpus = SyntheticCorpus(spec)
+    indexes = list(MeetingChunk.__table__.indexes) + list(MeetingEmbedding.__table__.indexes)
+    stats = {'spec': asdict(spec), 'index_seconds': {}}
+
+    with engine.begin() as conn:
+        existing = conn.execute(text("SELECT COUNT(*) FROM meetings")).scalar()
+        if existing and not reset:
+            raise ValueError(f"meetings already has {existing} rows, pass reset=True to replace them")
+        conn.execute(text("TRUNCATE meetings, meeting_chunks, meeting_embeddings RESTART IDENTITY CASCADE"))
+        for index in indexes:
+            index.drop(conn, checkfirst=True)
+
+    vector_format = "[" + ",".join(["%.6f"] * EMBEDDING_DIM) + "]"
+    start = time.perf_counter()
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        _copy(cursor, "meetings", ["meeting_id", "clip_id", "view_id", "department", "date", "title"], (
+            [m['meeting_id'], m['clip_id'], m['view_id'], m['department'], m['date'].isoformat(), m['title']]
+            for m in corpus.meetings()
+        ))
+        raw.commit()
+
+        loaded = 0
+        for batch in corpus.chunk_batches(batch_size):
+            # meeting_date / department / view_id are filled in by the trigger
+            _copy(cursor, "meeting_chunks", ["meeting_id", "chunk_index", "chunk_text", "embedding", "metadata"], (
+                [meeting_id, str(index), chunk_text, vector_format % tuple(vector.tolist()), "{}"]
+                for meeting_id, index, chunk_text, vector in batch
+            ))
+            raw.commit()
+            loaded += len(batch)
+            logger.info(f"Loaded {loaded}/{spec.n_chunks} chunks")
+        cursor.close()
+    finally:
+        raw.close()
+    stats['load_seconds'] = round(time.perf_counter() - start, 2)
+
+    with engine.begin() as conn:
+        # HNSW builds are far faster when the graph fits in maintenance_work_mem
+        conn.execute(text("SELECT set_config('maintenance_work_mem', :value, true)"),
+                     {"value": maintenance_work_mem})
+        for index in indexes:
+            start = time.perf_counter()
+            index.create(conn, checkfirst=True)
+            stats['index_seconds'][index.name] = round(time.perf_counter() - start, 2)
+            logger.info(f"Built {index.name} in {stats['index_seconds'][index.name]}s")
+
+        conn.execute(text("""
+            INSERT INTO meeting_embeddings (meeting_id, centroid, chunk_count, updated_at)
+            SELECT meeting_id, AVG(l2_normalize(embedding)), COUNT(*), now()
+            FROM meeting_chunks
+            GROUP BY meeting_id
+        """))
+        conn.execute(text("UPDATE search_index_state SET version = version + 1, updated_at = now() WHERE id = 1"))
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE meetings, meeting_chunks, meeting_embeddings"))
+
+    stats['n_meetings'] = spec.n_meetings
+    stats['n_chunks'] = spec.n_chunks
+    return stats
+
+
+def write_manifest(path: Path, stats: Dict):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(stats, f, indent=2)
+
+
+def read_manifest(path: Path) -> Tuple[CorpusSpec, Dict]:
+    with open(path) as f:
+        stats = json.load(f)
+    return CorpusSpec(**stats['spec']), stats